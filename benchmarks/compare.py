@@ -0,0 +1,51 @@
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict:
+    """
+    Read a result file written by benchmarks.run.
+    :param path: Path of the JSON file.
+    :return: {(name, size): result entry} of the benchmarks that ran.
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    return {(result["name"], result["size"]): result for result in data["results"]
+            if "skipped" not in result}
+
+
+def compare(base: dict, new: dict, threshold: float) -> list:
+    """
+    Compare the median times of two benchmark runs.
+    :param base: Results of the reference run, from load_results().
+    :param new: Results of the run to check.
+    :param threshold: Change in percent above which a benchmark counts as slower.
+    :return: Rows (name, size, base ms, new ms, change in percent, regressed).
+    """
+    rows = []
+    for key in sorted(base.keys() & new.keys(), key=lambda key: (key[0], key[1] or 0)):
+        before, after = base[key]["median_ms"], new[key]["median_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        rows.append((key[0], key[1], before, after, change, change > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("base", help="Result file of the reference commit")
+    parser.add_argument("new", help="Result file of the commit to check")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Slowdown in percent reported as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+    rows = compare(load_results(args.base), load_results(args.new), args.threshold)
+    for name, size, before, after, change, regressed in rows:
+        size = "" if size is None else size
+        print(f"{name:<28} {size:>6} {before:>10.3f} {after:>10.3f} ms {change:>+8.1f}%"
+              f"{'  SLOWER' if regressed else ''}")
+    # A non-zero exit status lets scripts fail on regressions
+    sys.exit(1 if any(row[5] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import json
+import os
+import sys
+import time
+import tkinter as tk
+
+from benchmarks.run import SEARCH_QUERIES, measure, summarize
+from components.diagnostics.latency import LatencyRecorder, STAGES
+from components.rendering.disk_cache import DiskPageCache
+from components.rendering.renderer import PageRenderer
+from components.scores.blob_store import BlobStore
+from components.scores.documents import DocumentPool
+from components.scores.scores_manager import ScoresManager
+from components.widgets.score_viewer import ScoreViewer
+from components.widgets.virtual_list import VirtualList
+
+TURN_TIMEOUT = 10.0
+
+
+class BenchmarkWindow(tk.Tk):
+    def __init__(self):
+        """
+        Initialize a window providing what the screens expect from the main
+        application window, without its top bar, clock and settings.
+        """
+        super().__init__()
+        self.key_prev = "<Left>"
+        self.key_next = "<Right>"
+        self.geometry("1280x1000")
+
+    def add_title_to_top_bar(self, title: str):
+        """
+        Add a title, as MainScreen does.
+        :param title: Title text to display.
+        :return: The title label.
+        """
+        title_label = tk.Label(self, text=title, font=("Arial", 16, "bold"))
+        title_label.place(x=640, y=5, anchor='n')
+        return title_label
+
+    def clear_screen(self):
+        """
+        Clear all widgets from the window.
+        """
+        for widget in self.winfo_children():
+            widget.destroy()
+        self.update()
+
+    def wait_until(self, condition, timeout: float = TURN_TIMEOUT) -> bool:
+        """
+        Run the Tk event loop until a condition holds.
+        :param condition: Callable returning True when done.
+        :param timeout: Seconds to wait at most.
+        :return: Whether the condition was met in time.
+        """
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            if time.perf_counter() > deadline:
+                return False
+            self.update()
+            time.sleep(0.001)
+        return True
+
+
+def bench_lists(window: BenchmarkWindow, scores_manager: ScoresManager, size: int, repeat: int) -> list:
+    """
+    Benchmark building the library list and refreshing it with search results.
+    :param window: The benchmark window.
+    :param scores_manager: Loaded library.
+    :param size: Number of scores in the library.
+    :param repeat: Runs per benchmark.
+    :return: Result entries.
+    """
+    scores = scores_manager.list_scores()
+
+    def build(_):
+        scores_list = VirtualList(window, scores, lambda index, score: None,
+                                  item_text=lambda score: score.name, width=30)
+        scores_list.pack(fill='both', expand=True)
+        window.update_idletasks()
+
+    results = [summarize("gui.library_list", measure(build, repeat, window.clear_screen), size)]
+
+    window.clear_screen()
+    scores_list = VirtualList(window, scores, lambda index, score: None,
+                              item_text=lambda score: score.name, width=30)
+    scores_list.pack(fill='both', expand=True)
+    window.update()
+    durations = []
+    for query in SEARCH_QUERIES:
+        def refresh():
+            scores_list.set_items(scores_manager.search(query))
+            window.update_idletasks()
+        durations += measure(refresh, repeat)
+    results.append(summarize("gui.search_refresh", durations, size, queries=len(SEARCH_QUERIES)))
+    return results
+
+
+def bench_page_turns(window: BenchmarkWindow, scores_manager: ScoresManager, cache_dir: str,
+                     size: int, repeat: int) -> list:
+    """
+    Benchmark page turns in the viewer, from the key press until the page is
+    drawn, as measured by the latency recorder of the viewer. Turns run through
+    the first ten scores, so they include moving to the next score.
+    :param window: The benchmark window.
+    :param scores_manager: Loaded library.
+    :param cache_dir: Directory for the disk page cache, empty at the start.
+    :param size: Number of scores in the library.
+    :param repeat: Runs per benchmark; ten turns are made per run.
+    :return: Result entries.
+    """
+    window.clear_screen()
+    renderer = PageRenderer(document_pool=DocumentPool(), disk_cache=DiskPageCache(cache_dir))
+    recorder = LatencyRecorder(window=repeat * 10)
+    viewer = ScoreViewer(window, scores_manager.list_scores()[:10], renderer, renderer.document_pool,
+                         on_back=lambda: None, track_title=False)
+    viewer.latency = recorder
+    viewer.pack(fill='both', expand=True)
+    try:
+        viewer.show_item(0)
+        if not window.wait_until(lambda: getattr(viewer.image_label, "image", None) is not None):
+            raise RuntimeError("The first page was not shown in time")
+        for turn in range(repeat * 10):
+            viewer.go_next()
+            if not window.wait_until(lambda: len(recorder.samples) > turn):
+                raise RuntimeError(f"Page turn {turn + 1} was not drawn in time")
+    finally:
+        renderer.shutdown()
+    stages = {stage: round(summary["p50"], 4) for stage, summary in recorder.percentiles().items()
+              if stage in STAGES}
+    return [summarize("gui.page_turn", [sample["total_ms"] / 1000 for sample in recorder.samples],
+                      size, stages_median_ms=stages)]
+
+
+def main(argv=None):
+    """
+    Run the GUI benchmarks on a generated library and print the results as JSON.
+    Started by benchmarks.run with the library paths, size and repeat count.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    paths, size, repeat = json.loads(argv[0]), int(argv[1]), int(argv[2])
+    scores_manager = ScoresManager(BlobStore(paths["blobs"]), path=paths["scores"])
+    scores_manager.load()
+    window = BenchmarkWindow()
+    window.update()
+    results = bench_lists(window, scores_manager, size, repeat)
+    results += bench_page_turns(window, scores_manager,
+                                os.path.join(os.path.dirname(paths["scores"]), "page_cache"),
+                                size, repeat)
+    window.destroy()
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pymupdf as fitz
+
+from benchmarks.startup import bench_import, with_budget
+from benchmarks.synthetic_library import generate_library, make_pdf
+from components.concerts.concerts_manager import ConcertsManager
+from components.diagnostics.latency import percentile
+from components.rendering.renderer import DEFAULT_PAGE_SIZE, render_page
+from components.scores.blob_store import BlobStore
+from components.scores.scores_manager import ScoresManager
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+SEARCH_QUERIES = ("bach", "dvo", "sonata in", "no. 12", "etude viola", "fugue c minor", "xyzzy")
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+def summarize(name: str, durations: list, size: int = None, **details) -> dict:
+    """
+    Summarize the measured durations of a benchmark.
+    :param name: Name of the benchmark, e.g. "scores.load".
+    :param durations: Measured durations in seconds.
+    :param size: Number of scores in the library, None if it does not matter.
+    :param details: Further parameters stored with the result.
+    :return: Result entry with statistics in milliseconds.
+    """
+    values = sorted(d * 1000 for d in durations)
+    result = {"name": name, "size": size, "runs": len(values),
+              "min_ms": round(values[0], 4),
+              "median_ms": round(percentile(values, 50), 4),
+              "mean_ms": round(sum(values) / len(values), 4),
+              "p90_ms": round(percentile(values, 90), 4),
+              "max_ms": round(values[-1], 4)}
+    result.update(details)
+    return result
+
+
+def measure(func, repeat: int, setup=None) -> list:
+    """
+    Time a function several times.
+    :param func: Callable to time; it gets the value returned by setup, if any.
+    :param repeat: Number of runs.
+    :param setup: Callable run untimed before every run.
+    :return: Durations in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def bench_library(paths: dict, size: int, repeat: int) -> list:
+    """
+    Benchmark loading, saving, editing and searching a generated library.
+    :param paths: File paths returned by generate_library().
+    :param size: Number of scores in the library.
+    :param repeat: Runs per benchmark.
+    :return: Result entries.
+    """
+    blob_store = BlobStore(paths["blobs"])
+
+    def new_scores_manager():
+        return ScoresManager(blob_store, path=paths["scores"])
+
+    def loaded_scores_manager():
+        manager = new_scores_manager()
+        manager.load()
+        return manager
+
+    def loaded_concerts_manager():
+        manager = ConcertsManager(path=paths["concerts"])
+        manager.load()
+        return manager
+
+    results = [
+        summarize("scores.load", measure(lambda m: m.load(), repeat, new_scores_manager), size),
+        summarize("scores.save", measure(lambda m: m.save(), repeat, loaded_scores_manager), size),
+        summarize("concerts.load", measure(lambda m: m.load(), repeat,
+                                           lambda: ConcertsManager(path=paths["concerts"])), size),
+        summarize("concerts.save", measure(lambda m: m.save(), repeat, loaded_concerts_manager), size)
+    ]
+
+    # A program edit as done by the concert screen: move an entry, then queue the save
+    concerts_manager = loaded_concerts_manager()
+    concert = concerts_manager.list_concerts()[0]
+    rng = random.Random(size)
+
+    def move(manager):
+        length = len(concert.program)
+        manager.move_program_item(concert.UID, rng.randrange(length), rng.randrange(length))
+        manager.request_save()
+
+    results.append(summarize("concerts.move_program_item",
+                             measure(move, repeat * 20, lambda: concerts_manager), size))
+    concerts_manager.flush()
+
+    scores_manager = loaded_scores_manager()
+    durations = []
+    for query in SEARCH_QUERIES:
+        durations += measure(lambda: scores_manager.search(query), repeat)
+    results.append(summarize("scores.search", durations, size, queries=len(SEARCH_QUERIES)))
+    return results
+
+
+def bench_rasterize(pages: int, complexity: int, pdf_kb: int, repeat: int) -> list:
+    """
+    Benchmark rasterizing the pages of a generated PDF at the default viewer size,
+    in a fresh document every run so PyMuPDF caches do not carry over.
+    :param pages: Pages of the PDF.
+    :param complexity: Drawing density of the pages.
+    :param pdf_kb: Target size of the PDF in KiB.
+    :param repeat: Runs per page.
+    :return: Result entries.
+    """
+    data = make_pdf(random.Random(0), "Rasterization benchmark", pages, complexity, pdf_kb)
+    durations = []
+    for page_num in range(pages):
+        def render(document):
+            render_page(document, page_num, DEFAULT_PAGE_SIZE)
+            document.close()
+        durations += measure(render, repeat, lambda: fitz.open(stream=data, filetype="pdf"))
+    return [summarize("page.rasterize", durations, complexity=complexity, pdf_kb=len(data) // 1024,
+                      width=DEFAULT_PAGE_SIZE[0], height=DEFAULT_PAGE_SIZE[1])]
+
+
+def git_revision() -> dict:
+    """
+    Identify the code being benchmarked.
+    :return: {"commit": hash or None, "dirty": whether there are uncommitted changes}.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def environment(args) -> dict:
+    """
+    Describe the benchmark run, so results of different commits can be compared.
+    :param args: Parsed command line arguments.
+    :return: Metadata stored with the results.
+    """
+    meta = {"started": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "pymupdf": fitz.VersionBind,
+            "parameters": {key: value for key, value in vars(args).items() if key != "output"}}
+    meta.update(git_revision())
+    return meta
+
+
+def run_with_display(module: str, *args) -> tuple:
+    """
+    Run a benchmark module in a child process, under a virtual X server when
+    there is no display.
+    :param module: Module run with "python -m".
+    :param args: Command line arguments of the module.
+    :return: Tuple (JSON printed by the module, None) or (None, reason it did not run).
+    """
+    command = [sys.executable, "-m", module] + list(args)
+    if not os.environ.get("DISPLAY"):
+        if shutil.which("xvfb-run") is None:
+            return None, "no display and xvfb-run not found"
+        command = ["xvfb-run", "-a", "-s", "-screen 0 1920x1080x24"] + command
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None, completed.stderr.strip()[-500:]
+    return json.loads(completed.stdout), None
+
+
+def run_gui_benchmarks(paths: dict, size: int, repeat: int) -> list:
+    """
+    Run the GUI benchmarks and time the startup of the application on a library.
+    :param paths: File paths returned by generate_library().
+    :param size: Number of scores in the library.
+    :param repeat: Runs per benchmark; the application is started this many times.
+    :return: Result entries, with a "skipped" entry for what could not run.
+    """
+    results, reason = run_with_display("benchmarks.gui", json.dumps(paths), str(size), str(repeat))
+    if reason is not None:
+        return [{"name": "gui", "size": size, "skipped": reason}]
+    startups = []
+    for _ in range(repeat):
+        startup, reason = run_with_display("benchmarks.startup", os.path.dirname(paths["scores"]))
+        if reason is not None:
+            return results + [{"name": "startup", "size": size, "skipped": reason}]
+        startups.append(startup)
+    for stage in ("first_frame", "library_ready"):
+        results.append(with_budget(summarize(f"startup.{stage}",
+                                             [startup[stage] for startup in startups], size)))
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PyMusicStand on synthetic libraries.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma separated numbers of scores (default: %(default)s)")
+    parser.add_argument("--pages", type=int, default=4, help="Pages per PDF (default: %(default)s)")
+    parser.add_argument("--complexity", type=int, default=1,
+                        help="Drawing density of the pages (default: %(default)s)")
+    parser.add_argument("--pdf-kb", type=int, default=0,
+                        help="Target PDF size in KiB, 0 for unpadded (default: %(default)s)")
+    parser.add_argument("--distinct-pdfs", type=int, default=20,
+                        help="Different PDFs shared by the scores (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated libraries")
+    parser.add_argument("--gui", action="store_true",
+                        help="Also run the GUI benchmarks, under xvfb-run if there is no display")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<time>-<commit>.json)")
+    args = parser.parse_args(argv)
+    args.sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    meta = environment(args)
+    results = bench_import(args.repeat)
+    results += bench_rasterize(args.pages, args.complexity, args.pdf_kb, args.repeat)
+    work_dir = tempfile.mkdtemp(prefix="pymusicstand-bench-")
+    try:
+        for size in args.sizes:
+            paths = generate_library(os.path.join(work_dir, str(size)), size, args.pages,
+                                     args.complexity, args.pdf_kb, args.distinct_pdfs, seed=args.seed)
+            results += bench_library(paths, size, args.repeat)
+            if args.gui:
+                results += run_gui_benchmarks(paths, size, args.repeat)
+            print(f"{size} scores done", file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = args.output
+    if output is None:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{(meta['commit'] or 'unknown')[:10]}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=1)
+    for result in results:
+        size = "" if result["size"] is None else result["size"]
+        if "skipped" in result:
+            print(f"{result['name']:<28} {size:>6} skipped: {result['skipped']}")
+        else:
+            budget = ""
+            if "budget_ms" in result:
+                budget = f" (budget {result['budget_ms']} ms{'' if result['within_budget'] else ', OVER'})"
+            print(f"{result['name']:<28} {size:>6} {result['median_ms']:>10.3f} ms median{budget}")
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
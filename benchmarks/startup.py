@@ -0,0 +1,82 @@
+import time
+
+STARTED = time.perf_counter()  # Taken before anything else is imported
+
+import json
+import os
+import subprocess
+import sys
+
+# Startup time budget of the application, in milliseconds
+STARTUP_BUDGET_MS = {
+    "startup.import": 150,  # Importing main.py
+    "startup.first_frame": 500,  # Process start until the mode selection is drawn
+    "startup.library_ready": 2000  # Process start until the modes can be entered
+}
+READY_TIMEOUT = 60.0
+IMPORT_SNIPPET = ("import time; start = time.perf_counter(); import main; "
+                  "print(time.perf_counter() - start)")
+
+
+def with_budget(result: dict) -> dict:
+    """
+    Add the budget of a startup benchmark to its result.
+    :param result: Result entry from summarize().
+    :return: The entry with "budget_ms" and "within_budget" (judged by the median).
+    """
+    budget = STARTUP_BUDGET_MS[result["name"]]
+    result["budget_ms"] = budget
+    result["within_budget"] = result["median_ms"] <= budget
+    return result
+
+
+def bench_import(repeat: int) -> list:
+    """
+    Benchmark importing the application in fresh interpreters, so no module is
+    cached from an earlier run.
+    :param repeat: Number of interpreters started.
+    :return: Result entries.
+    """
+    from benchmarks.run import summarize
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    durations = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=root,
+                                   capture_output=True, text=True, check=True)
+        durations.append(float(completed.stdout.strip().splitlines()[-1]))
+    return [with_budget(summarize("startup.import", durations))]
+
+
+def main(argv=None):
+    """
+    Start the application on a generated library and print how long it took
+    until the first screen was drawn and until the libraries were loaded, as JSON.
+    Started by benchmarks.run with the library directory, in a fresh process
+    and with a display.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    import main as app_main
+
+    # The data files of the generated library have the names the app looks for
+    os.chdir(argv[0])
+    app = app_main.MainScreen()
+    app.update()
+    first_frame = time.perf_counter() - STARTED
+    deadline = time.perf_counter() + READY_TIMEOUT
+    while not app.loader.ready:
+        if time.perf_counter() > deadline:
+            raise RuntimeError("The library was not loaded in time")
+        app.update()
+        time.sleep(0.001)
+    library_ready = time.perf_counter() - STARTED
+    error = app.loader.error
+    app.practice_mode_class.page_renderer.shutdown()
+    app.destroy()
+    if error is not None:
+        raise RuntimeError(f"Loading the library failed: {error}")
+    print(json.dumps({"first_frame": first_frame, "library_ready": library_ready}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import os
+import random
+
+import pymupdf as fitz
+
+from components.concerts.concerts_manager import ConcertsManager
+from components.scores.blob_store import BlobStore
+from components.scores.scores_manager import ScoresManager
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+STAVES_PER_PAGE = 10
+COMPOSERS = ["Bach", "Beethoven", "Brahms", "Chopin", "Debussy", "Dvořák", "Fauré", "Grieg",
+             "Händel", "Janáček", "Liszt", "Mozart", "Ravel", "Saint-Saëns", "Schubert",
+             "Schumann", "Smetana", "Sibelius", "Tchaikovsky", "Vivaldi"]
+FORMS = ["Sonata", "Prelude", "Étude", "Nocturne", "Waltz", "Concerto", "Symphony", "Suite",
+         "Fugue", "Mazurka", "Polonaise", "Rhapsody", "Serenade", "Minuet", "Impromptu"]
+KEYS = ["C major", "C minor", "D major", "D minor", "E♭ major", "E minor", "F major", "F♯ minor",
+        "G major", "G minor", "A major", "A minor", "B♭ major", "B minor"]
+PARTS = ["Score", "Violin I", "Violin II", "Viola", "Cello", "Flute", "Clarinet in B♭", "Piano"]
+
+
+def score_name(rng: random.Random, number: int) -> str:
+    """
+    Make up a plausible score name.
+    :param rng: Random generator, seeded for reproducible libraries.
+    :param number: Running number making the name unique.
+    :return: Name such as "Dvořák - Nocturne No. 12 in E minor (Viola)".
+    """
+    return (f"{rng.choice(COMPOSERS)} - {rng.choice(FORMS)} No. {number} in {rng.choice(KEYS)}"
+            f" ({rng.choice(PARTS)})")
+
+
+def make_pdf(rng: random.Random, title: str, pages: int = 4, complexity: int = 1,
+             pdf_kb: int = 0) -> bytes:
+    """
+    Generate a PDF that looks like sheet music to the renderer: staves of lines
+    with note heads, stems and a title in text that content search can find.
+    :param rng: Random generator, seeded for reproducible PDFs.
+    :param title: Title printed at the top of the first page.
+    :param pages: Number of pages.
+    :param complexity: Vector drawing density; each step adds 16 notes per staff.
+    :param pdf_kb: Target file size in KiB, reached with an incompressible
+        attachment (e.g. to stand in for scanned scores); 0 for no padding.
+    :return: The PDF file content.
+    """
+    document = fitz.open()
+    notes_per_staff = 16 * max(1, complexity)
+    for page_num in range(pages):
+        page = document.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        if page_num == 0:
+            page.insert_text((50, 50), title, fontsize=14)
+        shape = page.new_shape()
+        for staff in range(STAVES_PER_PAGE):
+            top = 90 + staff * 72
+            for line in range(5):
+                shape.draw_line((40, top + line * 6), (PAGE_WIDTH - 40, top + line * 6))
+            step = (PAGE_WIDTH - 100) / notes_per_staff
+            for note in range(notes_per_staff):
+                x = 60 + note * step
+                y = top - 6 + rng.randrange(12) * 3
+                shape.draw_oval(fitz.Rect(x, y, x + 6, y + 4.5))
+                shape.draw_line((x + 6, y + 2), (x + 6, y - 16))
+        shape.finish(color=(0, 0, 0), fill=(0, 0, 0), width=0.6)
+        shape.commit()
+        page.insert_text((PAGE_WIDTH / 2, PAGE_HEIGHT - 30), str(page_num + 1), fontsize=9)
+    data = document.tobytes(deflate=True)
+    padding = pdf_kb * 1024 - len(data)
+    if padding > 0:
+        document.embfile_add("padding.bin", rng.randbytes(padding))
+        data = document.tobytes(deflate=True)
+    document.close()
+    return data
+
+
+def generate_library(directory: str, scores: int, pages: int = 4, complexity: int = 1,
+                     pdf_kb: int = 0, distinct_pdfs: int = 20, concerts: int = None,
+                     program_length: int = 20, seed: int = 0) -> dict:
+    """
+    Write a synthetic library to a directory, laid out like the data files of
+    the application: all_scores.json, all_concerts.json and score_blobs/.
+    Scores cycle through a limited number of distinct PDFs, which the blob
+    store keeps once each, so large libraries are generated quickly.
+    :param directory: Directory to write to, created if missing.
+    :param scores: Number of scores.
+    :param pages: Pages per PDF.
+    :param complexity: Drawing density of the pages, see make_pdf().
+    :param pdf_kb: Target PDF size in KiB, see make_pdf().
+    :param distinct_pdfs: Number of different PDFs shared by the scores.
+    :param concerts: Number of concerts, defaults to one per 50 scores (at least 2).
+    :param program_length: Program entries per concert; every fifth entry is a break.
+    :param seed: Seed of the random generator; equal arguments give equal libraries.
+    :return: Paths of the files: {"scores": ..., "concerts": ..., "blobs": ...}.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = {"scores": os.path.join(directory, "all_scores.json"),
+             "concerts": os.path.join(directory, "all_concerts.json"),
+             "blobs": os.path.join(directory, "score_blobs")}
+    scores_manager = ScoresManager(BlobStore(paths["blobs"]), path=paths["scores"])
+    pdfs = [make_pdf(rng, score_name(rng, i), pages, complexity, pdf_kb)
+            for i in range(min(scores, distinct_pdfs))]
+    for i in range(scores):
+        scores_manager.add_score(score_name(rng, i), True, pdfs[i % len(pdfs)])
+    scores_manager.save()
+
+    concerts_manager = ConcertsManager(path=paths["concerts"])
+    uids = list(scores_manager.scores)
+    for i in range(concerts if concerts is not None else max(2, scores // 50)):
+        program = [{"type": "break", "duration": 300} if (j + 1) % 5 == 0 else rng.choice(uids)
+                   for j in range(program_length)]
+        concerts_manager.add_concert(f"Concert {i + 1}", f"2026-{i % 12 + 1:02d}-15",
+                                     rng.choice(["Rudolfinum", "Town hall", "Church"]), program)
+    concerts_manager.save()
+    return paths
@@ -1,34 +1,41 @@
-import threading
 import time
-import tkinter as tk
 
 
 class ClockController:
-    def __init__(self, get_label_func):
+    def __init__(self, timers, get_label_func):
+        """
+        Initialize the clock of the top bar, updated by the timer service at every
+        change of the wall-clock second. The top bar is rebuilt with every screen,
+        so the current label is looked up on each tick.
+        :param timers: TimerService of the main window.
+        :param get_label_func: Callable returning the current clock label, or None.
+        """
         self.current_date = time.strftime("%d.%m.%Y")
         self.current_time = time.strftime("%H:%M:%S")
         self.get_label_func = get_label_func
-        self._running = True
-        self.thread = threading.Thread(target=self.update_clock, daemon=True)
-        self.thread.start()
+        self.timers = timers
+        self.show_seconds = True
+        self._timer = timers.every(1.0, self.update_clock, widget=get_label_func, align=0.0,
+                                   name="clock")
 
     def set_label(self):
         label = self.get_label_func()
-        label.config(text=f"{self.current_date} {self.current_time}")
+        if label is not None and label.winfo_exists():
+            self.update_clock(label)
 
-    def update_clock(self):
-        while self._running:
-            label = self.get_label_func()
-            if label is not None:
-                self.current_time = time.strftime("%H:%M:%S")
-                self.current_date = time.strftime("%d.%m.%Y")
-                try:
-                    label.config(text=f"{self.current_date} {self.current_time}")
-                except Exception:
-                    time.sleep(5)
-                    continue
-            time.sleep(1)
+    def set_interval(self, seconds: int):
+        """
+        Change how often the clock is updated; from a minute on, seconds are not shown.
+        :param seconds: Seconds between updates, 1 or 60.
+        """
+        self.show_seconds = seconds < 60
+        self.timers.set_interval(self._timer, seconds)
+        self.set_label()
 
-    def stop(self):
-        self._running = False
+    def update_clock(self, label):
+        self.current_time = time.strftime("%H:%M:%S" if self.show_seconds else "%H:%M")
+        self.current_date = time.strftime("%d.%m.%Y")
+        label.config(text=f"{self.current_date} {self.current_time}")
 
+    def stop(self):
+        self._timer.cancel()
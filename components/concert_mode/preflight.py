@@ -0,0 +1,249 @@
+import threading
+import tkinter as tk
+from concurrent.futures import FIRST_COMPLETED, wait
+from tkinter import ttk
+
+from components.rendering.page_cache import PageCache
+from components.rendering.renderer import page_zoom
+from components.scores.documents import FITZ_LOCK, DocumentPool
+from components.widgets.score_viewer import SIDEBAR_WIDTH
+
+# Rough PNG size of a rendered page relative to its raw pixels (mostly white sheet music)
+DISK_BYTES_RATIO = 0.1
+# Height of the navigation bar and top bar, used to guess the page area before a viewer was shown
+VIEWER_RESERVED_HEIGHT = 150
+
+
+def estimate_viewport_size(master) -> tuple:
+    """
+    Estimate the page area of the viewers from the screen size, when no viewer
+    was shown on this screen yet. Pages prepared at this size may not match the
+    viewer exactly.
+    :param master: The main application window.
+    :return: Estimated (width, height) in device pixels.
+    """
+    return (master.winfo_screenwidth() - SIDEBAR_WIDTH - 20,
+            master.winfo_screenheight() - VIEWER_RESERVED_HEIGHT)
+
+
+class ConcertPreflight:
+    def __init__(self, concert, scores_manager, page_renderer, max_size: tuple):
+        """
+        Initialize the warm-up of a concert program: every page of every score in
+        the program is rendered into the page caches before the concert starts.
+        :param concert: Concert to prepare.
+        :param scores_manager: Manager resolving the program's score UIDs.
+        :param page_renderer: Renderer owning the page caches.
+        :param max_size: Page area of the viewer, in device pixels.
+        """
+        self.concert = concert
+        self.scores_manager = scores_manager
+        self.page_renderer = page_renderer
+        self.max_size = max_size
+        self.missing = []  # [(program position, description)]
+        self.pages = []  # [(score, page_num, (width, height))]
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.done = 0
+        self.rendered = 0
+        self.error = None
+        self.analysed = False  # Set once missing, pages and the estimates are complete
+        self.finished = False
+        self._documents = DocumentPool(capacity=len(concert.program) + 1)
+        self._cancelled = False
+        self._thread = None
+
+    @property
+    def total(self) -> int:
+        """
+        Number of pages in the program.
+        """
+        return len(self.pages)
+
+    def analyse(self):
+        """
+        Resolve all score UIDs, open each document and list the pages to render
+        with their size, to report missing scores and estimate memory and disk use.
+        Runs on the warm-up thread, see start().
+        """
+        # Worker processes hand over RGBA pixels, in-process rendering produces RGB
+        bytes_per_pixel = 4 if self.page_renderer.render_pool is not None else 3
+        render_size = self.page_renderer.render_size(self.max_size)
+        seen = set()
+        for position, item in enumerate(self.concert.program, start=1):
+            if self._cancelled:
+                return
+            if isinstance(item, dict):
+                continue
+            score = self.scores_manager.get_score(item)
+            if score is None:
+                self.missing.append((position, f"Unknown score ({item})"))
+                continue
+            if score.UID in seen:
+                continue
+            seen.add(score.UID)
+            document = self._documents.get(score)
+            if document is None:
+                self.missing.append((position, f"{score.name} (no PDF)"))
+                continue
+            with FITZ_LOCK:
+                rects = [document.load_page(i).rect for i in range(document.page_count)]
+            for page_num, rect in enumerate(rects):
+                zoom = page_zoom(rect, render_size)
+                size = (round(rect.width * zoom), round(rect.height * zoom))
+                self.pages.append((score, page_num, size))
+                self.memory_bytes += size[0] * size[1] * bytes_per_pixel
+        self.disk_bytes = int(self.memory_bytes * DISK_BYTES_RATIO)
+        self.analysed = True
+
+    def start(self):
+        """
+        Analyse the program and render all pages on a background thread. The
+        estimates are available once analysed is set, progress from done/total;
+        finished is set when the thread ends.
+        """
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """
+        Stop the warm-up after the page being rendered.
+        """
+        self._cancelled = True
+
+    def _run(self):
+        """
+        Background loop analysing the program, then rendering its pages into the
+        caches, keeping every render worker busy.
+        """
+        in_flight = set()
+        try:
+            self.analyse()
+            for score, page_num, _ in self.pages:
+                while len(in_flight) >= self.page_renderer.workers * 2:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._collect(finished)
+                if self._cancelled:
+                    break
+                render_size = self.page_renderer.render_size(self.max_size)
+                if PageCache.make_key(score.UID, page_num, render_size) not in self.page_renderer.page_cache:
+                    self.rendered += 1
+                document = self._documents.get(score)
+                future = self.page_renderer.render_async(score, page_num, self.max_size,
+                                                         lambda document=document: document)
+                if future.done():
+                    self._collect([future])
+                else:
+                    in_flight.add(future)
+            self._collect(wait(in_flight)[0])
+        except Exception as e:
+            self.error = e
+        finally:
+            self._documents.close_all()
+            self.finished = True
+
+    def _collect(self, futures):
+        """
+        Count finished pages, keeping the first error.
+        :param futures: Completed futures of rendered pages.
+        """
+        for future in futures:
+            self.done += 1
+            if future.exception() is not None and self.error is None:
+                self.error = future.exception()
+
+
+class PreflightScreen(tk.Toplevel):
+    def __init__(self, master, preflight: ConcertPreflight):
+        """
+        Initialize the window showing the warm-up of a concert.
+        :param master: The main application window.
+        :param preflight: ConcertPreflight to run.
+        """
+        super().__init__(master)
+        self.preflight = preflight
+        self._estimate_shown = False
+        self.title(f"Prepare: {preflight.concert.name}")
+        self.geometry("500x400")
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        preflight.start()
+        self.poll_progress()
+
+    def create_widgets(self):
+        """
+        Create widgets for the warm-up window:
+        - memory and disk estimate and missing scores, filled in by show_estimate()
+        - progress bar and status
+        Close button
+        """
+        tk.Label(self, text="Prepare concert", font=("Arial", 16)).pack(pady=10)
+
+        self.estimate_frame = tk.Frame(self)
+        self.estimate_frame.pack()
+        self.estimate_label = tk.Label(self.estimate_frame, text="Checking the program...", font=("Arial", 12))
+        self.estimate_label.pack(pady=5)
+
+        self.progress = ttk.Progressbar(self, orient='horizontal', length=400, mode='determinate', maximum=1)
+        self.progress.pack(pady=15)
+        self.status_label = tk.Label(self, text="", font=("Arial", 12))
+        self.status_label.pack(pady=5)
+
+        self.close_button = tk.Button(self, text="Cancel", font=("Arial", 12), command=self.close)
+        self.close_button.pack(pady=10)
+
+    def show_estimate(self):
+        """
+        Show the memory and disk estimate and the missing scores of the analysed program.
+        """
+        preflight = self.preflight
+        self._estimate_shown = True
+        self.estimate_label.config(text=f"{preflight.total} pages, about {preflight.memory_bytes / 2 ** 20:.0f} MB "
+                                        f"in memory and {preflight.disk_bytes / 2 ** 20:.0f} MB on disk")
+        page_cache = preflight.page_renderer.page_cache
+        if preflight.memory_bytes > page_cache.max_bytes:
+            tk.Label(self.estimate_frame,
+                     text=(f"The page cache ({page_cache.max_bytes / 2 ** 20:.0f} MB) cannot hold the "
+                           "whole program, increase it in Settings to keep every page in memory."),
+                     font=("Arial", 10), fg="orange", wraplength=460).pack(pady=5)
+
+        if preflight.missing:
+            tk.Label(self.estimate_frame, text="Missing scores:", font=("Arial", 12, "bold"),
+                     fg="red").pack(pady=(10, 0))
+            for position, description in preflight.missing:
+                tk.Label(self.estimate_frame, text=f"{position}. {description}", font=("Arial", 11),
+                         fg="red").pack(anchor='w', padx=20)
+        self.progress.config(maximum=max(preflight.total, 1))
+
+    def poll_progress(self):
+        """
+        Update the estimate and the progress bar until the warm-up ends.
+        """
+        if not self.winfo_exists():
+            return
+        preflight = self.preflight
+        if preflight.analysed and not self._estimate_shown:
+            self.show_estimate()
+        self.progress['value'] = preflight.done
+        if not preflight.finished:
+            if preflight.analysed:
+                self.status_label.config(text=f"Rendering page {preflight.done + 1} of {preflight.total}")
+            self.after(100, self.poll_progress)
+            return
+        if preflight.error is not None:
+            self.status_label.config(text=f"Failed: {preflight.error}", fg="red")
+        elif preflight.total == 0:
+            self.status_label.config(text="Nothing to render.")
+        elif preflight.done < preflight.total:
+            self.status_label.config(text=f"Cancelled after {preflight.done} of {preflight.total} pages")
+        else:
+            self.status_label.config(text=f"Ready: {preflight.total} pages prepared "
+                                          f"({preflight.rendered} newly loaded)")
+        self.close_button.config(text="Close")
+
+    def close(self):
+        """
+        Cancel a running warm-up and close the window.
+        """
+        self.preflight.cancel()
+        self.destroy()
@@ -1,10 +1,23 @@
 import uuid
 import json
 from components.concerts.concert import Concert
+from components.concerts.setlist import compile_setlist
+from components.diagnostics.profiling import profiled
+from components.persistence import DebouncedWriter, atomic_write_json
+
+CONCERTS_FILE = "all_concerts.json"
+
 
 class ConcertsManager:
-    def __init__(self):
+    def __init__(self, path: str = CONCERTS_FILE):
+        """
+        Initialize the ConcertsManager.
+        :param path: Path of the JSON file with all concerts.
+        """
         self.concerts = {}
+        self.path = path
+        self._writer = DebouncedWriter(path, span="concerts.save")
+        self._setlists = {}  # {concert uid: Setlist}, compiled programs until the next edit
 
     def add_concert(self, name: str, date: str, location: str, program: list) -> Concert:
         """
@@ -36,6 +49,7 @@ class ConcertsManager:
         """
         if uid in self.concerts:
             del self.concerts[uid]
+            self.invalidate_setlist(uid)
             return True
         return False
 
@@ -46,6 +60,33 @@ class ConcertsManager:
         """
         return list(self.concerts.values())
 
+    def get_setlist(self, uid: str, scores_manager, document_pool):
+        """
+        Get the compiled program of a concert, compiling it on first use after an edit.
+        :param uid: Unique identifier of the concert.
+        :param scores_manager: ScoresManager resolving the score UIDs of the program.
+        :param document_pool: Pool opening documents whose page count is unknown.
+        :return: The Setlist, or None if the concert is not found.
+        """
+        setlist = self._setlists.get(uid)
+        if setlist is None:
+            concert = self.get_concert(uid)
+            if concert is None:
+                return None
+            setlist = compile_setlist(concert, scores_manager, document_pool)
+            self._setlists[uid] = setlist
+        return setlist
+
+    def invalidate_setlist(self, uid: str = None):
+        """
+        Drop a compiled program, e.g. after the library changed.
+        :param uid: Unique identifier of the concert, or None for all concerts.
+        """
+        if uid is None:
+            self._setlists.clear()
+        else:
+            self._setlists.pop(uid, None)
+
     def save_all(self):
         """
         Save all concerts to individual JSON files named after their UIDs.
@@ -53,28 +94,68 @@ class ConcertsManager:
         for concert in self.concerts.values():
             concert.save()
 
+    def _snapshot(self) -> list:
+        """
+        Capture all concerts for saving.
+        :return: List of concert dictionaries, independent of the live objects.
+        """
+        data = []
+        for concert in self.concerts.values():
+            data.append({
+                "UID": concert.UID,
+                "name": concert.name,
+                "date": concert.date,
+                "location": concert.location,
+                "program": [dict(item) if isinstance(item, dict) else item
+                            for item in concert.program]
+            })
+        return data
+
+    @profiled("concerts.save")
     def save(self):
         """
-        Save all concerts to a single JSON file.
+        Save all concerts to a single JSON file, atomically.
+        """
+        atomic_write_json(self.path, self._snapshot())
+
+    def request_save(self):
+        """
+        Schedule a save on the background writer. Bursts of requests are
+        coalesced into one write, so the caller never blocks on disk.
+        """
+        self._writer.schedule(self._snapshot())
+
+    def flush(self):
+        """
+        Write any save scheduled with request_save() immediately, or again after
+        it failed in the background.
+        :raises Exception: The error of the write, if it failed.
+        """
+        self._writer.flush()
+
+    def take_save_error(self):
+        """
+        Get the error of a save that failed in the background, once.
+        :return: The exception, or None.
         """
-        with open("all_concerts.json", "w") as f:
-            data = []
-            for concert in self.concerts.values():
-                data.append({
-                    "UID": concert.UID,
-                    "name": concert.name,
-                    "date": concert.date,
-                    "location": concert.location,
-                    "program": concert.program
-                })
-            f.write(json.dumps(data))
+        return self._writer.take_error()
 
     def load(self):
         """
         Load concerts from a single JSON file.
         """
+        self.install_concerts(self.read_concerts())
+
+    @profiled("concerts.load")
+    def read_concerts(self) -> dict:
+        """
+        Read the concerts file into new Concert objects, without touching the
+        loaded concerts, so this can run on a background thread.
+        :return: {uid: Concert}, empty if there is no file yet.
+        """
+        concerts = {}
         try:
-            with open("all_concerts.json", "r") as f:
+            with open(self.path, "r") as f:
                 data = json.loads(f.read())
                 for concert_dict in data:
                     concert = Concert(
@@ -84,9 +165,20 @@ class ConcertsManager:
                         concert_dict["location"],
                         concert_dict["program"]
                     )
-                    self.concerts[concert.UID] = concert
+                    concerts[concert.UID] = concert
         except FileNotFoundError:
             pass
+        return concerts
+
+    def install_concerts(self, concerts: dict):
+        """
+        Add concerts read by read_concerts(); call this on the thread using the manager.
+        :param concerts: Value returned by read_concerts().
+        """
+        self.concerts.update(concerts)
+        for uid in concerts:
+            self.invalidate_setlist(uid)
+
     def update_concert(self, uid: str, name: str = None, date: str = None, location: str = None, program: list = None) -> bool:
         """
         Update an existing Concert's details.
@@ -107,29 +199,34 @@ class ConcertsManager:
                 concert.location = location
             if program is not None:
                 concert.program = program
+                self.invalidate_setlist(uid)
             return True
         return False
 
     def move_program_item(self, concert_uid, from_index, to_index):
         concert = self.get_concert(concert_uid)
         if concert:
+            self.invalidate_setlist(concert_uid)
             return concert.move_program_item(from_index, to_index)
         return False
 
     def remove_program_item(self, concert_uid, index):
         concert = self.get_concert(concert_uid)
         if concert:
+            self.invalidate_setlist(concert_uid)
             return concert.remove_program_item(index)
         return False
 
     def insert_program_item(self, concert_uid, index, score_uid_or_break):
         concert = self.get_concert(concert_uid)
         if concert:
+            self.invalidate_setlist(concert_uid)
             return concert.insert_program_item(index, score_uid_or_break)
         return False
 
     def add_break(self, concert_uid, index, duration=300):
         concert = self.get_concert(concert_uid)
         if concert:
+            self.invalidate_setlist(concert_uid)
             return concert.add_break(index, duration)
         return False
@@ -0,0 +1,81 @@
+from itertools import accumulate
+
+from components.diagnostics.profiling import profiled
+
+
+class Setlist:
+    def __init__(self, concert_uid: str, items: list, page_counts: list):
+        """
+        Initialize a compiled concert program: the entries shown by the concert
+        viewer in order, and an index from a page of the whole concert to its
+        entry and page. Breaks and scores without a PDF take one page each, the
+        viewer shows them on one screen.
+        :param concert_uid: Unique identifier of the compiled concert.
+        :param items: Score objects and break entries, in program order.
+        :param page_counts: Number of pages of each entry.
+        """
+        self.concert_uid = concert_uid
+        self.items = list(items)
+        self.page_counts = list(page_counts)
+        self.starts = [0] + list(accumulate(self.page_counts))[:-1]  # First concert page of each entry
+        self._locations = [(index, page) for index, count in enumerate(self.page_counts)
+                           for page in range(count)]
+
+    @property
+    def total_pages(self) -> int:
+        """
+        Number of pages of the whole concert.
+        """
+        return len(self._locations)
+
+    def locate(self, concert_page: int) -> tuple:
+        """
+        Find the entry showing a page of the concert.
+        :param concert_page: Zero-based page of the whole concert; clamped to the program.
+        :return: (entry index, zero-based page within the entry).
+        """
+        concert_page = max(0, min(concert_page, len(self._locations) - 1))
+        return self._locations[concert_page]
+
+    def concert_page(self, index: int, page: int = 0) -> int:
+        """
+        Get the page of the whole concert showing a page of an entry.
+        :param index: Entry index.
+        :param page: Zero-based page within the entry; clamped to its pages.
+        :return: Zero-based page of the whole concert.
+        """
+        return self.starts[index] + max(0, min(page, self.page_counts[index] - 1))
+
+
+@profiled("concert.compile_setlist")
+def compile_setlist(concert, scores_manager, document_pool) -> Setlist:
+    """
+    Compile the program of a concert. Page counts come from the score catalog;
+    a score added before page counts were kept is opened once, and its count is
+    saved to the catalog for the next time.
+    :param concert: Concert to compile.
+    :param scores_manager: ScoresManager resolving the score UIDs of the program.
+    :param document_pool: Pool opening documents whose page count is unknown.
+    :return: The compiled Setlist; scores missing from the library are left out.
+    """
+    items = []
+    page_counts = []
+    learned = False
+    for entry in concert.program:
+        if isinstance(entry, dict) and entry.get("type") == "break":
+            items.append(entry)
+            page_counts.append(1)
+            continue
+        score = scores_manager.get_score(entry)
+        if score is None:
+            continue
+        if score.page_count is None and score.has_pdf:
+            document = document_pool.get(score)
+            if document is not None:
+                score.page_count = document.page_count
+                learned = True
+        items.append(score)
+        page_counts.append(max(1, score.page_count or 0))
+    if learned:
+        scores_manager.request_save()
+    return Setlist(concert.UID, items, page_counts)
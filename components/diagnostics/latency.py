@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from collections import deque
+
+# Stages of a page turn, in the order they happen
+STAGES = ("document", "wait", "rasterize", "convert", "photoimage", "draw")
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    :param sorted_values: Values in ascending order, not empty.
+    :param p: Percentile between 0 and 100.
+    :return: The value below which p percent of the values fall.
+    """
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class PageTurn:
+    def __init__(self, source: str):
+        """
+        Initialize the measurement of one page turn, from the input event until
+        the new page is drawn on screen.
+        :param source: What triggered the turn, e.g. "next" or "previous".
+        """
+        self.source = source
+        self.kind = "page"
+        self.start = time.perf_counter()
+        self.wall_time = time.time()
+        self.stages = {}  # {stage: seconds}
+
+    def add(self, stage: str, seconds: float):
+        """
+        Account time to a stage.
+        :param stage: One of STAGES.
+        :param seconds: Duration in seconds.
+        """
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def to_dict(self, total: float) -> dict:
+        """
+        Convert the measurement to a dictionary for the session log.
+        :param total: Input-to-screen latency in seconds.
+        :return: Dictionary with durations in milliseconds.
+        """
+        return {
+            "time": self.wall_time,
+            "source": self.source,
+            "kind": self.kind,
+            "total_ms": round(total * 1000, 3),
+            "stages_ms": {stage: round(seconds * 1000, 3) for stage, seconds in self.stages.items()}
+        }
+
+
+class LatencyRecorder:
+    def __init__(self, window: int = 500):
+        """
+        Initialize the recorder of page-turn latency. It keeps rolling
+        percentiles over the last turns and every turn of the session for
+        the session log.
+        :param window: Number of recent turns the percentiles are computed over.
+        """
+        self.session_start = time.time()
+        self.samples = []  # Every finished turn of the session, as dictionaries
+        self._recent = deque(maxlen=window)
+
+    def begin(self, source: str) -> PageTurn:
+        """
+        Start measuring a page turn; call this first thing in the input handler.
+        :param source: What triggered the turn.
+        :return: The PageTurn to add stages to.
+        """
+        return PageTurn(source)
+
+    def finish(self, turn: PageTurn):
+        """
+        Record a page turn once its page is on screen.
+        :param turn: The measured PageTurn.
+        """
+        sample = turn.to_dict(time.perf_counter() - turn.start)
+        self.samples.append(sample)
+        self._recent.append(sample)
+
+    def percentiles(self) -> dict:
+        """
+        Compute latency percentiles over the recent turns.
+        :return: {"total" or stage: {"p50": ms, "p90": ms, "p99": ms, "max": ms}}, empty without samples.
+        """
+        series = {"total": [sample["total_ms"] for sample in self._recent]}
+        for stage in STAGES:
+            values = [sample["stages_ms"][stage] for sample in self._recent if stage in sample["stages_ms"]]
+            if values:
+                series[stage] = values
+        summary = {}
+        for name, values in series.items():
+            if not values:
+                continue
+            values.sort()
+            summary[name] = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+            summary[name]["max"] = values[-1]
+        return summary
+
+    def dump(self, directory: str = "diagnostics", extra: dict = None) -> str:
+        """
+        Write the session log: one JSON line per page turn, then a summary line
+        with the percentiles.
+        :param directory: Directory of the log files.
+        :param extra: Further session statistics added to the summary line.
+        :return: Path of the written file, or None if no page was turned.
+        """
+        if not self.samples:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.session_start))
+        path = os.path.join(directory, f"latency-{stamp}.jsonl")
+        with open(path, "w") as f:
+            for sample in self.samples:
+                f.write(json.dumps(sample) + "\n")
+            summary = {"summary": self.percentiles(), "turns": len(self.samples)}
+            summary.update(extra or {})
+            f.write(json.dumps(summary) + "\n")
+        return path
+
+
+_shared_recorder = None
+
+
+def get_latency_recorder() -> LatencyRecorder:
+    """
+    Get the process-wide LatencyRecorder fed by the viewers.
+    :return: The shared LatencyRecorder instance.
+    """
+    global _shared_recorder
+    if _shared_recorder is None:
+        _shared_recorder = LatencyRecorder()
+    return _shared_recorder
@@ -0,0 +1,156 @@
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Setting PYMUSICSTAND_PROFILE=1 records spans from startup on, before the settings are read
+PROFILE_ENV = "PYMUSICSTAND_PROFILE"
+# Name of a span (e.g. "scores.load") to capture with cProfile each time it runs
+PROFILE_OPERATION_ENV = "PYMUSICSTAND_PROFILE_OPERATION"
+MAX_EVENTS = 100_000
+
+
+class Profiler:
+    def __init__(self, enabled: bool = False, profile_operation: str = None,
+                 directory: str = "diagnostics"):
+        """
+        Initialize the recorder of timing spans. Spans are kept as Chrome trace
+        events, so the trace file opens in chrome://tracing or Perfetto.
+        While disabled, a span costs one attribute check.
+        :param enabled: Whether spans are recorded.
+        :param profile_operation: Name of a span to run under cProfile, or None.
+        :param directory: Directory of the trace and cProfile files.
+        """
+        self.enabled = enabled
+        self.profile_operation = profile_operation
+        self.directory = directory
+        self.events = deque(maxlen=MAX_EVENTS)
+        self._origin = time.perf_counter()
+        self._session = time.strftime("%Y%m%d-%H%M%S")
+        self._pid = os.getpid()
+        self._profiling = False
+        self._profile_count = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """
+        Record the duration of a block as a trace event.
+        :param name: Name of the operation, e.g. "scores.load".
+        :param args: Details shown with the event in the trace viewer.
+        """
+        if not self.enabled:
+            yield
+            return
+        profile = self._start_profile(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            if profile is not None:
+                self._dump_profile(name, profile)
+            self.record(name, start, end, **args)
+
+    def record(self, name: str, start: float, end: float, **args):
+        """
+        Record an operation measured by the caller, e.g. one spanning several
+        Tk callbacks.
+        :param name: Name of the operation.
+        :param start: perf_counter() time it started at.
+        :param end: perf_counter() time it ended at.
+        :param args: Details shown with the event in the trace viewer.
+        """
+        if not self.enabled:
+            return
+        event = {"name": name, "ph": "X", "pid": self._pid, "tid": threading.get_ident(),
+                 "ts": round((start - self._origin) * 1e6), "dur": round((end - start) * 1e6)}
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        self.events.append(event)
+
+    def write_trace(self) -> str:
+        """
+        Write the recorded spans to a trace file.
+        :return: Path of the written file, or None if nothing was recorded.
+        """
+        if not self.events:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"trace-{self._session}.json")
+        with open(path, "w") as f:
+            json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms"}, f,
+                      separators=(",", ":"))
+        return path
+
+    def _start_profile(self, name: str):
+        """
+        Start cProfile if the span is the chosen operation. Nested or concurrent
+        runs of the operation are not profiled, cProfile allows one profile at a time.
+        :param name: Name of the span.
+        :return: The running cProfile.Profile, or None.
+        """
+        if name != self.profile_operation:
+            return None
+        with self._lock:
+            if self._profiling:
+                return None
+            self._profiling = True
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def _dump_profile(self, name: str, profile):
+        """
+        Stop cProfile and write its statistics, readable with pstats or snakeviz.
+        :param name: Name of the span.
+        :param profile: The running cProfile.Profile.
+        """
+        profile.disable()
+        self._profile_count += 1
+        os.makedirs(self.directory, exist_ok=True)
+        profile.dump_stats(os.path.join(self.directory,
+                                        f"{name}-{self._session}-{self._profile_count}.prof"))
+        with self._lock:
+            self._profiling = False
+
+
+def requested_by_environment() -> bool:
+    """
+    Check whether profiling was switched on for the whole run from the environment.
+    :return: True if PYMUSICSTAND_PROFILE is set to something other than 0.
+    """
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+_shared_profiler = Profiler(enabled=requested_by_environment(),
+                            profile_operation=os.environ.get(PROFILE_OPERATION_ENV) or None)
+
+
+def get_profiler() -> Profiler:
+    """
+    Get the process-wide Profiler, configured from the environment.
+    :return: The shared Profiler instance.
+    """
+    return _shared_profiler
+
+
+def profiled(name: str):
+    """
+    Decorator recording every call of a function as a span of the shared Profiler.
+    :param name: Name of the span.
+    :return: The decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _shared_profiler.enabled:
+                return func(*args, **kwargs)
+            with _shared_profiler.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,169 @@
+import sys
+
+from components.diagnostics.profiling import get_profiler
+from components.scores.documents import FITZ_LOCK
+
+# Used memory percentage, or available bytes, at which the budget is tightened
+PRESSURE_PERCENT = 90
+PRESSURE_AVAILABLE_BYTES = 256 * 1024 * 1024
+
+
+class MemoryBudget:
+    def __init__(self, max_bytes: int = 768 * 1024 * 1024):
+        """
+        Initialize the accountant of the memory held by loaded PDF data, open
+        documents and rendered pages. Each holder is registered as a pool with
+        memory_bytes(), oldest_use() and evict_oldest(); once their total exceeds
+        the ceiling, or the system runs short of memory, the least recently used
+        entry of all pools is evicted until the total fits again.
+        Pools are only touched from the Tk main loop.
+        :param max_bytes: Ceiling for the total of all pools.
+        """
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.under_pressure = False
+        self._pools = {}  # {name: pool}
+
+    def register(self, name: str, pool):
+        """
+        Account a memory holder.
+        :param name: Name used in usage().
+        :param pool: Object with memory_bytes(), oldest_use() and evict_oldest().
+        """
+        self._pools[name] = pool
+
+    def usage(self) -> dict:
+        """
+        Get the memory held by each pool.
+        :return: {pool name: bytes}, plus "total", "max_bytes" and eviction counters.
+        """
+        usage = {name: pool.memory_bytes() for name, pool in self._pools.items()}
+        usage["total"] = sum(usage.values())
+        usage["max_bytes"] = self.max_bytes
+        usage["under_pressure"] = self.under_pressure
+        usage["evictions"] = self.evictions
+        usage["evicted_bytes"] = self.evicted_bytes
+        return usage
+
+    def target_bytes(self) -> int:
+        """
+        Compute the total the pools have to fit in: the ceiling, halved while the
+        system is short of memory.
+        :return: Target in bytes.
+        """
+        memory = _virtual_memory()
+        self.under_pressure = memory is not None and (
+            memory.percent >= PRESSURE_PERCENT or memory.available < PRESSURE_AVAILABLE_BYTES)
+        if self.under_pressure:
+            return self.max_bytes // 2
+        return self.max_bytes
+
+    def enforce(self) -> int:
+        """
+        Evict least recently used entries across all pools until the total fits
+        the target. Call this periodically on the Tk main loop.
+        :return: Bytes freed.
+        """
+        with get_profiler().span("memory.enforce"):
+            target = self.target_bytes()
+            total = sum(pool.memory_bytes() for pool in self._pools.values())
+            freed = 0
+            while total > target:
+                candidates = [(pool.oldest_use(), name) for name, pool in self._pools.items()]
+                candidates = [candidate for candidate in candidates if candidate[0] is not None]
+                if not candidates:
+                    break  # Everything left is in use
+                _, name = min(candidates)
+                size = self._pools[name].evict_oldest()
+                if size <= 0:
+                    break
+                total -= size
+                freed += size
+                self.evictions += 1
+            if self.under_pressure:
+                # Caches without a size of their own are emptied too
+                for pool in self._pools.values():
+                    if hasattr(pool, "trim"):
+                        freed += pool.trim()
+            self.evicted_bytes += freed
+            return freed
+
+
+class MuPdfStore:
+    """
+    MuPDF's own store of decoded fonts and images, shared by all open documents,
+    accounted as a pool. It has no per-entry recency, so it is offered last and
+    shrunk by half on each eviction. PyMuPDF versions that do not report the
+    store size account it as empty; the store is then only emptied by trim()
+    under memory pressure.
+    """
+
+    def memory_bytes(self) -> int:
+        """
+        Bytes held by the store, 0 if PyMuPDF does not report it.
+        """
+        fitz = sys.modules.get("pymupdf")
+        if fitz is None:
+            return 0  # Nothing was rendered yet
+        with FITZ_LOCK:
+            return fitz.TOOLS.store_size() or 0
+
+    def oldest_use(self) -> float:
+        """
+        Offer the store only after every pool with recency information.
+        """
+        return float("inf") if self.memory_bytes() > 0 else None
+
+    def evict_oldest(self) -> int:
+        """
+        Shrink the store by half.
+        :return: Bytes freed.
+        """
+        fitz = sys.modules.get("pymupdf")
+        if fitz is None:
+            return 0
+        with FITZ_LOCK:
+            before = fitz.TOOLS.store_size() or 0
+            fitz.TOOLS.store_shrink(50)
+            return max(0, before - (fitz.TOOLS.store_size() or 0))
+
+    def trim(self) -> int:
+        """
+        Empty the store; it is refilled as pages are rendered.
+        :return: Bytes freed, as far as known.
+        """
+        fitz = sys.modules.get("pymupdf")
+        if fitz is None:
+            return 0
+        with FITZ_LOCK:
+            before = fitz.TOOLS.store_size() or 0
+            fitz.TOOLS.store_shrink(100)
+            return before
+
+
+def _virtual_memory():
+    """
+    Read the system memory state.
+    :return: psutil.virtual_memory() result, or None if unknown.
+    """
+    import psutil
+
+    try:
+        return psutil.virtual_memory()
+    except Exception:
+        return None
+
+
+_shared_budget = None
+
+
+def get_memory_budget() -> MemoryBudget:
+    """
+    Get the memory budget shared by the application.
+    :return: The shared MemoryBudget.
+    """
+    global _shared_budget
+    if _shared_budget is None:
+        _shared_budget = MemoryBudget()
+    return _shared_budget
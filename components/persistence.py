@@ -0,0 +1,203 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from components.diagnostics.profiling import get_profiler
+
+
+def atomic_write(path: str, data: bytes):
+    """
+    Write a file atomically: the data goes to a temporary file in the same
+    directory, is fsynced and then renamed over the target. A crash mid-write
+    leaves either the old or the new file, never a truncated one.
+    :param path: Path of the target file.
+    :param data: Content to write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.",
+                                    suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def atomic_write_json(path: str, data):
+    """
+    Serialize data to JSON and write it atomically.
+    :param path: Path of the target file.
+    :param data: JSON-serializable object.
+    """
+    atomic_write(path, json.dumps(data).encode("utf-8"))
+
+
+def _fsync_directory(directory: str):
+    """
+    Flush a directory entry to disk so a completed rename survives a power loss.
+    Not supported on every platform, failures are ignored.
+    :param directory: Directory to flush.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class DebouncedWriter:
+    def __init__(self, path: str, delay: float = 0.5, max_delay: float = 3.0, span: str = None):
+        """
+        Initialize a background writer for a JSON file.
+        Bursts of schedule() calls are coalesced into a single atomic write of
+        the latest data, performed on a daemon thread.
+        :param path: Path of the JSON file.
+        :param delay: Seconds without new data before writing.
+        :param max_delay: Upper bound of seconds a pending write can be postponed.
+        :param span: Name of the profiler span recorded for each write, e.g. "scores.save".
+        """
+        self.path = path
+        self.span = span
+        self.delay = delay
+        self.max_delay = max_delay
+        self.last_error = None  # Error of the last write, None after a successful one
+        self._error_reported = True
+        self._unsaved = None  # Data of a failed write, written again by flush()
+        self._condition = threading.Condition()
+        self._pending = None
+        self._has_pending = False
+        self._first_scheduled = None
+        self._last_scheduled = None
+        self._writing = False
+        self._closed = False
+        self._thread = None
+
+    def schedule(self, data):
+        """
+        Schedule data to be written. Replaces any data not written yet.
+        :param data: JSON-serializable snapshot; it must not be mutated afterwards.
+        """
+        with self._condition:
+            now = time.monotonic()
+            if not self._has_pending:
+                self._first_scheduled = now
+            self._pending = data
+            self._has_pending = True
+            self._last_scheduled = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self):
+        """
+        Write pending data immediately on the calling thread and wait for any
+        write in progress to finish. Data whose background write failed is
+        written again.
+        :raises Exception: The error of the write, if it failed again.
+        """
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+            if self._has_pending:
+                data = self._take_pending()
+            elif self._unsaved is not None:
+                data = self._unsaved
+                self._writing = True
+            else:
+                return
+        self._write(data)
+        if self.last_error is not None:
+            self._error_reported = True
+            raise self.last_error
+
+    def take_error(self):
+        """
+        Get the error of a failed background write, once.
+        :return: The exception, or None if the last write succeeded or its error was taken already.
+        """
+        with self._condition:
+            if self._error_reported:
+                return None
+            self._error_reported = True
+            return self.last_error
+
+    def close(self):
+        """
+        Flush pending data and stop the background thread.
+        """
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _take_pending(self):
+        """
+        Take the pending data and mark a write as in progress.
+        Must be called with the condition held.
+        :return: The pending data.
+        """
+        data = self._pending
+        self._pending = None
+        self._has_pending = False
+        self._writing = True
+        return data
+
+    def _write(self, data):
+        """
+        Write data to disk and mark the write as finished.
+        :param data: JSON-serializable object.
+        """
+        try:
+            if self.span is not None:
+                with get_profiler().span(self.span):
+                    atomic_write_json(self.path, data)
+            else:
+                atomic_write_json(self.path, data)
+            error = None
+        except Exception as e:
+            error = e
+        with self._condition:
+            self.last_error = error
+            if error is None:
+                self._unsaved = None
+            else:
+                # Kept for flush(), unless newer data replaces it
+                self._unsaved = data
+                self._error_reported = False
+            self._writing = False
+            self._condition.notify_all()
+
+    def _run(self):
+        """
+        Background loop waiting for data to settle and writing it.
+        """
+        while True:
+            with self._condition:
+                while not self._has_pending or self._writing:
+                    if self._closed and not self._has_pending:
+                        return
+                    self._condition.wait()
+                while self._has_pending:
+                    wait = min(self._last_scheduled + self.delay,
+                               self._first_scheduled + self.max_delay) - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._condition.wait(wait)
+                if not self._has_pending or self._writing:
+                    continue
+                data = self._take_pending()
+            self._write(data)
@@ -0,0 +1,183 @@
+# Performance profiles, from full quality to longest runtime. None keeps the
+# value chosen in the settings; other limits only ever lower the settings.
+PROFILES = {
+    "performance": {
+        "prefetch_ahead": None,
+        "prefetch_behind": None,
+        "cache_fraction": 1.0,  # Share of the configured page cache budgets
+        "render_scale": 1.0,  # Rasterization resolution relative to the screen
+        "max_workers": None,
+        "clock_interval": 1,  # Seconds between clock updates; 60 hides the seconds
+        "poll_interval": 30  # Seconds between battery and memory readings
+    },
+    "balanced": {
+        "prefetch_ahead": 1,
+        "prefetch_behind": 1,
+        "cache_fraction": 0.5,
+        "render_scale": 1.0,
+        "max_workers": 2,
+        "clock_interval": 1,
+        "poll_interval": 60
+    },
+    "power_saver": {
+        "prefetch_ahead": 1,
+        "prefetch_behind": 0,
+        "cache_fraction": 0.25,
+        "render_scale": 0.75,
+        "max_workers": 1,
+        "clock_interval": 60,
+        "poll_interval": 120
+    }
+}
+PROFILE_ORDER = ["performance", "balanced", "power_saver"]
+PROFILE_LABELS = {"performance": "", "balanced": "balanced", "power_saver": "power saver"}
+
+# Battery percentage at or below which a profile is used when not plugged in
+BATTERY_THRESHOLDS = {"power_saver": 20, "balanced": 50}
+# Extra percent needed to leave a profile again, so it does not flap around a threshold
+BATTERY_HYSTERESIS = 5
+# Used memory percentage at or above which a profile is used
+MEMORY_THRESHOLDS = {"power_saver": 90, "balanced": 80}
+LOW_MEMORY_BYTES = 256 * 1024 * 1024
+
+
+def battery_profile(battery, current: str) -> str:
+    """
+    Choose the profile the battery state calls for.
+    :param battery: psutil.sensors_battery() result, None without a battery.
+    :param current: Profile in use.
+    :return: Profile name.
+    """
+    if battery is None or battery.power_plugged:
+        return "performance"
+    current_rank = PROFILE_ORDER.index(current)
+    for name in ("power_saver", "balanced"):
+        threshold = BATTERY_THRESHOLDS[name]
+        if PROFILE_ORDER.index(name) <= current_rank:
+            threshold += BATTERY_HYSTERESIS
+        if battery.percent <= threshold:
+            return name
+    return "performance"
+
+
+def memory_profile(memory) -> str:
+    """
+    Choose the profile the memory state calls for.
+    :param memory: psutil.virtual_memory() result, None if unknown.
+    :return: Profile name.
+    """
+    if memory is None:
+        return "performance"
+    if memory.percent >= MEMORY_THRESHOLDS["power_saver"] or memory.available < LOW_MEMORY_BYTES:
+        return "power_saver"
+    if memory.percent >= MEMORY_THRESHOLDS["balanced"]:
+        return "balanced"
+    return "performance"
+
+
+class PowerGovernor:
+    def __init__(self, renderer, settings):
+        """
+        Initialize the governor adapting the performance settings to the power
+        and memory state: plugged in, the settings apply as they are; on a low
+        battery or short of memory, prefetching, caches, render resolution,
+        worker processes and timers are scaled down to stretch the runtime.
+        :param renderer: PageRenderer whose caches, prefetcher and workers are governed.
+        :param settings: Settings holding the values of the full quality profile.
+        """
+        self.renderer = renderer
+        self.settings = settings
+        self.profile_name = "performance"
+        self.battery = None  # Last psutil.sensors_battery() reading
+        self.memory = None  # Last psutil.virtual_memory() reading
+        self._listeners = []
+
+    @property
+    def profile(self) -> dict:
+        """
+        Values of the profile in use, see PROFILES.
+        """
+        return PROFILES[self.profile_name]
+
+    def subscribe(self, callback):
+        """
+        Register a callback notified when the profile changes, e.g. to adjust timers.
+        :param callback: Callable taking (profile name, profile values).
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def read_state(self):
+        """
+        Read the battery and memory state.
+        """
+        import psutil
+
+        try:
+            self.battery = psutil.sensors_battery()
+        except Exception:
+            self.battery = None  # Not supported on this platform
+        try:
+            self.memory = psutil.virtual_memory()
+        except Exception:
+            self.memory = None
+
+    def update(self) -> bool:
+        """
+        Read the battery and memory state and switch the profile if needed.
+        :return: True if the profile changed.
+        """
+        self.read_state()
+        if self.settings.power_saving:
+            candidates = [battery_profile(self.battery, self.profile_name), memory_profile(self.memory)]
+            name = max(candidates, key=PROFILE_ORDER.index)
+        else:
+            name = "performance"
+        if name == self.profile_name:
+            return False
+        self.profile_name = name
+        self.apply()
+        for callback in list(self._listeners):
+            callback(name, self.profile)
+        return True
+
+    def apply(self):
+        """
+        Apply the settings, limited by the profile in use, to the renderer.
+        Call this again whenever the settings change.
+        """
+        profile = self.profile
+        settings = self.settings
+        renderer = self.renderer
+        renderer.page_cache.set_max_bytes(int(settings.page_cache_mb * 1024 * 1024 * profile["cache_fraction"]))
+        renderer.disk_cache.set_max_bytes(settings.disk_cache_mb * 1024 * 1024)
+        renderer.prefetcher.pages_ahead = _limit(settings.prefetch_ahead, profile["prefetch_ahead"])
+        renderer.prefetcher.pages_behind = _limit(settings.prefetch_behind, profile["prefetch_behind"])
+        renderer.resolution_scale = profile["render_scale"]
+        workers = settings.render_workers
+        if workers > 0:
+            # Rendering in the app (0) stays as chosen, it needs no extra processes
+            workers = _limit(workers, profile["max_workers"])
+        renderer.set_workers(workers)
+
+    def status_text(self) -> str:
+        """
+        Describe the battery state and the profile for the status bar.
+        :return: E.g. "15% (power saver)", "80% (Charging)" or "Battery: N/A".
+        """
+        label = PROFILE_LABELS[self.profile_name]
+        if self.battery is None:
+            return f"Battery: N/A ({label})" if label else "Battery: N/A"
+        details = [detail for detail in ("Charging" if self.battery.power_plugged else "", label) if detail]
+        percent = round(self.battery.percent)
+        return f"{percent}% ({', '.join(details)})" if details else f"{percent}%"
+
+
+def _limit(value: int, limit) -> int:
+    """
+    Apply a profile limit to a setting.
+    :param value: Value from the settings.
+    :param limit: Maximum allowed by the profile, or None for no limit.
+    :return: The limited value.
+    """
+    return value if limit is None else min(value, limit)
@@ -1,21 +1,41 @@
 import sys
-import tempfile
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
-import pymupdf as fitz
-from PIL import Image, ImageTk
-
 sys.path.append("..")
 
-from components.scores.scores_manager import ScoresManager
+from components.diagnostics.profiling import profiled
+from components.rendering.renderer import get_page_renderer
+from components.scores.documents import get_document_pool
+from components.scores.scores_manager import get_scores_manager
+from components.widgets.score_viewer import ScoreViewer
+from components.widgets.virtual_list import VirtualList
 
 
 class GuiPracticeMode():
     def __init__(self, master):
         self.master = master
-        self.scores_manager = ScoresManager()
-        self.scores_manager.load()
+        self.scores_manager = get_scores_manager()
+        self.scores_manager.subscribe(self._on_scores_changed)
+        self.document_pool = get_document_pool()
+        self.scores_manager.subscribe(self.document_pool.on_scores_changed)
+        self.page_renderer = get_page_renderer()
+        self.scores_manager.subscribe(self.page_renderer.on_scores_changed)
+        self._scores_list = None
+        self._viewer = None
+
+    def _on_scores_changed(self, event, score):
+        """
+        Refresh the scores list or the viewer sidebar if it is on screen while the library changes.
+        :param event: Kind of change reported by the ScoresManager.
+        :param score: The affected Score, if any.
+        """
+        if event in ("removing", "blob_removed"):
+            return  # Steps of a removal, the list changes with "removed"
+        if self._scores_list is not None and self._scores_list.winfo_exists():
+            self.change_to_practice_mode()
+        elif self._viewer is not None and self._viewer.winfo_exists():
+            self._viewer.set_items(self.scores_manager.list_scores())
 
     def change_to_practice_mode(self):
         self.master.clear_screen()
@@ -23,6 +43,7 @@ class GuiPracticeMode():
         self.master.title("Practice Mode")
         self.generate_mode_gui()
 
+    @profiled("practice.library_screen")
     def generate_mode_gui(self):
         """
         Generate the GUI for practice mode.
@@ -35,45 +56,25 @@ class GuiPracticeMode():
         search_label = tk.Label(search_frame, text="Search Scores:", font=("Arial", 14))
         search_label.pack(side='left', padx=5)
 
-        search_entry = tk.Entry(search_frame, font=("Arial", 14))
+        search_var = tk.StringVar()
+        search_entry = tk.Entry(search_frame, font=("Arial", 14), textvariable=search_var)
         search_entry.pack(side='left', padx=5)
 
-        search_button = tk.Button(search_frame, text="Search", font=("Arial", 14))
-        search_button.pack(side='left', padx=5)
-
-        # Scrollable scores list
-        scores_frame_container = tk.Frame(self.master)
-        scores_frame_container.pack(pady=10, fill='both', expand=True)
-        scores_canvas = tk.Canvas(scores_frame_container, height=300)
-        scores_canvas.pack(side='left', fill='both', expand=True)
-        scrollbar = tk.Scrollbar(scores_frame_container, orient='vertical', command=scores_canvas.yview)
-        scrollbar.pack(side='right', fill='y')
-        scores_canvas.configure(yscrollcommand=scrollbar.set)
-        scores_inner_frame = tk.Frame(scores_canvas)
-        scores_canvas.create_window((0, 0), window=scores_inner_frame, anchor='nw')
+        def update_results(*args):
+            scores_list.set_items(self.scores_manager.search(search_var.get()))
 
-        def on_frame_configure(event):
-            scores_canvas.configure(scrollregion=scores_canvas.bbox('all'))
-        scores_inner_frame.bind('<Configure>', on_frame_configure)
-
-        # Natural scrolling (touch-like, y axis only)
-        def _on_mousewheel(event):
-            scores_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        def _on_press(event):
-            scores_canvas.scan_mark(0, event.y)  # Only y axis
-        def _on_drag(event):
-            scores_canvas.scan_dragto(0, event.y, gain=1)  # Only y axis
-        scores_canvas.bind("<MouseWheel>", _on_mousewheel)
-        scores_canvas.bind("<ButtonPress-1>", _on_press)
-        scores_canvas.bind("<B1-Motion>", _on_drag)
+        search_button = tk.Button(search_frame, text="Search", font=("Arial", 14), command=update_results)
+        search_button.pack(side='left', padx=5)
+        # Filter the list as the user types
+        search_var.trace_add('write', update_results)
+        search_entry.bind('<Return>', update_results)
 
-        scores_list = self.scores_manager.list_scores()
-        for score in scores_list:
-            def make_open_func(uid=score.UID):
-                return lambda: self.open_score(uid)
-            score_button = tk.Button(scores_inner_frame, text=score.name, font=("Arial", 12), width=30,
-                                     command=make_open_func())
-            score_button.pack(pady=2)
+        # Scores list, only the visible rows are materialized
+        scores_list = VirtualList(self.master, self.scores_manager.list_scores(),
+                                  lambda index, score: self.open_score(score.UID),
+                                  item_text=lambda score: score.name, width=30)
+        scores_list.pack(pady=10, fill='both', expand=True)
+        self._scores_list = scores_list
 
         add_button = tk.Button(self.master, text="Add Score", font=("Arial", 14),
                                command=self.add_score)
@@ -139,7 +140,7 @@ class GuiPracticeMode():
                 has_pdf = False
                 pdf_data = None
             self.scores_manager.add_score(name, has_pdf, pdf_data)
-            self.scores_manager.save()
+            self.scores_manager.request_save()
             self.change_to_practice_mode()
 
         submit_button = tk.Button(self.master, text="Submit", font=("Arial", 14), command=submit)
@@ -161,52 +162,16 @@ class GuiPracticeMode():
         self.master.generate_top_bar()
         self.master.title("Remove Score")
 
-        # Create a container frame for canvas and scrollbar
-        scores_frame_container = tk.Frame(self.master)
-        scores_frame_container.pack(pady=10, fill='both', expand=True)
-
-        # Canvas for scrollable area
-        scores_canvas = tk.Canvas(scores_frame_container, height=300)
-        scores_canvas.pack(side='left', fill='both', expand=True)
-
-        # Vertical scrollbar
-        scrollbar = tk.Scrollbar(scores_frame_container, orient='vertical', command=scores_canvas.yview)
-        scrollbar.pack(side='right', fill='y')
-        scores_canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Inner frame for score buttons
-        scores_inner_frame = tk.Frame(scores_canvas)
-        scores_canvas.create_window((0, 0), window=scores_inner_frame, anchor='nw')
-
-        def on_frame_configure(event):
-            scores_canvas.configure(scrollregion=scores_canvas.bbox('all'))
-        scores_inner_frame.bind('<Configure>', on_frame_configure)
+        def remove_func(index, s):
+            if messagebox.askyesno("Confirm",
+                                   f"Are you sure you want to remove '{s.name}'?"):
+                self.scores_manager.remove_score(s.UID)
+                self.scores_manager.request_save()
+                self.change_to_practice_mode()
 
-        # Natural scrolling (touch-like, y axis only)
-        def _on_mousewheel(event):
-            scores_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        def _on_press(event):
-            scores_canvas.scan_mark(0, event.y)  # Only y axis
-        def _on_drag(event):
-            scores_canvas.scan_dragto(0, event.y, gain=1)  # Only y axis
-        scores_canvas.bind("<MouseWheel>", _on_mousewheel)
-        scores_canvas.bind("<ButtonPress-1>", _on_press)
-        scores_canvas.bind("<B1-Motion>", _on_drag)
-
-        scores_list = self.scores_manager.list_scores()
-        for score in scores_list:
-            def make_remove_func(s=score):
-                def remove_func():
-                    if messagebox.askyesno("Confirm",
-                                           f"Are you sure you want to remove '{s.name}'?"):
-                        self.scores_manager.remove_score(s.UID)
-                        self.scores_manager.save()
-                        self.change_to_practice_mode()
-                return remove_func
-
-            score_button = tk.Button(scores_inner_frame, text=score.name, font=("Arial", 12), width=30,
-                                     command=make_remove_func())
-            score_button.pack(pady=2)
+        scores_list = VirtualList(self.master, self.scores_manager.list_scores(), remove_func,
+                                  item_text=lambda score: score.name, width=30)
+        scores_list.pack(pady=10, fill='both', expand=True)
 
         back_button = tk.Button(self.master, text="Back", font=("Arial", 14),
                                 command=self.change_to_practice_mode)
@@ -222,178 +187,16 @@ class GuiPracticeMode():
             return
         self.show_pdf_viewer(score, uid, last=last)
 
+    @profiled("practice.viewer_screen")
     def show_pdf_viewer(self, score, uid, last=False):
         """
         Show a PDF viewer for the given score in the tkinter window.
+        The viewer lists the whole library; moving to another score updates it in place.
         """
         self.master.clear_screen()
         self.master.generate_top_bar()
-        self.master.add_title_to_top_bar(score.name)
-        self.master.title(f"Score: {score.name}")
-
-        def go_prev(event=None):
-            if getattr(self, '_pdf_doc', None) and self._pdf_page > 0:
-                self._pdf_page -= 1
-                show_page(self._pdf_page)
-            else:
-                self.open_previous_score(uid)
-
-        def go_next(event=None):
-            if getattr(self, '_pdf_doc', None) and self._pdf_page < self._pdf_doc.page_count - 1:
-                self._pdf_page += 1
-                show_page(self._pdf_page)
-            else:
-                self.open_next_score(uid)
-
-        def bind_keys():
-            self._unbind_prev = self.master.bind(self.master.key_prev, go_prev)
-            self._unbind_next = self.master.bind(self.master.key_next, go_next)
-
-        def unbind_keys():
-            if hasattr(self, '_unbind_prev'):
-                self.master.unbind(self.master.key_prev, self._unbind_prev)
-            if hasattr(self, '_unbind_next'):
-                self.master.unbind(self.master.key_next, self._unbind_next)
-
-        # Always bind keys, even if no PDF
-        bind_keys()
-
-        # Unbind keys when leaving PDF viewer
-        def back_and_unbind():
-            unbind_keys()
-            self.change_to_practice_mode()
-
-        if not getattr(score, 'has_pdf', False) or not getattr(score, 'pdf_data', None):
-            label = tk.Label(self.master, text="PDF unavailable", font=("Arial", 20), fg="red")
-            label.pack(pady=40)
-            nav_frame = tk.Frame(self.master)
-            nav_frame.pack(pady=10)
-            prev_btn = tk.Button(nav_frame, text="\u2190", font=("Arial", 18),
-                                 command=lambda: self.open_previous_score(uid))
-            prev_btn.pack(side='left', padx=20)
-            next_btn = tk.Button(nav_frame, text="\u2192", font=("Arial", 18),
-                                 command=lambda: self.open_next_score(uid))
-            next_btn.pack(side='left', padx=20)
-            back_button = tk.Button(nav_frame, text="Back", font=("Arial", 14),
-                                    command=back_and_unbind)
-            back_button.pack(side='left', padx=20)
-            return
-
-        # Main container frame
-        container = tk.Frame(self.master)
-        container.pack(fill='both', expand=True)
-
-        # Left frame: scrollable score list
-        left_frame_container = tk.Frame(container, width=200, bg='#f0f0f0')
-        left_frame_container.pack(side='left', fill='y')
-        left_frame_container.pack_propagate(False)
-        left_canvas = tk.Canvas(left_frame_container, width=200, bg='#f0f0f0')
-        left_canvas.pack(side='left', fill='y', expand=True)
-        left_scrollbar = tk.Scrollbar(left_frame_container, orient='vertical', command=left_canvas.yview)
-        left_scrollbar.pack(side='right', fill='y')
-        left_canvas.configure(yscrollcommand=left_scrollbar.set)
-        left_inner_frame = tk.Frame(left_canvas, bg='#f0f0f0')
-        left_canvas.create_window((0, 0), window=left_inner_frame, anchor='nw')
-        def on_left_frame_configure(event):
-            left_canvas.configure(scrollregion=left_canvas.bbox('all'))
-        left_inner_frame.bind('<Configure>', on_left_frame_configure)
-
-        # Natural scrolling for left score list (y axis only)
-        def _on_mousewheel(event):
-            left_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        def _on_press(event):
-            left_canvas.scan_mark(0, event.y)  # Only y axis
-        def _on_drag(event):
-            left_canvas.scan_dragto(0, event.y, gain=1)  # Only y axis
-        left_canvas.bind("<MouseWheel>", _on_mousewheel)
-        left_canvas.bind("<ButtonPress-1>", _on_press)
-        left_canvas.bind("<B1-Motion>", _on_drag)
-
-        scores_list = self.scores_manager.list_scores()
-        for s in scores_list:
-            is_selected = (s.UID == uid)
-            btn_bg = 'lightblue' if is_selected else '#f0f0f0'
-            btn_font = ("Arial", 12, "bold") if is_selected else ("Arial", 12)
-            def make_open_func(score_uid=s.UID):
-                return lambda: self.open_score(score_uid)
-            score_btn = tk.Button(left_inner_frame, text=s.name, font=btn_font, width=20, anchor='w',
-                                  bg=btn_bg, relief='flat', command=make_open_func())
-            score_btn.pack(fill='x', pady=1, padx=2)
-
-        # Right frame: PDF viewer and navigation
-        right_frame = tk.Frame(container)
-        right_frame.pack(side='left', fill='both', expand=True)
-
-        # Save PDF data to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-            tmp.write(score.pdf_data)
-            pdf_path = tmp.name
-
-        # Store state for navigation
-        self._pdf_doc = fitz.open(pdf_path)
-        self._pdf_page = 0
-        if last:
-            self._pdf_page = self._pdf_doc.page_count - 1
-        self._pdf_score = score
-        self._pdf_img_label = None
-        self._pdf_path = pdf_path
-
-        def show_page(page_num):
-            page = self._pdf_doc.load_page(page_num)
-            pix = page.get_pixmap()
-            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-            img.thumbnail((900, 1200))  # Resize for display
-            tk_img = ImageTk.PhotoImage(img)
-            if self._pdf_img_label is None:
-                self._pdf_img_label = tk.Label(right_frame, image=tk_img)
-                self._pdf_img_label.image = tk_img
-                self._pdf_img_label.pack(pady=10)
-            else:
-                self._pdf_img_label.configure(image=tk_img)
-                self._pdf_img_label.image = tk_img
-
-        nav_frame = tk.Frame(right_frame)
-        nav_frame.pack(pady=10)
-        prev_btn = tk.Button(nav_frame, text="\u2190", font=("Arial", 18), command=go_prev)
-        prev_btn.pack(side='left', padx=20)
-        next_btn = tk.Button(nav_frame, text="\u2192", font=("Arial", 18), command=go_next)
-        next_btn.pack(side='left', padx=20)
-        back_button = tk.Button(nav_frame, text="Back", font=("Arial", 14), command=back_and_unbind)
-        back_button.pack(side='left', padx=20)
-
-        show_page(self._pdf_page)
-
-    def open_next_score(self, uid):
-        """
-        Open the next score in the list after the given UID.
-        If at the end of the list, wrap around to the first score.
-        :param uid: Current score UID.
-        """
         scores = self.scores_manager.list_scores()
-        if not scores:
-            messagebox.showinfo("Info", "No scores available.")
-            return
-        current_index = next((i for i, s in enumerate(scores) if s.UID == uid), None)
-        if current_index is None:
-            messagebox.showerror("Error", "Current score not found.")
-            return
-        next_index = (current_index + 1) % len(scores)
-        next_score = scores[next_index]
-        self.open_score(next_score.UID)
-
-    def open_previous_score(self, uid):
-        """
-        Open the previous score in the list before the given UID.
-        :param uid: Current score UID.
-        """
-        scores = self.scores_manager.list_scores()
-        if not scores:
-            messagebox.showinfo("Info", "No scores available.")
-            return
-        current_index = next((i for i, s in enumerate(scores) if s.UID == uid), None)
-        if current_index is None:
-            messagebox.showerror("Error", "Current score not found.")
-            return
-        prev_index = (current_index - 1) % len(scores)
-        prev_score = scores[prev_index]
-        self.open_score(prev_score.UID, last=True)
+        self._viewer = ScoreViewer(self.master, scores, self.page_renderer, self.document_pool,
+                                   on_back=self.change_to_practice_mode)
+        self._viewer.pack(fill='both', expand=True)
+        self._viewer.show_item(next(i for i, s in enumerate(scores) if s.UID == uid), last=last)
@@ -0,0 +1,256 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+
+
+class DiskPageCache:
+    def __init__(self, root: str = "page_cache", max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialize a persistent cache of rendered pages that survives restarts.
+        Pages are stored as PNG files under the content hash of their PDF, named
+        after page number, size and render options. Every file also records the
+        hash it was rendered from, which is checked when it is read back.
+        :param root: Directory holding the cached pages.
+        :param max_bytes: Size cap of the cache directory; oldest pages are evicted first.
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self._total_bytes = None  # Computed on first write
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()  # Jobs of the writer thread: (function, arguments)
+        self._thread = None
+        self._reader = None  # Executor decoding pages for get_async()
+
+    def path(self, pdf_hash: str, page_num: int, size: tuple, options: tuple = ()) -> str:
+        """
+        Get the file path of a cached page.
+        :param pdf_hash: Content hash of the PDF.
+        :param page_num: Zero-based page number.
+        :param size: Target (width, height) of the rendered page.
+        :param options: Render options.
+        :return: Path of the PNG file (it may not exist).
+        """
+        options_part = "-".join(str(option) for option in options) or "default"
+        return os.path.join(self.root, pdf_hash[:2], pdf_hash,
+                            f"{page_num}_{size[0]}x{size[1]}_{options_part}.png")
+
+    def contains(self, pdf_hash: str, page_num: int, size: tuple, options: tuple = ()) -> bool:
+        """
+        Check whether a page is cached, without reading it.
+        :param pdf_hash: Content hash of the PDF.
+        :param page_num: Zero-based page number.
+        :param size: Target (width, height) of the rendered page.
+        :param options: Render options.
+        :return: True if the file of the page exists.
+        """
+        return os.path.exists(self.path(pdf_hash, page_num, size, options))
+
+    def get_async(self, pdf_hash: str, page_num: int, size: tuple, options: tuple = ()):
+        """
+        Load a cached page on a background thread, so the caller does not wait
+        for reading and PNG decoding.
+        :param pdf_hash: Content hash of the PDF.
+        :param page_num: Zero-based page number.
+        :param size: Target (width, height) of the rendered page.
+        :param options: Render options.
+        :return: Future resolving to the PIL image, or to None if the page is not cached.
+        """
+        with self._lock:
+            if self._reader is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-cache-reader")
+        return self._reader.submit(self.get, pdf_hash, page_num, size, options)
+
+    def get(self, pdf_hash: str, page_num: int, size: tuple, options: tuple = ()):
+        """
+        Load a cached page.
+        A file that cannot be decoded or was rendered from another PDF is deleted.
+        :param pdf_hash: Content hash of the PDF.
+        :param page_num: Zero-based page number.
+        :param size: Target (width, height) of the rendered page.
+        :param options: Render options.
+        :return: The PIL image, or None if the page is not cached.
+        """
+        from PIL import Image
+
+        path = self.path(pdf_hash, page_num, size, options)
+        try:
+            with Image.open(path) as img:
+                if img.info.get("pdf_hash") != pdf_hash:
+                    raise ValueError("Cached page does not belong to this PDF")
+                img.load()
+                loaded = img.convert("RGB") if img.mode != "RGB" else img.copy()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._remove_file(path)
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for eviction
+        except OSError:
+            pass
+        return loaded
+
+    def put(self, pdf_hash: str, page_num: int, size: tuple, image, options: tuple = ()):
+        """
+        Store a rendered page, evicting the oldest pages if the cap is exceeded.
+        :param pdf_hash: Content hash of the PDF.
+        :param page_num: Zero-based page number.
+        :param size: Target (width, height) of the rendered page.
+        :param image: Rendered PIL image.
+        :param options: Render options.
+        """
+        from PIL import PngImagePlugin
+
+        path = self.path(pdf_hash, page_num, size, options)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        info = PngImagePlugin.PngInfo()
+        info.add_text("pdf_hash", pdf_hash)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                # Low compression keeps encoding cheap, the pages are mostly white anyway
+                image.save(f, format="PNG", pnginfo=info, compress_level=1)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += os.path.getsize(path)
+        self._evict()
+
+    def put_async(self, pdf_hash: str, page_num: int, size: tuple, image, options: tuple = ()):
+        """
+        Store a rendered page on a background thread, so the caller does not wait
+        for PNG encoding and disk writes.
+        :param pdf_hash: Content hash of the PDF.
+        :param page_num: Zero-based page number.
+        :param size: Target (width, height) of the rendered page.
+        :param image: Rendered PIL image; it must not be modified afterwards.
+        :param options: Render options.
+        """
+        self._submit(self.put, pdf_hash, page_num, size, image, options)
+
+    def remove(self, pdf_hash: str):
+        """
+        Delete all cached pages of a PDF on the background thread.
+        :param pdf_hash: Content hash of the PDF.
+        """
+        self._submit(self._remove_pages, pdf_hash)
+
+    def set_max_bytes(self, max_bytes: int):
+        """
+        Change the size cap. Pages are evicted on the background thread, since
+        measuring the cache means listing the whole directory.
+        :param max_bytes: New cap in bytes.
+        """
+        self.max_bytes = max_bytes
+        self._submit(self._evict)
+
+    def flush(self):
+        """
+        Wait until the background thread has done all queued work.
+        """
+        self._queue.join()
+
+    def size_bytes(self) -> int:
+        """
+        Get the total size of the cached pages.
+        :return: Size in bytes.
+        """
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, _, size in self._scan())
+            return self._total_bytes
+
+    def _submit(self, function, *args):
+        """
+        Queue work for the background thread, starting it if needed.
+        :param function: Function to call.
+        :param args: Its arguments.
+        """
+        self._queue.put((function, args))
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """
+        Background loop writing pages queued by put_async(), removing pages and evicting.
+        """
+        while True:
+            function, args = self._queue.get()
+            try:
+                function(*args)
+            except Exception:
+                # The cache is an optimization, a failed write only costs a later re-render
+                pass
+            finally:
+                self._queue.task_done()
+
+    def _remove_pages(self, pdf_hash: str):
+        """
+        Delete all cached pages of a PDF.
+        :param pdf_hash: Content hash of the PDF.
+        """
+        shutil.rmtree(os.path.join(self.root, pdf_hash[:2], pdf_hash), ignore_errors=True)
+        with self._lock:
+            self._total_bytes = None
+
+    def _scan(self) -> list:
+        """
+        List all cached pages.
+        :return: List of (mtime, path, size) tuples.
+        """
+        files = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if not name.endswith(".png"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+        return files
+
+    def _evict(self):
+        """
+        Delete least recently used pages until the cache is below 90% of its cap,
+        leaving headroom so eviction does not run on every write.
+        """
+        if self.size_bytes() <= self.max_bytes:
+            return
+        with self._lock:
+            files = sorted(self._scan())
+            total = sum(size for _, _, size in files)
+            target = self.max_bytes * 0.9
+            for _, path, size in files:
+                if total <= target:
+                    break
+                if self._remove_file(path):
+                    total -= size
+            self._total_bytes = total
+
+    @staticmethod
+    def _remove_file(path: str) -> bool:
+        """
+        Delete a cached page, ignoring files that are already gone.
+        :param path: Path of the file.
+        :return: True if the file was removed, else False.
+        """
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PageCache:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize an in-memory cache of rendered pages.
+        Entries are keyed by (score UID, page, target size, render options) and
+        evicted least recently used first once their total size exceeds the budget.
+        :param max_bytes: Budget for the pixel data of all cached pages.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # {key: (image, size_in_bytes, time.monotonic() of last use)}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(uid: str, page_num: int, size: tuple, options: tuple = ()) -> tuple:
+        """
+        Build a cache key.
+        :param uid: Unique identifier of the score.
+        :param page_num: Zero-based page number.
+        :param size: Target (width, height) of the rendered page.
+        :param options: Hashable render options.
+        :return: The cache key.
+        """
+        return uid, page_num, tuple(size), tuple(options)
+
+    @staticmethod
+    def image_bytes(image) -> int:
+        """
+        Estimate the memory held by a PIL image.
+        :param image: PIL image.
+        :return: Size of its pixel data in bytes.
+        """
+        return image.width * image.height * len(image.getbands())
+
+    def get(self, key, count: bool = True):
+        """
+        Get a rendered page and mark it as recently used.
+        :param key: Cache key from make_key().
+        :param count: Count the lookup in the hits and misses; off for prefetching
+            and warm-up, so the counters report the hit rate of pages shown.
+        :return: The cached PIL image, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return None
+            self._entries[key] = (entry[0], entry[1], time.monotonic())
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[0]
+
+    def peek(self, key):
+        """
+        Get a rendered page without touching recency or the hit/miss counters.
+        :param key: Cache key from make_key().
+        :return: The cached PIL image, or None if not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def put(self, key, image):
+        """
+        Store a rendered page, evicting older pages if the budget is exceeded.
+        A page larger than the whole budget is not stored.
+        :param key: Cache key from make_key().
+        :param image: Rendered PIL image.
+        """
+        size = self.image_bytes(image)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (image, size, time.monotonic())
+            self.current_bytes += size
+            self._evict()
+
+    def invalidate(self, uid: str):
+        """
+        Drop all cached pages of a score.
+        :param uid: Unique identifier of the score.
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == uid]:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """
+        Drop all cached pages.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def set_max_bytes(self, max_bytes: int):
+        """
+        Change the budget, evicting pages if needed.
+        :param max_bytes: New budget in bytes.
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def memory_bytes(self) -> int:
+        """
+        Bytes held by the cached pages, for the memory budget.
+        """
+        return self.current_bytes
+
+    def oldest_use(self) -> float:
+        """
+        Time the least recently used page was last used, for the memory budget.
+        :return: time.monotonic() value, or None if the cache is empty.
+        """
+        with self._lock:
+            if not self._entries:
+                return None
+            return next(iter(self._entries.values()))[2]
+
+    def evict_oldest(self) -> int:
+        """
+        Evict the least recently used page, for the memory budget.
+        :return: Bytes freed.
+        """
+        with self._lock:
+            if not self._entries:
+                return 0
+            size = self._entries.popitem(last=False)[1][1]
+            self.current_bytes -= size
+            return size
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+        :return: Dictionary with entry count, bytes used, budget, hits and misses.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def _evict(self):
+        """
+        Evict least recently used pages until the budget is met.
+        Must be called with the lock held.
+        """
+        while self.current_bytes > self.max_bytes and self._entries:
+            size = self._entries.popitem(last=False)[1][1]
+            self.current_bytes -= size
@@ -0,0 +1,155 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from components.scores.documents import DocumentPool
+
+
+class Prefetcher:
+    def __init__(self, load_func, pages_ahead: int = 2, pages_behind: int = 1,
+                 max_in_flight: int = 1):
+        """
+        Initialize a background renderer filling the page caches with the pages
+        around the one on screen, so page turns only swap an already rendered image.
+        :param load_func: Function (score, page_num, max_size, document_func) -> Future,
+            loading a page into the caches (see PageRenderer.render_async).
+        :param pages_ahead: Number of following pages to render.
+        :param pages_behind: Number of preceding pages to render.
+        :param max_in_flight: Number of pages rendered at the same time.
+        """
+        self.load_func = load_func
+        self.pages_ahead = pages_ahead
+        self.pages_behind = pages_behind
+        self.max_in_flight = max_in_flight
+        # Documents are never shared with the Tk thread, each thread keeps its own
+        # handles. They are only opened when pages are rendered in this process.
+        self._documents = DocumentPool(capacity=3)
+        self._documents_lock = threading.Lock()
+        self._memory_bytes = 0
+        self._jobs = []  # [(score, page_num, max_size)]
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def prefetch(self, score, page_num: int, page_count: int, max_size: tuple,
+                 next_score=None, previous_score=None, previous_page_count: int = None):
+        """
+        Replace the pending work with the neighbourhood of the page on screen.
+        Nearest pages are rendered first.
+        :param score: Score on screen.
+        :param page_num: Page on screen.
+        :param page_count: Number of pages of the score.
+        :param max_size: Maximum (width, height) of the rendered pages.
+        :param next_score: Score following this one, its first page is rendered too.
+        :param previous_score: Score preceding this one, its last page is rendered too.
+        :param previous_page_count: Number of pages of the previous score; without
+            it, its last page is not rendered.
+        """
+        jobs = []
+        for distance in range(1, max(self.pages_ahead, self.pages_behind) + 1):
+            if distance <= self.pages_ahead and page_num + distance < page_count:
+                jobs.append((score, page_num + distance, max_size))
+            if distance <= self.pages_behind and page_num - distance >= 0:
+                jobs.append((score, page_num - distance, max_size))
+        if next_score is not None and self.pages_ahead > 0:
+            jobs.append((next_score, 0, max_size))
+        if previous_score is not None and previous_page_count and self.pages_behind > 0:
+            jobs.append((previous_score, previous_page_count - 1, max_size))
+        self._submit(jobs)
+
+    def cancel(self):
+        """
+        Drop all pending work.
+        """
+        self._submit([])
+
+    def memory_bytes(self) -> int:
+        """
+        Estimated bytes held by the documents of the prefetcher, for the memory budget.
+        While a page is being loaded, the last known value is returned.
+        """
+        if not self._documents_lock.acquire(blocking=False):
+            return self._memory_bytes
+        try:
+            self._memory_bytes = self._documents.memory_bytes()
+            return self._memory_bytes
+        finally:
+            self._documents_lock.release()
+
+    def oldest_use(self) -> float:
+        """
+        Last use of the least recently used document, for the memory budget.
+        :return: time.monotonic() value, or None if there is nothing to evict or
+            a page is being loaded right now.
+        """
+        if not self._documents_lock.acquire(blocking=False):
+            return None
+        try:
+            return self._documents.oldest_use()
+        finally:
+            self._documents_lock.release()
+
+    def evict_oldest(self) -> int:
+        """
+        Close the least recently used document, for the memory budget.
+        :return: Estimated bytes freed.
+        """
+        if not self._documents_lock.acquire(blocking=False):
+            return 0
+        try:
+            return self._documents.evict_oldest()
+        finally:
+            self._documents_lock.release()
+
+    def release(self, uid: str):
+        """
+        Close the document of a score opened by the prefetcher, e.g. before its
+        PDF is deleted. Waits for a page of it being loaded.
+        :param uid: Unique identifier of the score.
+        """
+        with self._documents_lock:
+            self._documents.close(uid)
+
+    def _submit(self, jobs: list):
+        """
+        Replace the pending jobs and wake the worker thread.
+        :param jobs: New list of (score, page_num, max_size) jobs.
+        """
+        with self._condition:
+            self._jobs = jobs
+            if jobs and self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        """
+        Worker loop handing queued pages to the renderer, keeping at most
+        max_in_flight of them rendering at once.
+        """
+        in_flight = set()
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                score, page_num, max_size = self._jobs.pop(0)
+            while len(in_flight) >= max(self.max_in_flight, 1):
+                _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            try:
+                with self._documents_lock:
+                    future = self._load(score, page_num, max_size)
+            except Exception:
+                # A page that cannot be prefetched is rendered on demand instead
+                continue
+            if future is not None and not future.done():
+                in_flight.add(future)
+
+    def _load(self, score, page_num: int, max_size: tuple):
+        """
+        Start loading one page into the caches.
+        Must be called with the documents lock held.
+        :param score: Score to render.
+        :param page_num: Zero-based page number.
+        :param max_size: Maximum (width, height) of the image.
+        :return: Future of the page.
+        """
+        # The document is only opened if the page is rendered in this process
+        return self.load_func(score, page_num, max_size, lambda: self._documents.get(score))
@@ -0,0 +1,364 @@
+import threading
+import time
+from concurrent.futures import Future
+
+from components.rendering.disk_cache import DiskPageCache
+from components.rendering.page_cache import PageCache
+from components.rendering.prefetcher import Prefetcher
+from components.rendering.worker_pool import RenderPool
+from components.scores.documents import FITZ_LOCK, get_document_pool
+
+DEFAULT_PAGE_SIZE = (900, 1200)
+
+
+def page_zoom(page_rect, max_size: tuple) -> float:
+    """
+    Compute the zoom that fits a page into a viewport while keeping its aspect ratio.
+    :param page_rect: fitz.Rect of the page, in points.
+    :param max_size: Viewport (width, height) in device pixels.
+    :return: Scale factor from points to device pixels.
+    """
+    return min(max_size[0] / page_rect.width, max_size[1] / page_rect.height)
+
+
+def render_page(document, page_num: int, max_size: tuple = DEFAULT_PAGE_SIZE):
+    """
+    Rasterize a PDF page straight at the resolution it is displayed at.
+    The transform is computed from the viewport size, so a single rasterization
+    pass produces a sharp image without resampling.
+    :param document: Open fitz.Document.
+    :param page_num: Zero-based page number.
+    :param max_size: Maximum (width, height) of the image, in device pixels.
+    :return: The rendered PIL image. Its info["timings"] holds the rasterize and
+        convert durations in seconds and the perf_counter() time it was finished at.
+    """
+    import pymupdf as fitz
+    from PIL import Image
+
+    with FITZ_LOCK:
+        start = time.perf_counter()
+        page = document.load_page(page_num)
+        zoom = page_zoom(page.rect, max_size)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        rasterized = time.perf_counter()
+        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    finished = time.perf_counter()
+    img.info["timings"] = {"rasterize": rasterized - start, "convert": finished - rasterized,
+                           "finished": finished}
+    return img
+
+
+def viewport_size(widget, reserved_height: int = 0, margin: int = 20) -> tuple:
+    """
+    Measure the space available for a page inside a widget.
+    Tk reports geometry in device pixels, so rendering at this size maps one
+    raster pixel to one screen pixel.
+    :param widget: Widget the page is displayed in.
+    :param reserved_height: Height taken by other widgets (e.g. navigation buttons).
+    :param margin: Padding kept around the page.
+    :return: Available (width, height), or DEFAULT_PAGE_SIZE if the widget is not laid out yet.
+    """
+    width = widget.winfo_width() - margin
+    height = widget.winfo_height() - reserved_height - margin
+    if width <= 1 or height <= 1:
+        return DEFAULT_PAGE_SIZE
+    return width, height
+
+
+class PageRenderer:
+    def __init__(self, document_pool=None, page_cache: PageCache = None,
+                 disk_cache: DiskPageCache = None, render_pool: RenderPool = None):
+        """
+        Initialize the page renderer used by the viewers.
+        Rendered pages are served from the in-memory page cache, then from the
+        persistent disk cache, and rasterized only when both miss - in the
+        worker process pool, or in this process if the pool is disabled.
+        The prefetcher fills the caches with the pages likely to be shown next.
+        :param document_pool: Pool providing open documents of scores.
+        :param page_cache: In-memory cache of rendered pages.
+        :param disk_cache: Persistent cache of rendered pages.
+        :param render_pool: Worker processes rasterizing pages.
+        """
+        self.document_pool = document_pool if document_pool is not None else get_document_pool()
+        self.page_cache = page_cache if page_cache is not None else PageCache()
+        self.disk_cache = disk_cache if disk_cache is not None else DiskPageCache()
+        self.render_pool = render_pool if render_pool is not None else RenderPool()
+        self.prefetcher = Prefetcher(self.render_async, max_in_flight=self.render_pool.workers)
+        # Page area of the viewers, as last measured on screen
+        self.viewport_size = None
+        # Rasterization resolution relative to the requested size, lowered to save power
+        self.resolution_scale = 1.0
+        self._in_flight = {}  # {cache key: Future}
+        self._lock = threading.Lock()
+
+    @property
+    def workers(self) -> int:
+        """
+        Number of pages that can be rasterized at the same time.
+        """
+        return self.render_pool.workers if self.render_pool is not None else 1
+
+    def set_workers(self, workers: int):
+        """
+        Change the number of render worker processes.
+        :param workers: Number of processes; 0 renders in this process instead.
+        """
+        if self.render_pool is not None and self.render_pool.workers == workers:
+            return
+        if self.render_pool is not None:
+            self.render_pool.close()
+        self.render_pool = RenderPool(workers) if workers > 0 else None
+        self.prefetcher.max_in_flight = self.workers
+
+    def shutdown(self):
+        """
+        Stop prefetching and the worker processes.
+        """
+        self.prefetcher.cancel()
+        if self.render_pool is not None:
+            self.render_pool.shutdown()
+
+    def render(self, score, page_num: int, max_size: tuple = DEFAULT_PAGE_SIZE):
+        """
+        Get a page of a score as a PIL image, waiting for it to be rendered on a cache miss.
+        :param score: Score to render.
+        :param page_num: Zero-based page number.
+        :param max_size: Maximum (width, height) of the image.
+        :return: The rendered PIL image, or None if the score has no readable PDF.
+        """
+        return self.render_async(score, page_num, max_size).result()
+
+    def render_async(self, score, page_num: int, max_size: tuple = DEFAULT_PAGE_SIZE,
+                     document_func=None, shown: bool = False) -> Future:
+        """
+        Get a page of a score as a PIL image without waiting for the rasterization.
+        Pages in memory are returned in an already completed future, pages on disk
+        are decoded in the background, and a page that is being loaded is not
+        loaded twice.
+        :param score: Score to render.
+        :param page_num: Zero-based page number.
+        :param max_size: Maximum (width, height) of the image.
+        :param document_func: Callable returning the score's open document, used when
+            rendering in this process. Defaults to the shared document pool, which
+            may only be used from the Tk thread.
+        :param shown: Whether the page is requested to be shown by a viewer. Only
+            these requests count in the page cache hit rate, not prefetching,
+            concert warm-up or thumbnails.
+        :return: Future resolving to the PIL image, or to None if the score has no readable PDF.
+            The image is smaller than max_size while the resolution scale is below 1.
+        """
+        max_size = self.render_size(max_size)
+        key = PageCache.make_key(score.UID, page_num, max_size)
+        img = self.page_cache.get(key, count=shown)
+        if img is not None:
+            return _completed(img)
+        with self._lock:
+            future = self._in_flight.get(key)
+        if future is not None:
+            return future
+        if score.pdf_hash and self.disk_cache.contains(score.pdf_hash, page_num, max_size):
+            return self._load_from_disk(score, key, page_num, max_size)
+        return self._rasterize(score, key, page_num, max_size, document_func)
+
+    def _load_from_disk(self, score, key: tuple, page_num: int, max_size: tuple) -> Future:
+        """
+        Decode a page from the disk cache in the background. A file that turns
+        out to be unreadable is rendered again instead.
+        :param score: Score to render.
+        :param key: Cache key of the page.
+        :param page_num: Zero-based page number.
+        :param max_size: Maximum (width, height) of the image, resolution scale applied.
+        :return: Future resolving to the PIL image.
+        """
+        future = Future()
+        with self._lock:
+            self._in_flight[key] = future
+
+        def on_read(read):
+            img = read.result() if read.exception() is None else None
+            with self._lock:
+                self._in_flight.pop(key, None)
+            if img is not None:
+                self.page_cache.put(key, img)
+                future.set_result(img)
+                return
+            try:
+                # Not on the Tk thread: the shared document pool must not be used
+                rendered = self._rasterize(score, key, page_num, max_size,
+                                           lambda: _open_document(score))
+            except Exception as e:
+                future.set_exception(e)  # The viewer waits for this future
+                return
+            _chain(rendered, future)
+
+        self.disk_cache.get_async(score.pdf_hash, page_num, max_size).add_done_callback(on_read)
+        return future
+
+    def _rasterize(self, score, key: tuple, page_num: int, max_size: tuple, document_func) -> Future:
+        """
+        Rasterize a page missing from the caches, in the worker processes or
+        in this process if the pool is disabled, and store it in the caches.
+        :param score: Score to render.
+        :param key: Cache key of the page.
+        :param page_num: Zero-based page number.
+        :param max_size: Maximum (width, height) of the image, resolution scale applied.
+        :param document_func: Callable returning the score's open document, or None
+            for the shared document pool.
+        :return: Future resolving to the PIL image, or to None if the score has no readable PDF.
+        """
+        if not score.has_pdf or (score.pdf_path is None and not score.pdf_data):
+            return _completed(None)
+        render_pool = self.render_pool  # set_workers() may replace it meanwhile
+        if render_pool is None:
+            if document_func is None:
+                document_func = lambda: self.document_pool.get(score)
+            document = document_func()
+            if document is None:
+                return _completed(None)
+            img = render_page(document, page_num, max_size)
+            self._store(score, key, img)
+            return _completed(img)
+        try:
+            future = render_pool.submit(score, page_num, max_size)
+        except Exception as e:
+            # e.g. the pool was shut down, or a worker process could not be started
+            future = Future()
+            future.set_exception(e)
+            return future
+        with self._lock:
+            self._in_flight[key] = future
+
+        def on_done(done_future):
+            with self._lock:
+                self._in_flight.pop(key, None)
+            if not done_future.cancelled() and done_future.exception() is None:
+                self._store(score, key, done_future.result())
+
+        future.add_done_callback(on_done)
+        return future
+
+    def render_size(self, max_size: tuple) -> tuple:
+        """
+        Apply the resolution scale to a requested image size.
+        :param max_size: Requested maximum (width, height).
+        :return: Maximum (width, height) the page is rasterized at.
+        """
+        if self.resolution_scale == 1.0:
+            return max_size
+        return (max(1, round(max_size[0] * self.resolution_scale)),
+                max(1, round(max_size[1] * self.resolution_scale)))
+
+    def _store(self, score, key: tuple, img):
+        """
+        Put a freshly rendered page into the memory cache and, in the background,
+        into the disk cache.
+        :param score: Rendered score.
+        :param key: Cache key of the page.
+        :param img: Rendered PIL image.
+        """
+        self.page_cache.put(key, img)
+        if score.pdf_hash:
+            _, page_num, max_size, _ = key
+            self.disk_cache.put_async(score.pdf_hash, page_num, max_size, img)
+
+    def prefetch(self, score, page_num: int, max_size: tuple = DEFAULT_PAGE_SIZE,
+                 next_score=None, previous_score=None):
+        """
+        Start rendering the pages around the one on screen in the background.
+        :param score: Score on screen.
+        :param page_num: Page on screen.
+        :param max_size: Maximum (width, height) of the rendered pages.
+        :param next_score: Score shown after the last page, if any.
+        :param previous_score: Score shown before the first page, if any.
+        """
+        page_count = self.page_count(score)
+        if page_count is None:
+            return
+        previous_page_count = self.page_count(previous_score) if previous_score is not None else None
+        self.prefetcher.prefetch(score, page_num, page_count, max_size,
+                                 next_score=next_score, previous_score=previous_score,
+                                 previous_page_count=previous_page_count)
+
+    def page_count(self, score):
+        """
+        Get the number of pages of a score, from the catalog or else from its
+        document in the shared pool. Call this on the Tk thread.
+        :param score: Score to count.
+        :return: Number of pages, or None if the score has no readable PDF.
+        """
+        if score.page_count is not None:
+            return score.page_count
+        document = self.document_pool.get(score)
+        return document.page_count if document is not None else None
+
+    def on_scores_changed(self, event, score):
+        """
+        ScoresManager subscriber dropping cached pages of removed scores.
+        Before the PDF is deleted, the prefetcher and the worker processes close
+        it; pages on disk are dropped only once the PDF itself was deleted, they
+        are kept while another score still uses the same PDF.
+        :param event: Kind of change reported by the ScoresManager.
+        :param score: The affected Score, if any.
+        """
+        if score is None:
+            return
+        if event == "removing":
+            self.page_cache.invalidate(score.UID)
+            self.prefetcher.release(score.UID)
+            if self.render_pool is not None and score.pdf_path is not None:
+                self.render_pool.release(score.pdf_path)
+        elif event == "blob_removed":
+            self.disk_cache.remove(score.pdf_hash)
+
+
+def _open_document(score):
+    """
+    Open a document of a score outside the shared pool, for a single render on
+    a background thread. It is closed once garbage collected.
+    :param score: Score to open.
+    :return: The fitz.Document, or None if the score has no readable PDF.
+    """
+    from components.scores.documents import open_score_document
+
+    return open_score_document(score)
+
+
+def _chain(source: Future, target: Future):
+    """
+    Complete a future with the outcome of another one.
+    :param source: Future to follow.
+    :param target: Future to complete.
+    """
+    def on_done(done):
+        if done.cancelled():
+            target.cancel()
+        elif done.exception() is not None:
+            target.set_exception(done.exception())
+        else:
+            target.set_result(done.result())
+    source.add_done_callback(on_done)
+
+
+def _completed(value) -> Future:
+    """
+    Wrap a value in an already completed future.
+    :param value: Result of the future.
+    :return: The completed Future.
+    """
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+_shared_renderer = None
+
+
+def get_page_renderer() -> PageRenderer:
+    """
+    Get the process-wide PageRenderer shared by the practice and concert viewers.
+    :return: The shared PageRenderer instance.
+    """
+    global _shared_renderer
+    if _shared_renderer is None:
+        _shared_renderer = PageRenderer()
+    return _shared_renderer
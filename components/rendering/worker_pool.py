@@ -0,0 +1,241 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# multiprocessing, PIL and PyMuPDF are imported where they are used, so importing
+# this module at startup stays cheap
+
+# Documents opened by a worker process, keyed by file path or content hash
+_worker_documents = OrderedDict()
+WORKER_DOCUMENTS = 4
+
+
+def default_worker_count() -> int:
+    """
+    Number of render workers to use by default: one per core, leaving one core
+    to the user interface.
+    :return: Worker count.
+    """
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _worker_document(source, source_key: str):
+    """
+    Get a document in a worker process, keeping the last few open.
+    :param source: Path of the PDF file, or the PDF data as bytes.
+    :param source_key: Key identifying the source.
+    :return: The open fitz.Document.
+    """
+    import pymupdf as fitz
+
+    document = _worker_documents.get(source_key)
+    if document is not None:
+        _worker_documents.move_to_end(source_key)
+        return document
+    if isinstance(source, bytes):
+        document = fitz.open(stream=source, filetype="pdf")
+    else:
+        document = fitz.open(source)
+    _worker_documents[source_key] = document
+    while len(_worker_documents) > WORKER_DOCUMENTS:
+        _worker_documents.popitem(last=False)[1].close()
+    return document
+
+
+def _render_in_worker(source, source_key: str, page_num: int, max_size: tuple) -> tuple:
+    """
+    Rasterize a page in a worker process into a new shared memory segment.
+    The pixels are RGBA, the layout PIL uses internally, so the UI process can
+    wrap the segment as an image without copying it.
+    On Windows a segment is freed as soon as its last handle is closed, before
+    the UI process could attach it, so the pixels are returned as bytes instead.
+    :param source: Path of the PDF file, or the PDF data as bytes.
+    :param source_key: Key identifying the source.
+    :param page_num: Zero-based page number.
+    :param max_size: Maximum (width, height) of the image, in device pixels.
+    :return: Tuple (segment name or pixel bytes, width, height, rasterize seconds,
+        convert seconds), see attach_raster().
+    """
+    from multiprocessing import shared_memory
+
+    import pymupdf as fitz
+    from components.rendering.renderer import page_zoom
+
+    start = time.perf_counter()
+    page = _worker_document(source, source_key).load_page(page_num)
+    zoom = page_zoom(page.rect, max_size)
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    rasterized = time.perf_counter()
+    pix = fitz.Pixmap(pix, 1)  # Opaque alpha channel
+    samples = pix.samples_mv
+    if os.name != "posix":
+        return bytes(samples), pix.width, pix.height, rasterized - start, time.perf_counter() - rasterized
+    segment = shared_memory.SharedMemory(create=True, size=len(samples))
+    segment.buf[:len(samples)] = samples
+    segment.close()
+    return segment.name, pix.width, pix.height, rasterized - start, time.perf_counter() - rasterized
+
+
+def attach_raster(name, width: int, height: int, rasterize_time: float = 0.0,
+                  convert_time: float = 0.0):
+    """
+    Wrap a shared memory segment written by a worker as a PIL image.
+    The segment name is unlinked right away; the memory itself is freed when
+    the image is garbage collected.
+    :param name: Name of the shared memory segment, or the pixels as bytes.
+    :param width: Image width.
+    :param height: Image height.
+    :param rasterize_time: Seconds the worker spent rasterizing.
+    :param convert_time: Seconds the worker spent converting and copying the pixels.
+    :return: Read-only RGBA PIL image backed by the segment, with timings as from render_page().
+    """
+    from multiprocessing import shared_memory
+
+    from PIL import Image
+
+    start = time.perf_counter()
+    if isinstance(name, bytes):
+        img = Image.frombuffer("RGBA", (width, height), name, "raw", "RGBA", 0, 1)
+        finished = time.perf_counter()
+        img.info["timings"] = {"rasterize": rasterize_time, "convert": convert_time + finished - start,
+                               "finished": finished}
+        return img
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        img = Image.frombuffer("RGBA", (width, height), segment.buf, "raw", "RGBA", 0, 1)
+    finally:
+        segment.unlink()
+    # Keep the mapping alive exactly as long as the image
+    img.shared_memory = segment
+    finished = time.perf_counter()
+    img.info["timings"] = {"rasterize": rasterize_time, "convert": convert_time + finished - start,
+                           "finished": finished}
+    return img
+
+
+def _restore_blob(score):
+    """
+    Write the in-memory PDF of a score whose blob file is missing back to its
+    blob store, so workers open the file rather than receiving the data with
+    every page.
+    :param score: Score with PDF data.
+    :return: Path of the blob file, or None if it could not be written.
+    """
+    pdf_data = score.pdf_data
+    if not pdf_data or score.blob_store is None:
+        return None
+    try:
+        if score.blob_store.put(pdf_data) != score.pdf_hash:
+            return None  # The data is not the blob the score refers to
+    except OSError:
+        return None
+    return score.pdf_path
+
+
+class RenderPool:
+    def __init__(self, workers: int = None):
+        """
+        Initialize a pool of worker processes rasterizing pages, each with its
+        own PyMuPDF state. Pixel data comes back through shared memory, or as
+        bytes on Windows.
+        The processes are started on first use. Pages may be submitted from any thread.
+        :param workers: Number of worker processes, defaults to default_worker_count().
+        """
+        self.workers = workers if workers else default_worker_count()
+        self._lock = threading.Lock()  # Guards the executor and the sets below
+        self._executor = None
+        self._sources = set()  # Keys of the PDFs the running workers may have open
+        self._unrestorable = set()  # Hashes of PDFs whose blob file could not be written
+        self._closed = False
+
+    def submit(self, score, page_num: int, max_size: tuple) -> Future:
+        """
+        Render a page of a score in a worker process.
+        :param score: Score to render; its blob file is opened by the worker.
+        :param page_num: Zero-based page number.
+        :param max_size: Maximum (width, height) of the image.
+        :return: Future resolving to the rendered PIL image.
+        :raises RuntimeError: If the pool was closed.
+        """
+        pdf_path = score.pdf_path
+        if pdf_path is None:
+            with self._lock:
+                restorable = score.pdf_hash not in self._unrestorable
+            if restorable:
+                pdf_path = _restore_blob(score)
+                if pdf_path is None:
+                    with self._lock:
+                        self._unrestorable.add(score.pdf_hash)
+        if pdf_path is not None:
+            source, source_key = pdf_path, pdf_path
+        else:
+            # Sent along with every page, only if the blob file cannot be written
+            source, source_key = score.pdf_data, f"{score.UID}:{score.pdf_hash}"
+        result = Future()
+
+        def on_done(future):
+            if future.cancelled():
+                result.cancel()  # Dropped by shutdown(), e.g. when the worker count changes
+                return
+            try:
+                result.set_result(attach_raster(*future.result()))
+            except BaseException as e:
+                result.set_exception(e)
+
+        # Submitted under the lock, so a concurrent shutdown() cannot close the executor in between
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The render pool was closed")
+            self._sources.add(source_key)
+            future = self._get_executor().submit(_render_in_worker, source, source_key, page_num, max_size)
+        future.add_done_callback(on_done)
+        return result
+
+    def release(self, source_key: str):
+        """
+        Make the workers close a PDF, e.g. before its file is deleted. Workers
+        cannot be addressed one by one, so if any of them may have it open they
+        are all stopped; they are started again on the next submit().
+        :param source_key: Path of the PDF file.
+        """
+        with self._lock:
+            in_use = source_key in self._sources
+        if in_use:
+            self.shutdown(wait=True)
+
+    def close(self):
+        """
+        Stop the worker processes for good, e.g. when the pool is replaced.
+        Pages submitted later, by threads still holding the pool, are refused.
+        """
+        with self._lock:
+            self._closed = True
+        self.shutdown()
+
+    def shutdown(self, wait: bool = False):
+        """
+        Stop the worker processes, dropping queued work.
+        :param wait: Wait until the processes exited and closed their files.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._sources.clear()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _get_executor(self):
+        """
+        Get the process pool, starting it if needed. Call with the lock held.
+        Workers are spawned rather than forked, since the UI process runs
+        threads and Tk that must not be duplicated.
+        :return: The executor.
+        """
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
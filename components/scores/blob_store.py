@@ -0,0 +1,81 @@
+import hashlib
+import os
+
+from components.persistence import atomic_write
+
+
+class BlobStore:
+    def __init__(self, root: str = "score_blobs"):
+        """
+        Initialize a content-addressed store for score PDFs.
+        Every PDF is kept in its own file named after the SHA-256 of its content,
+        so identical files are stored only once and never rewritten.
+        :param root: Directory holding the blob files.
+        """
+        self.root = root
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        """
+        Compute the content hash used as a blob key.
+        :param data: Raw blob content.
+        :return: Hex SHA-256 digest of the data.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def path(self, blob_hash: str) -> str:
+        """
+        Get the file path of a blob.
+        :param blob_hash: Content hash of the blob.
+        :return: Path of the blob file (it may not exist).
+        """
+        return os.path.join(self.root, blob_hash[:2], f"{blob_hash}.pdf")
+
+    def contains(self, blob_hash: str) -> bool:
+        """
+        Check whether a blob is present in the store.
+        :param blob_hash: Content hash of the blob.
+        :return: True if the blob file exists, else False.
+        """
+        return os.path.exists(self.path(blob_hash))
+
+    def put(self, data: bytes) -> str:
+        """
+        Store a blob, unless a blob with the same content is already stored.
+        The file is written atomically, so a crash never leaves a truncated blob behind.
+        :param data: Raw blob content.
+        :return: Content hash of the stored blob.
+        """
+        blob_hash = self.hash_bytes(data)
+        path = self.path(blob_hash)
+        if os.path.exists(path):
+            return blob_hash
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, data)
+        return blob_hash
+
+    def get(self, blob_hash: str) -> bytes:
+        """
+        Read a blob from the store.
+        :param blob_hash: Content hash of the blob.
+        :return: Blob content as bytes, or None if the blob is missing.
+        """
+        try:
+            with open(self.path(blob_hash), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def remove(self, blob_hash: str) -> bool:
+        """
+        Delete a blob from the store.
+        A blob that cannot be deleted, e.g. because another program has it open,
+        is left behind.
+        :param blob_hash: Content hash of the blob.
+        :return: True if the blob was removed, else False.
+        """
+        try:
+            os.remove(self.path(blob_hash))
+            return True
+        except OSError:
+            return False
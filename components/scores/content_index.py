@@ -0,0 +1,150 @@
+import json
+import queue
+import threading
+
+from components.persistence import DebouncedWriter
+from components.scores.documents import FITZ_LOCK
+from components.scores.search_index import SearchIndex, tokenize
+
+CONTENT_INDEX_FILE = "content_index.json"
+
+
+def extract_text(pdf_path: str, pages: int) -> str:
+    """
+    Extract the text printed on the first pages of a PDF.
+    The lock is taken per page, so rendering on the UI thread is not held up
+    for the whole document.
+    :param pdf_path: Path of the PDF file.
+    :param pages: Number of pages to read, 0 for all pages.
+    :return: Folded words of the text, separated by spaces.
+    """
+    import pymupdf as fitz
+
+    with FITZ_LOCK:
+        document = fitz.open(pdf_path)
+    try:
+        count = document.page_count if pages == 0 else min(pages, document.page_count)
+        words = []
+        for page_num in range(count):
+            with FITZ_LOCK:
+                words.extend(tokenize(document.load_page(page_num).get_text()))
+        return " ".join(words)
+    finally:
+        with FITZ_LOCK:
+            document.close()
+
+
+class ContentIndex:
+    def __init__(self, path: str = CONTENT_INDEX_FILE, pages: int = 2):
+        """
+        Initialize the full-text index of the score PDFs, so a search also finds
+        the composer, title or part printed on the first page.
+        Text is extracted on a background thread and stored in a JSON file keyed
+        by the content hash of the PDF, so each PDF is read only once, even
+        across restarts and by scores sharing the same file.
+        :param path: Path of the JSON file with the extracted text.
+        :param pages: Number of pages indexed per PDF, 0 for all pages.
+        """
+        self.path = path
+        self.pages = pages
+        self.last_error = None
+        self._entries = {}  # {pdf_hash: {"pages": pages setting, "text": folded words}}
+        self._index = SearchIndex()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._writer = DebouncedWriter(path, span="content_index.save")
+
+    def __contains__(self, pdf_hash: str) -> bool:
+        with self._lock:
+            return pdf_hash in self._entries
+
+    def index_scores(self, scores):
+        """
+        Queue scores for indexing in the background. PDFs that are already
+        indexed with the current pages setting are skipped.
+        :param scores: Iterable of Score objects.
+        """
+        for score in scores:
+            if score.pdf_hash:
+                self._queue.put(score)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def remove(self, pdf_hash: str):
+        """
+        Drop the text of a PDF that was deleted from the library.
+        :param pdf_hash: Content hash of the PDF.
+        """
+        with self._lock:
+            if self._entries.pop(pdf_hash, None) is None:
+                return
+            self._index.remove(pdf_hash)
+            snapshot = dict(self._entries)
+        self._writer.schedule(snapshot)
+
+    def search(self, query: str) -> list:
+        """
+        Find PDFs whose text contains every word of the query.
+        :param query: Search text.
+        :return: Content hashes of the matching PDFs, best match first.
+        """
+        with self._lock:
+            return self._index.search(query)
+
+    def flush(self):
+        """
+        Write pending index changes immediately. The index is rebuilt from the
+        PDFs when it cannot be saved, so a failure is only kept in last_error.
+        """
+        try:
+            self._writer.flush()
+        except Exception as e:
+            self.last_error = e
+
+    def _load(self):
+        """
+        Read the stored text of previously indexed PDFs.
+        """
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for pdf_hash, entry in entries.items():
+            # One entry at a time, searches on the UI thread keep running meanwhile
+            with self._lock:
+                if pdf_hash not in self._entries:
+                    self._entries[pdf_hash] = entry
+                    self._index.add(pdf_hash, entry["text"])
+
+    def _run(self):
+        """
+        Background loop extracting the text of queued scores.
+        """
+        self._load()
+        while True:
+            score = self._queue.get()
+            pages = self.pages
+            with self._lock:
+                entry = self._entries.get(score.pdf_hash)
+            if entry is not None and entry["pages"] == pages:
+                continue
+            pdf_path = score.pdf_path
+            if pdf_path is None:
+                continue
+            try:
+                text = extract_text(pdf_path, pages)
+            except Exception as e:
+                # A broken PDF only misses from content search
+                self.last_error = e
+                continue
+            if score.pdf_path is None:
+                continue  # Removed from the library while its text was extracted
+            with self._lock:
+                self._entries[score.pdf_hash] = {"pages": pages, "text": text}
+                self._index.add(score.pdf_hash, text)
+                snapshot = dict(self._entries)
+            self._writer.schedule(snapshot)
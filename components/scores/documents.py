@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# PyMuPDF is not thread-safe: every call into it from a thread other than the
+# Tk main loop must hold this lock.
+FITZ_LOCK = threading.RLock()
+
+
+def open_score_document(score):
+    """
+    Open the PDF of a score with PyMuPDF without copying it to a temporary file.
+    The blob file is opened in place when it exists, otherwise the in-memory
+    PDF data is used as a stream.
+    :param score: Score whose PDF should be opened.
+    :return: The opened fitz.Document, or None if the score has no readable PDF.
+    """
+    # PyMuPDF takes longer to import than the rest of the app, so it is loaded
+    # when the first score is opened rather than at startup
+    import pymupdf as fitz
+
+    if not getattr(score, 'has_pdf', False):
+        return None
+    pdf_path = score.pdf_path
+    if pdf_path is not None:
+        with FITZ_LOCK:
+            return fitz.open(pdf_path)
+    pdf_data = score.pdf_data
+    if not pdf_data:
+        return None
+    with FITZ_LOCK:
+        return fitz.open(stream=pdf_data, filetype="pdf")
+
+
+def count_pages(pdf_data: bytes) -> int:
+    """
+    Count the pages of a PDF without keeping it open.
+    :param pdf_data: PDF data as bytes.
+    :return: Number of pages, or None if the PDF cannot be read.
+    """
+    import pymupdf as fitz
+
+    try:
+        with FITZ_LOCK:
+            with fitz.open(stream=pdf_data, filetype="pdf") as document:
+                return document.page_count
+    except Exception:
+        return None
+
+
+class DocumentPool:
+    def __init__(self, capacity: int = 4):
+        """
+        Initialize a bounded pool of open PyMuPDF documents keyed by score UID.
+        Recently used documents stay open, so returning to a score does not
+        parse its PDF again; the least recently used one is closed on overflow.
+        :param capacity: Maximum number of documents kept open.
+        """
+        self.capacity = capacity
+        # {uid: (pdf_hash, document, estimated bytes, time.monotonic() of last use)}
+        self._documents = OrderedDict()
+
+    def get(self, score):
+        """
+        Get the open document of a score, opening it if needed.
+        :param score: Score whose PDF is requested.
+        :return: The fitz.Document, or None if the score has no readable PDF.
+        """
+        entry = self._documents.get(score.UID)
+        if entry is not None:
+            pdf_hash, document, size, _ = entry
+            if pdf_hash == score.pdf_hash and not document.is_closed:
+                self._documents[score.UID] = (pdf_hash, document, size, time.monotonic())
+                self._documents.move_to_end(score.UID)
+                return document
+            self.close(score.UID)
+        document = open_score_document(score)
+        if document is None:
+            return None
+        self._documents[score.UID] = (score.pdf_hash, document, _document_bytes(score),
+                                      time.monotonic())
+        self._evict()
+        return document
+
+    def close(self, uid: str) -> bool:
+        """
+        Close the document of a score and remove it from the pool.
+        :param uid: Unique identifier of the score.
+        :return: True if a document was closed, else False.
+        """
+        entry = self._documents.pop(uid, None)
+        if entry is None:
+            return False
+        with FITZ_LOCK:
+            entry[1].close()
+        return True
+
+    def close_all(self):
+        """
+        Close all documents in the pool.
+        """
+        for uid in list(self._documents):
+            self.close(uid)
+
+    def set_capacity(self, capacity: int):
+        """
+        Change the number of documents kept open, closing any excess.
+        :param capacity: New maximum number of open documents.
+        """
+        self.capacity = capacity
+        self._evict()
+
+    def memory_bytes(self) -> int:
+        """
+        Estimated bytes held by the open documents, for the memory budget.
+        """
+        return sum(entry[2] for entry in self._documents.values())
+
+    def oldest_use(self) -> float:
+        """
+        Time the least recently used document was last used, for the memory budget.
+        The most recently used document is never offered, the viewer is showing it.
+        :return: time.monotonic() value, or None if there is nothing to evict.
+        """
+        if len(self._documents) < 2:
+            return None
+        return next(iter(self._documents.values()))[3]
+
+    def evict_oldest(self) -> int:
+        """
+        Close the least recently used document, for the memory budget.
+        :return: Estimated bytes freed.
+        """
+        if len(self._documents) < 2:
+            return 0
+        uid, entry = next(iter(self._documents.items()))
+        self.close(uid)
+        return entry[2]
+
+    def on_scores_changed(self, event, score):
+        """
+        ScoresManager subscriber closing documents of removed scores, before
+        their PDF is deleted.
+        :param event: Kind of change reported by the ScoresManager.
+        :param score: The affected Score, if any.
+        """
+        if event == "removing" and score is not None:
+            self.close(score.UID)
+
+    def __contains__(self, uid):
+        return uid in self._documents
+
+    def __len__(self):
+        return len(self._documents)
+
+    def _evict(self):
+        """
+        Close least recently used documents until the pool fits its capacity.
+        """
+        while len(self._documents) > max(self.capacity, 1):
+            uid = next(iter(self._documents))
+            self.close(uid)
+
+
+def _document_bytes(score) -> int:
+    """
+    Estimate the memory held by an open document by the size of its PDF: the
+    parsed objects grow with it, and a document opened from data keeps that
+    data. Decoded fonts and images are in the shared MuPDF store, accounted separately.
+    :param score: Score whose document was opened.
+    :return: Size of its PDF in bytes.
+    """
+    pdf_path = score.pdf_path
+    if pdf_path is not None:
+        try:
+            return os.path.getsize(pdf_path)
+        except OSError:
+            return 0
+    return len(score.pdf_data or b"")
+
+
+_shared_pool = None
+
+
+def get_document_pool() -> DocumentPool:
+    """
+    Get the process-wide DocumentPool shared by the practice and concert viewers.
+    :return: The shared DocumentPool instance.
+    """
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = DocumentPool()
+    return _shared_pool
@@ -1,30 +1,107 @@
 import json
+import os
+import time
 
 
 class Score:
-    def __init__(self, uid: str, name: str, has_pdf: bool, pdf_data: bytes = None):
+    def __init__(self, uid: str, name: str, has_pdf: bool, pdf_data: bytes = None,
+                 pdf_hash: str = None, blob_store=None, page_count: int = None):
         """
         Initialize a Score (notes) object.
         :param name: Name of the score.
         :param has_pdf: Whether the score has an associated PDF.
         :param pdf_data: PDF data as bytes, if available. (Read by PyMuPDF)
+        :param pdf_hash: Content hash of the PDF in the blob store, if available.
+        :param blob_store: Store the PDF data is fetched from when first accessed.
+        :param page_count: Number of pages of the PDF, if known.
         """
         self.UID = uid
         self.name = name
         self.has_pdf = has_pdf
-        self.pdf_data = pdf_data
+        self.pdf_hash = pdf_hash
+        self.page_count = page_count
+        self.blob_store = blob_store
+        self._pdf_data = pdf_data
+        self.pdf_used = time.monotonic()  # Last access of the PDF data
 
-    def to_json(self) -> str:
+    @property
+    def pdf_data(self) -> bytes:
         """
-        Convert the Score object to a JSON string.
-        :return: JSON representation of the Score object.
+        PDF data as bytes, read from the blob store on first access.
+        :return: PDF data, or None if the score has no PDF.
+        """
+        if self._pdf_data is None and self.pdf_hash and self.blob_store is not None:
+            self._pdf_data = self.blob_store.get(self.pdf_hash)
+        self.pdf_used = time.monotonic()
+        return self._pdf_data
+
+    @pdf_data.setter
+    def pdf_data(self, value: bytes):
+        self._pdf_data = value
+
+    @property
+    def pdf_path(self) -> str:
+        """
+        Path of the PDF file in the blob store.
+        :return: Path of the blob file, or None if the score has no stored PDF.
+        """
+        if not self.pdf_hash or self.blob_store is None:
+            return None
+        path = self.blob_store.path(self.pdf_hash)
+        return path if os.path.exists(path) else None
+
+    @property
+    def pdf_loaded(self) -> bool:
+        """
+        Whether the PDF data is currently held in memory.
+        """
+        return self._pdf_data is not None
+
+    @property
+    def pdf_loaded_bytes(self) -> int:
+        """
+        Bytes of PDF data held in memory.
+        """
+        return len(self._pdf_data) if self._pdf_data is not None else 0
+
+    @property
+    def pdf_releasable(self) -> bool:
+        """
+        Whether in-memory PDF data can be dropped, because the blob store has it.
+        """
+        return self._pdf_data is not None and bool(self.pdf_hash) and self.blob_store is not None
+
+    def release_pdf_data(self) -> bool:
+        """
+        Drop the in-memory PDF data. It is read again from the blob store when needed.
+        Data that is not backed by the blob store is kept.
+        :return: True if the data was released, else False.
+        """
+        if not self.pdf_releasable:
+            return False
+        self._pdf_data = None
+        return True
+
+    def to_dict(self) -> dict:
         """
-        return json.dumps({
+        Convert the Score metadata to a dictionary.
+        PDF content is not included, only its hash in the blob store.
+        :return: Dictionary representation of the Score object.
+        """
+        return {
             "UID": self.UID,
             "name": self.name,
             "has_pdf": self.has_pdf,
-            "pdf_data": self.pdf_data.decode('latin1') if self.pdf_data else None
-        })
+            "pdf_hash": self.pdf_hash,
+            "page_count": self.page_count
+        }
+
+    def to_json(self) -> str:
+        """
+        Convert the Score object to a JSON string.
+        :return: JSON representation of the Score object.
+        """
+        return json.dumps(self.to_dict())
 
     def save(self):
         """
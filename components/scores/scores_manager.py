@@ -1,24 +1,124 @@
 import uuid
 import json
+from components.diagnostics.profiling import profiled
+from components.persistence import DebouncedWriter, atomic_write_json
+from components.scores.blob_store import BlobStore
+from components.scores.content_index import ContentIndex
+from components.scores.documents import count_pages
 from components.scores.score import Score
+from components.scores.search_index import SearchIndex
+
+SCORES_FILE = "all_scores.json"
+
 
 class ScoresManager:
-    def __init__(self):
+    def __init__(self, blob_store: BlobStore = None, path: str = SCORES_FILE,
+                 content_index: ContentIndex = None):
+        """
+        Initialize the ScoresManager.
+        :param blob_store: Store holding the PDF content of the scores.
+        :param path: Path of the JSON catalog with score metadata.
+        :param content_index: Full-text index of the PDFs searched along with the
+            names, or None to search names only.
+        """
         self.scores = {}
+        self.blob_store = blob_store if blob_store is not None else BlobStore()
+        self.path = path
+        self.search_index = SearchIndex()
+        self.content_index = content_index
+        self._listeners = []
+        self._writer = DebouncedWriter(path, span="scores.save")
+
+    def subscribe(self, callback):
+        """
+        Register a callback notified about changes of the library.
+        :param callback: Callable taking (event, score), where event is "added",
+            "removed" or "loaded" (score is None for "loaded"). Removing a score is
+            announced with "removing" first, to close every handle on its PDF, and
+            "blob_removed" once its PDF was deleted from the blob store.
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Remove a callback registered with subscribe().
+        :param callback: Previously registered callable.
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event: str, score: Score = None):
+        """
+        Notify all subscribers about a change.
+        :param event: Kind of change, see subscribe().
+        :param score: The affected Score, if any.
+        """
+        for callback in list(self._listeners):
+            callback(event, score)
 
     def add_score(self, name: str, has_pdf: bool, pdf_data: bytes = None) -> Score:
         """
         Add a new Score to the manager.
+        The PDF content is written to the blob store right away and is read back
+        only when the score is opened.
         :param name: Name of the score.
         :param has_pdf: Whether the score has an associated PDF.
         :param pdf_data: PDF data as bytes, if available.
         :return: The created Score object.
         """
         uid = str(uuid.uuid4())
-        score = Score(uid, name, has_pdf, pdf_data)
+        pdf_hash = self.blob_store.put(pdf_data) if pdf_data else None
+        # Kept in the catalog, so concert programs are paginated without opening the PDFs
+        page_count = count_pages(pdf_data) if pdf_data else None
+        if pdf_hash is None:
+            score = Score(uid, name, has_pdf, pdf_data, page_count=page_count)
+        else:
+            score = Score(uid, name, has_pdf, pdf_hash=pdf_hash, blob_store=self.blob_store,
+                          page_count=page_count)
         self.scores[uid] = score
+        self.search_index.add(uid, name)
+        if self.content_index is not None:
+            self.content_index.index_scores([score])
+        self._notify("added", score)
         return score
 
+    def release_pdf_data(self, keep_uid: str = None):
+        """
+        Release the in-memory PDF data of all scores.
+        :param keep_uid: UID of a score whose data should stay loaded (e.g. the open one).
+        """
+        for score in self.scores.values():
+            if score.UID != keep_uid:
+                score.release_pdf_data()
+
+    def memory_bytes(self) -> int:
+        """
+        Bytes of PDF data held in memory by the scores, for the memory budget.
+        """
+        return sum(score.pdf_loaded_bytes for score in self.scores.values() if score.pdf_loaded)
+
+    def oldest_use(self) -> float:
+        """
+        Last use of the least recently used PDF data that can be released, for the memory budget.
+        :return: time.monotonic() value, or None if no data can be released.
+        """
+        used = [score.pdf_used for score in self.scores.values() if score.pdf_releasable]
+        return min(used) if used else None
+
+    def evict_oldest(self) -> int:
+        """
+        Release the least recently used PDF data, for the memory budget.
+        :return: Bytes freed.
+        """
+        releasable = [score for score in self.scores.values() if score.pdf_releasable]
+        if not releasable:
+            return 0
+        score = min(releasable, key=lambda s: s.pdf_used)
+        size = score.pdf_loaded_bytes
+        score.release_pdf_data()
+        return size
+
     def get_score(self, uid: str) -> Score:
         """
         Retrieve a Score by its UID.
@@ -30,13 +130,23 @@ class ScoresManager:
     def remove_score(self, uid: str) -> bool:
         """
         Remove a Score by its UID.
+        Its PDF is deleted from the blob store unless another score uses the same file.
         :param uid: Unique identifier of the score.
         :return: True if the score was removed, else False.
         """
-        if uid in self.scores:
-            del self.scores[uid]
-            return True
-        return False
+        score = self.scores.pop(uid, None)
+        if score is None:
+            return False
+        self.search_index.remove(uid)
+        # Open documents are closed before the file is deleted; Windows cannot delete an open file
+        self._notify("removing", score)
+        if score.pdf_hash and not any(s.pdf_hash == score.pdf_hash for s in self.scores.values()):
+            if self.blob_store.remove(score.pdf_hash):
+                self._notify("blob_removed", score)
+            if self.content_index is not None:
+                self.content_index.remove(score.pdf_hash)
+        self._notify("removed", score)
+        return True
 
     def list_scores(self) -> list:
         """
@@ -45,6 +155,25 @@ class ScoresManager:
         """
         return list(self.scores.values())
 
+    def search(self, query: str) -> list:
+        """
+        Find scores by name, ignoring case and accents and matching parts of words.
+        With a content index, scores whose PDF text matches are listed after the
+        name matches.
+        :param query: Search text.
+        :return: Matching Score objects, best match first; all scores for an empty query.
+        """
+        if not query.strip():
+            return self.list_scores()
+        results = [self.scores[uid] for uid in self.search_index.search(query)]
+        if self.content_index is not None:
+            content_rank = {pdf_hash: i for i, pdf_hash in enumerate(self.content_index.search(query))}
+            found = {score.UID for score in results}
+            results += sorted((score for score in self.scores.values()
+                               if score.pdf_hash in content_rank and score.UID not in found),
+                              key=lambda score: content_rank[score.pdf_hash])
+        return results
+
     def save_all(self):
         """
         Save all scores to individual JSON files named after their UIDs.
@@ -52,28 +181,127 @@ class ScoresManager:
         for score in self.scores.values():
             score.save()
 
+    def _snapshot(self) -> list:
+        """
+        Capture the metadata of all scores for saving.
+        :return: List of score dictionaries, independent of the live objects.
+        """
+        return [score.to_dict() for score in self.scores.values()]
+
+    @profiled("scores.save")
     def save(self):
         """
-        Save all scores to a single JSON file.
+        Save the metadata of all scores to a single JSON catalog, atomically.
+        PDF content lives in the blob store and is not rewritten.
+        """
+        atomic_write_json(self.path, self._snapshot())
+
+    def request_save(self):
+        """
+        Schedule a save on the background writer. Bursts of requests are
+        coalesced into one write, so the caller never blocks on disk.
+        """
+        self._writer.schedule(self._snapshot())
+
+    def flush(self):
+        """
+        Write any save scheduled with request_save() immediately, or again after
+        it failed in the background.
+        :raises Exception: The error of the write, if it failed.
+        """
+        if self.content_index is not None:
+            self.content_index.flush()
+        self._writer.flush()
+
+    def take_save_error(self):
+        """
+        Get the error of a save that failed in the background, once.
+        :return: The exception, or None.
         """
-        with open("all_scores.json", "w") as f:
-            data = []
-            for score in self.scores.values():
-                data.append(score.to_json())
-            f.write(json.dumps(data))
+        return self._writer.take_error()
 
     def load(self):
         """
-        Load scores from a single JSON file.
+        Load score metadata from the JSON catalog.
+        PDF data is not read here; each Score fetches it from the blob store on demand.
+        A catalog in the legacy format (PDFs embedded as latin1 strings) is
+        migrated once: its PDFs are moved to the blob store and the catalog is
+        rewritten with metadata only.
+        """
+        self.install_catalog(self.read_catalog())
+
+    @profiled("scores.load")
+    def read_catalog(self) -> tuple:
+        """
+        Read the JSON catalog into new Score objects and a new name index.
+        The live library is not touched, so this can run on a background thread
+        while the UI keeps using the manager.
+        :return: Tuple (scores by UID, SearchIndex of their names, whether legacy
+            entries were migrated), or None if there is no catalog yet.
         """
         try:
-            with open("all_scores.json", "r") as f:
-                data = json.loads(f.read())
-                for score_data in data:
-                    score_dict = json.loads(score_data)
-                    pdf_data = score_dict["pdf_data"].encode('latin1') if score_dict["pdf_data"] else None
-                    score = Score(score_dict["UID"], score_dict["name"], score_dict["has_pdf"], pdf_data)
-                    self.scores[score.UID] = score
+            with open(self.path, "r") as f:
+                data = json.load(f)
         except FileNotFoundError:
-            pass
+            return None
+        scores = {}
+        search_index = SearchIndex()
+        migrated = False
+        for score_dict in data:
+            if isinstance(score_dict, str):
+                score_dict = self._migrate_legacy_entry(json.loads(score_dict))
+                migrated = True
+            score = Score(score_dict["UID"], score_dict["name"], score_dict["has_pdf"],
+                          pdf_hash=score_dict.get("pdf_hash"), blob_store=self.blob_store,
+                          page_count=score_dict.get("page_count"))
+            scores[score.UID] = score
+            search_index.add(score.UID, score.name)
+        return scores, search_index, migrated
+
+    @profiled("scores.install")
+    def install_catalog(self, catalog: tuple):
+        """
+        Add the scores read by read_catalog() to the library and notify the subscribers.
+        Call this on the thread that uses the manager (the Tk main loop in the app).
+        :param catalog: Value returned by read_catalog().
+        """
+        if catalog is None:
+            return
+        scores, search_index, migrated = catalog
+        if not self.scores:
+            self.scores, self.search_index = scores, search_index
+        else:
+            for uid, score in scores.items():
+                self.scores[uid] = score
+                self.search_index.add(uid, score.name)
+        if migrated:
+            self.save()
+        if self.content_index is not None:
+            self.content_index.index_scores(self.scores.values())
+        self._notify("loaded")
+
+    def _migrate_legacy_entry(self, score_dict: dict) -> dict:
+        """
+        Convert a legacy catalog entry by moving its PDF to the blob store.
+        :param score_dict: Entry with the PDF embedded as a latin1 string.
+        :return: Entry holding only metadata and the PDF hash.
+        """
+        pdf_text = score_dict.pop("pdf_data", None)
+        score_dict["pdf_hash"] = self.blob_store.put(pdf_text.encode('latin1')) if pdf_text else None
+        return score_dict
+
+
+_shared_manager = None
+
 
+def get_scores_manager() -> ScoresManager:
+    """
+    Get the process-wide ScoresManager shared by all modes.
+    The library is not loaded here: the app loads it in the background at
+    startup, see MainScreen.
+    :return: The shared ScoresManager instance.
+    """
+    global _shared_manager
+    if _shared_manager is None:
+        _shared_manager = ScoresManager(content_index=ContentIndex())
+    return _shared_manager
@@ -0,0 +1,202 @@
+import re
+import unicodedata
+from collections import defaultdict
+
+# Letters that do not decompose into a base letter and an accent
+_FOLD_TABLE = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ħ": "h", "ı": "i",
+                             "æ": "ae", "œ": "oe", "þ": "th"})
+# Words are runs of letters and digits; underscores separate words as in file names
+_WORD_RE = re.compile(r"[^\W_]+")
+# Word prefixes up to this length are indexed, longer ones are checked on the candidates
+PREFIX_LENGTH = 4
+
+
+def normalize(text: str) -> str:
+    """
+    Fold text for searching: case-insensitive and without accents, so that
+    "dvorak" finds "Dvořák" and "lodz" finds "Łódź".
+    :param text: Text to fold.
+    :return: Folded text.
+    """
+    text = unicodedata.normalize("NFKD", text.casefold().translate(_FOLD_TABLE))
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list:
+    """
+    Split text into folded words.
+    :param text: Text to split.
+    :return: List of words.
+    """
+    return _WORD_RE.findall(normalize(text))
+
+
+def _trigrams(token: str) -> set:
+    """
+    All three-letter substrings of a word.
+    :param token: Folded word.
+    :return: Set of trigrams.
+    """
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    def __init__(self):
+        """
+        Initialize an in-memory index finding entries by any part of their words.
+        Query words of three letters or more are looked up by their trigrams,
+        shorter ones by word prefix, and results are ranked with set operations,
+        so a lookup never scans all entries.
+        Entries are added and removed one at a time as the library changes.
+        """
+        self._tokens = {}  # {key: tuple of words}
+        self._texts = {}  # {key: words, each preceded by a space}
+        self._order = {}  # {key: sort key among equally ranked entries}
+        self._by_token = defaultdict(set)
+        self._by_prefix = defaultdict(set)  # Word prefixes up to PREFIX_LENGTH letters
+        self._by_trigram = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, key) -> bool:
+        return key in self._tokens
+
+    def add(self, key, text: str):
+        """
+        Index an entry, replacing a previous text of the same key.
+        :param key: Key returned by search(), e.g. a score UID.
+        :param text: Text to index.
+        """
+        if key in self._tokens:
+            self.remove(key)
+        tokens = tuple(tokenize(text))
+        self._tokens[key] = tokens
+        # The leading space lets " " + word find word prefixes with a single substring test
+        self._texts[key] = text = "".join(" " + token for token in tokens)
+        self._order[key] = (len(text), text)
+        for token in set(tokens):
+            self._by_token[token].add(key)
+            for prefix in _prefixes(token):
+                self._by_prefix[prefix].add(key)
+            for trigram in _trigrams(token):
+                self._by_trigram[trigram].add(key)
+
+    def remove(self, key):
+        """
+        Remove an entry from the index.
+        :param key: Key of the entry.
+        """
+        tokens = self._tokens.pop(key, None)
+        if tokens is None:
+            return
+        del self._texts[key]
+        del self._order[key]
+        for token in set(tokens):
+            _discard(self._by_token, token, key)
+            for prefix in _prefixes(token):
+                _discard(self._by_prefix, prefix, key)
+            for trigram in _trigrams(token):
+                _discard(self._by_trigram, trigram, key)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        for table in (self._tokens, self._texts, self._order, self._by_token, self._by_prefix,
+                      self._by_trigram):
+            table.clear()
+
+    def search(self, query: str, limit: int = None) -> list:
+        """
+        Find the entries containing every word of the query, as a whole word,
+        word prefix or substring of a word.
+        Entries are ranked by how well the words match (whole word, then prefix,
+        then substring), then shorter texts first.
+        :param query: Search text.
+        :param limit: Maximum number of results, or None for all.
+        :return: Keys of the matching entries, best match first.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        candidates = None
+        # Longer words are more selective, start with them to keep the sets small
+        for token in sorted(set(query_tokens), key=len, reverse=True):
+            matches = self._candidates(token)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        ranks = self._rank(candidates, query_tokens)
+        ranked = sorted(candidates, key=self._order.__getitem__)
+        ranked.sort(key=ranks.__getitem__, reverse=True)  # Stable, keeps the order among equal ranks
+        return ranked[:limit] if limit else ranked
+
+    def _candidates(self, token: str) -> set:
+        """
+        Find the entries matching one query word.
+        :param token: Folded query word.
+        :return: Set of keys.
+        """
+        if len(token) < 3:
+            return set(self._by_prefix.get(token, ()))
+        sets = [self._by_trigram.get(trigram) for trigram in _trigrams(token)]
+        if not all(sets):
+            return set()
+        sets.sort(key=len)
+        result = sets[0].intersection(*sets[1:])
+        if len(token) == 3:
+            return result
+        # The trigrams may come from different words, keep entries containing the whole word
+        texts = self._texts
+        return {key for key in result if token in texts[key]}
+
+    def _rank(self, candidates: set, query_tokens: list) -> dict:
+        """
+        Rate how well the matching entries match the query: each query word
+        scores 3 as a whole word, 2 as a word prefix and 1 as a substring, plus
+        1 if the text starts with the first query word.
+        :param candidates: Keys of the matching entries.
+        :param query_tokens: Folded query words.
+        :return: Mapping of key to rank, higher is better.
+        """
+        texts = self._texts
+        ranks = dict.fromkeys(candidates, len(query_tokens))
+        for query_token in query_tokens:
+            for key in candidates & self._by_token.get(query_token, set()):
+                ranks[key] += 1
+            if len(query_token) <= PREFIX_LENGTH:
+                prefix_matches = candidates & self._by_prefix.get(query_token, set())
+            else:
+                word_start = " " + query_token
+                prefix_matches = [key for key in candidates if word_start in texts[key]]
+            for key in prefix_matches:
+                ranks[key] += 1
+        first = " " + query_tokens[0]
+        for key in candidates:
+            if texts[key].startswith(first):
+                ranks[key] += 1
+        return ranks
+
+
+def _prefixes(token: str) -> set:
+    """
+    Indexed prefixes of a word.
+    :param token: Folded word.
+    :return: Set of prefixes up to PREFIX_LENGTH letters.
+    """
+    return {token[:n] for n in range(1, min(len(token), PREFIX_LENGTH) + 1)}
+
+
+def _discard(table: dict, name: str, key):
+    """
+    Remove a key from a posting set, dropping sets that become empty.
+    :param table: Mapping of word, prefix or trigram to keys.
+    :param name: Entry of the table.
+    :param key: Key to remove.
+    """
+    keys = table.get(name)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del table[name]
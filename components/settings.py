@@ -1,5 +1,43 @@
 import json
 import tkinter as tk
+from tkinter import messagebox
+
+from components.rendering.worker_pool import default_worker_count
+
+DEFAULT_SETTINGS = {
+    "key_next": "a",
+    "key_previous": "d",
+    "page_cache_mb": 256,
+    "disk_cache_mb": 1024,
+    "prefetch_ahead": 2,
+    "prefetch_behind": 1,
+    "render_workers": default_worker_count(),
+    "index_pages": 2,
+    "memory_budget_mb": 768,
+    "latency_log": False,
+    "profiling": False,
+    "power_saving": True,
+    # Page area of the viewers measured in the last session: {"screen": [w, h], "page": [w, h]}
+    "viewer_size": None
+}
+
+# Whole-number settings editable in the settings window: (name, label)
+NUMERIC_SETTINGS = [
+    ("page_cache_mb", "Page cache size (MB):"),
+    ("disk_cache_mb", "Disk page cache size (MB):"),
+    ("prefetch_ahead", "Pages to prerender ahead:"),
+    ("prefetch_behind", "Pages to prerender behind:"),
+    ("render_workers", "Render processes (0 = render in the app):"),
+    ("index_pages", "PDF pages searched per score (0 = all):"),
+    ("memory_budget_mb", "Memory for PDFs, documents and pages (MB):")
+]
+
+# On/off settings editable in the settings window: (name, label)
+BOOLEAN_SETTINGS = [
+    ("latency_log", "Save page-turn latency log on exit"),
+    ("profiling", "Record a performance trace (saved on exit)"),
+    ("power_saving", "Save power on low battery or memory")
+]
 
 
 class Settings():
@@ -11,6 +49,17 @@ class Settings():
         self.master = master
         self.key_next = None
         self.key_previous = None
+        self.page_cache_mb = None
+        self.disk_cache_mb = None
+        self.prefetch_ahead = None
+        self.prefetch_behind = None
+        self.render_workers = None
+        self.index_pages = None
+        self.memory_budget_mb = None
+        self.latency_log = None
+        self.profiling = None
+        self.power_saving = None
+        self.viewer_size = None
         self.open_file()
 
     def open_settings(self):
@@ -24,42 +73,40 @@ class Settings():
         """
         Save settings to a JSON file.
         """
-        settings_data = {
-            "key_next": self.key_next,
-            "key_previous": self.key_previous
-        }
+        settings_data = {name: getattr(self, name) for name in DEFAULT_SETTINGS}
         with open("settings.json", "w") as f:
             json.dump(settings_data, f)
 
     def open_file(self):
         """
-        Load settings from a JSON file if it exists, else create an empty settings file.
+        Load settings from a JSON file if it exists, else create a settings file with defaults.
+        Settings missing from the file get their default values.
         """
         try:
             with open("settings.json", "r") as f:
                 settings_data = json.load(f)
-                self.key_next = settings_data.get("key_next", None)
-                self.key_previous = settings_data.get("key_previous", None)
         except FileNotFoundError:
+            settings_data = dict(DEFAULT_SETTINGS)
             with open("settings.json", "w") as f:
-                empty_data = {
-                    "key_next": "a",
-                    "key_previous": "d"
-                }
-                self.key_next = "a"
-                self.key_previous = "d"
-                json.dump(empty_data, f)
+                json.dump(settings_data, f)
+        for name, default in DEFAULT_SETTINGS.items():
+            setattr(self, name, settings_data.get(name, default))
 
-    def get_settings_from_window(self, key_next, key_previous):
+    def get_settings_from_window(self, key_next, key_previous, **options):
         """
         Get settings from the settings window.
         :param key_next: Key for next page.
         :param key_previous: Key for previous page.
+        :param options: Other settings by name, see DEFAULT_SETTINGS.
         """
         self.key_next = key_next
         self.key_previous = key_previous
+        for name, value in options.items():
+            if name in DEFAULT_SETTINGS:
+                setattr(self, name, value)
         self.save_file()
         self.master.set_keys()
+        self.master.apply_settings()
 
 
 class SettingsScreen(tk.Toplevel):
@@ -70,7 +117,7 @@ class SettingsScreen(tk.Toplevel):
         super().__init__(master)
         self.setting_handler = setting_handler
         self.title("Settings")
-        self.geometry("400x300")
+        self.geometry(f"400x{300 + 80 * len(NUMERIC_SETTINGS) + 40 * len(BOOLEAN_SETTINGS)}")
         self.create_widgets()
 
     def create_widgets(self):
@@ -78,6 +125,8 @@ class SettingsScreen(tk.Toplevel):
         Create widgets for the settings screen:
         - key_next binding
         - key_previous binding
+        - performance settings (NUMERIC_SETTINGS)
+        - diagnostics switches (BOOLEAN_SETTINGS)
         Save button
         """
         tk.Label(self, text="Settings", font=("Arial", 16)).pack(pady=10)
@@ -96,6 +145,22 @@ class SettingsScreen(tk.Toplevel):
         if self.setting_handler.key_previous:
             self.key_previous_entry.insert(0, self.setting_handler.key_previous)
 
+        # Performance settings
+        self.numeric_entries = {}
+        for name, label in NUMERIC_SETTINGS:
+            tk.Label(self, text=label).pack(pady=5)
+            entry = tk.Entry(self)
+            entry.pack(pady=5)
+            entry.insert(0, str(getattr(self.setting_handler, name)))
+            self.numeric_entries[name] = entry
+
+        # Diagnostics switches
+        self.boolean_vars = {}
+        for name, label in BOOLEAN_SETTINGS:
+            var = tk.BooleanVar(value=bool(getattr(self.setting_handler, name)))
+            tk.Checkbutton(self, text=label, variable=var).pack(pady=5)
+            self.boolean_vars[name] = var
+
         # Save button
         save_button = tk.Button(self, text="Save Settings", command=self.save_settings)
         save_button.pack(pady=20)
@@ -104,10 +169,23 @@ class SettingsScreen(tk.Toplevel):
         """
         Save the settings and close the settings screen.
         """
-        # Here you would typically save the settings to a file or apply them
+        options = {}
+        for name, label in NUMERIC_SETTINGS:
+            try:
+                value = int(self.numeric_entries[name].get())
+            except ValueError:
+                value = -1
+            if value < 0:
+                messagebox.showerror("Error", f"{label.rstrip(':')} must be a non-negative whole number.",
+                                     parent=self)
+                return
+            options[name] = value
+        for name, var in self.boolean_vars.items():
+            options[name] = var.get()
         self.setting_handler.get_settings_from_window(
             self.key_next_entry.get(),
-            self.key_previous_entry.get()
+            self.key_previous_entry.get(),
+            **options
         )
         self.destroy()
 
@@ -0,0 +1,93 @@
+import queue
+import threading
+import time
+
+from components.diagnostics.profiling import get_profiler
+
+
+class BackgroundLoader:
+    def __init__(self, master, poll_interval: int = 20):
+        """
+        Initialize a loader running the slow parts of startup (reading the
+        libraries) on a background thread while the first screen is already shown.
+        Each step is split into a read function, run on the thread, and an
+        install function, run on the Tk main loop with the value read.
+        :param master: Tk widget whose event loop runs the install functions.
+        :param poll_interval: Milliseconds between checks for finished steps.
+        """
+        self.master = master
+        self.poll_interval = poll_interval
+        self.ready = False
+        self.error = None  # First exception raised by a step
+        self.timings = {}  # {step name: seconds from start() until installed}
+        self._steps = []  # [(name, read, install)]
+        self._callbacks = []
+        self._results = queue.Queue()
+        self._pending = 0
+        self._started = None
+
+    def add(self, name: str, read, install):
+        """
+        Add a step; steps are read in the order they were added.
+        :param name: Name of the step, used for timings and profiling.
+        :param read: Callable doing the slow work, without touching Tk or live state.
+        :param install: Callable taking the value returned by read.
+        """
+        self._steps.append((name, read, install))
+
+    def when_ready(self, callback):
+        """
+        Register a callback run on the Tk main loop once all steps are installed.
+        :param callback: Callable taking the first error raised, or None.
+        """
+        if self.ready:
+            callback(self.error)
+        else:
+            self._callbacks.append(callback)
+
+    def start(self):
+        """
+        Start reading on the background thread.
+        """
+        self._started = time.perf_counter()
+        self._pending = len(self._steps)
+        threading.Thread(target=self._run, daemon=True).start()
+        self.master.after(self.poll_interval, self._poll)
+
+    def _run(self):
+        """
+        Background thread running the read functions.
+        """
+        for name, read, install in self._steps:
+            try:
+                self._results.put((name, install, read(), None))
+            except Exception as e:
+                self._results.put((name, install, None, e))
+
+    def _poll(self):
+        """
+        Install the steps read so far, and finish once all are done.
+        """
+        while True:
+            try:
+                name, install, value, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if error is None:
+                try:
+                    install(value)
+                except Exception as e:
+                    error = e
+            if error is not None and self.error is None:
+                self.error = error
+            now = time.perf_counter()
+            self.timings[name] = now - self._started
+            get_profiler().record(f"startup.{name}", self._started, now)
+            self._pending -= 1
+        if self._pending > 0:
+            self.master.after(self.poll_interval, self._poll)
+            return
+        self.ready = True
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self.error)
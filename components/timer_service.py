@@ -0,0 +1,196 @@
+import heapq
+import itertools
+import math
+import time
+
+from components.diagnostics.profiling import get_profiler
+
+
+class Timer:
+    def __init__(self, name: str, interval: float, callback, widget=None, align: float = None):
+        """
+        Initialize a repeating timer of the TimerService; create it with TimerService.every().
+        :param name: Name used in the statistics.
+        :param interval: Seconds between calls.
+        :param callback: Callable taking the widget (None without one).
+        :param widget: Widget the timer updates, or a callable returning the current one.
+        :param align: Wall-clock time (time.time()) the calls are aligned to, or None.
+        """
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self.widget = widget
+        self.align = align
+        self.due = None  # time.monotonic() of the next call
+        self.active = True
+
+    def cancel(self):
+        """
+        Stop the timer; it is dropped from the schedule at its next due time.
+        """
+        self.active = False
+
+    def next_due(self, now: float) -> float:
+        """
+        Compute when the timer is due next.
+        Aligned timers are placed on the next boundary of the wall clock, so a
+        clock changes its second exactly when the second changes, without drift.
+        :param now: Current time.monotonic().
+        :return: time.monotonic() of the next call.
+        """
+        if self.align is None:
+            if self.due is None or now - self.due > self.interval:
+                return now + self.interval  # Do not catch up on missed calls
+            return self.due + self.interval
+        wall = time.time()
+        delay = self.interval - (wall - self.align) % self.interval
+        if delay < 0.001:
+            delay += self.interval
+        return now + delay
+
+    def target(self):
+        """
+        Resolve the widget of the timer.
+        :return: (widget or None, whether the timer should be dropped).
+        """
+        if self.widget is None:
+            return None, False
+        if callable(self.widget) and not hasattr(self.widget, "winfo_exists"):
+            widget = self.widget()  # Widget recreated with every screen, e.g. in the top bar
+            if widget is None or not widget.winfo_exists():
+                return None, False  # Paused until there is one again
+            return widget, False
+        if not self.widget.winfo_exists():
+            return None, True
+        return self.widget, False
+
+
+class TimerService:
+    def __init__(self, master):
+        """
+        Initialize the scheduler of all periodic work on the Tk main loop (clock,
+        battery poll, break countdowns). Timers are kept in a heap ordered by
+        due time and a single after() callback is pending for the earliest one,
+        however many timers there are. The time spent in timer callbacks is
+        accounted, so their share of the main loop can be reported.
+        :param master: Tk widget whose event loop runs the timers.
+        """
+        self.master = master
+        self.busy_seconds = 0.0
+        self.calls = 0
+        self.busy_by_timer = {}  # {timer name: seconds}
+        self._heap = []  # [(due, sequence, Timer)]
+        self._sequence = itertools.count()
+        self._after_id = None
+        self._after_due = None
+        self._started = time.monotonic()
+
+    def every(self, interval: float, callback, widget=None, align: float = None,
+              start_after: float = None, name: str = None) -> Timer:
+        """
+        Call a function repeatedly on the Tk main loop.
+        :param interval: Seconds between calls.
+        :param callback: Callable taking the widget of the timer (None without one).
+        :param widget: Widget the timer updates; the timer is cancelled once it is
+            destroyed. A callable returning the current widget (or None) pauses the
+            timer while there is none instead.
+        :param align: Wall-clock time the calls are aligned to, e.g. 0 for calls at
+            whole seconds, or None to count from now.
+        :param start_after: Seconds until the first call, defaults to the interval.
+        :param name: Name used in the statistics, defaults to the callback name.
+        :return: The Timer, to cancel it.
+        """
+        timer = Timer(name or getattr(callback, "__name__", "timer"), interval, callback, widget, align)
+        now = time.monotonic()
+        timer.due = now + start_after if start_after is not None else timer.next_due(now)
+        heapq.heappush(self._heap, (timer.due, next(self._sequence), timer))
+        self._schedule()
+        return timer
+
+    def set_interval(self, timer: Timer, interval: float):
+        """
+        Change the interval of a timer, taking effect right away.
+        :param timer: Timer returned by every().
+        :param interval: New seconds between calls.
+        """
+        timer.interval = interval
+        timer.due = None
+        timer.due = timer.next_due(time.monotonic())
+        # The old heap entry no longer matches timer.due and is skipped
+        heapq.heappush(self._heap, (timer.due, next(self._sequence), timer))
+        self._schedule()
+
+    def report(self) -> dict:
+        """
+        Report the main-loop time consumed by timers.
+        :return: Active timer count, calls, busy time in ms, its share of the
+            elapsed time in percent, and busy ms per timer name.
+        """
+        elapsed = time.monotonic() - self._started
+        return {
+            "timers": sum(1 for entry in self._heap if self._is_current(entry)),
+            "calls": self.calls,
+            "busy_ms": round(self.busy_seconds * 1000, 3),
+            "busy_percent": round(self.busy_seconds / elapsed * 100, 4) if elapsed > 0 else 0.0,
+            "busy_ms_by_timer": {name: round(seconds * 1000, 3)
+                                 for name, seconds in self.busy_by_timer.items()}
+        }
+
+    def _schedule(self):
+        """
+        Keep one after() callback pending for the earliest due timer.
+        """
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return
+        due = self._heap[0][0]
+        if self._after_id is not None:
+            if self._after_due <= due:
+                return
+            self.master.after_cancel(self._after_id)
+        delay_ms = max(0, math.ceil((due - time.monotonic()) * 1000))
+        self._after_due = due
+        self._after_id = self.master.after(delay_ms, self._run)
+
+    @staticmethod
+    def _is_current(entry: tuple) -> bool:
+        """
+        Check whether a heap entry is still the scheduled call of its timer.
+        :param entry: (due, sequence, Timer) heap entry.
+        :return: False for entries of cancelled or rescheduled timers.
+        """
+        return entry[2].active and entry[0] == entry[2].due
+
+    def _run(self):
+        """
+        Call the due timers and reschedule them.
+        """
+        self._after_id = None
+        now = time.monotonic()
+        profiler = get_profiler()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
+                continue
+            timer = entry[2]
+            widget, dropped = timer.target()
+            if dropped:
+                timer.active = False
+                continue
+            if widget is not None or timer.widget is None:
+                start = time.perf_counter()
+                try:
+                    timer.callback(widget)
+                except Exception as e:
+                    # Reported like an exception in any Tk callback; the other timers keep running
+                    self.master._root().report_callback_exception(type(e), e, e.__traceback__)
+                end = time.perf_counter()
+                self.calls += 1
+                self.busy_seconds += end - start
+                self.busy_by_timer[timer.name] = self.busy_by_timer.get(timer.name, 0.0) + end - start
+                profiler.record(f"timer.{timer.name}", start, end)
+            if timer.active:
+                timer.due = timer.next_due(time.monotonic())
+                heapq.heappush(self._heap, (timer.due, next(self._sequence), timer))
+        self._schedule()
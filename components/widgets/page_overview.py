@@ -0,0 +1,357 @@
+import time
+import tkinter as tk
+
+from components.scores.documents import DocumentPool
+from components.scores.score import Score
+from components.widgets.virtual_list import DRAG_THRESHOLD
+
+STRIP_THUMBNAIL_SIZE = (72, 96)
+GRID_THUMBNAIL_SIZE = (150, 200)
+CELL_PADDING = 4
+CAPTION_HEIGHT = 18
+# Milliseconds between checks for finished thumbnails
+POLL_INTERVAL = 30
+# Seconds of main-loop time spent requesting thumbnails per callback
+REQUEST_BUDGET = 0.015
+
+
+class PageOverview(tk.Frame):
+    def __init__(self, master, pages: list, page_renderer, on_select, caption=None,
+                 thumbnail_size: tuple = STRIP_THUMBNAIL_SIZE, horizontal: bool = False,
+                 bg: str = None, selected_bg: str = 'lightblue'):
+        """
+        Initialize an overview of page thumbnails, as a strip scrolling sideways
+        or as a grid scrolling down. As in VirtualList, only the cells in view
+        exist and only they ask for a thumbnail. Thumbnails are rendered small by
+        the page renderer in the background, so later they come from its memory
+        and disk caches.
+        :param master: Parent widget.
+        :param pages: Pages to show, [(item, page)] with item a Score or another entry.
+        :param page_renderer: Renderer providing the thumbnails.
+        :param on_select: Called with the position of a clicked page.
+        :param caption: Callable(position, item, page) giving the text under a thumbnail,
+            defaults to the page number.
+        :param thumbnail_size: Maximum (width, height) of the thumbnails.
+        :param horizontal: Lay the pages out in a single row instead of a grid.
+        :param bg: Background of the overview and its cells.
+        :param selected_bg: Background of the selected cell.
+        """
+        super().__init__(master, bg=bg)
+        self.pages = list(pages)
+        self.page_renderer = page_renderer
+        self.on_select = on_select
+        self.caption = caption if caption is not None else (lambda position, item, page: str(page + 1))
+        self.thumbnail_size = thumbnail_size
+        self.horizontal = horizontal
+        self.selected_bg = selected_bg
+        self.selected = None
+        self.cell_width = thumbnail_size[0] + 2 * CELL_PADDING
+        self.cell_height = thumbnail_size[1] + CAPTION_HEIGHT + 2 * CELL_PADDING
+        self._cells = []  # [(label, canvas window id)]
+        self._cell_bg = bg
+        self._blank = tk.PhotoImage(master=self, width=thumbnail_size[0], height=thumbnail_size[1])
+        self._wanted = []  # Positions of cells in view waiting for a thumbnail request
+        self._pending = {}  # {position: Future} of requested thumbnails
+        self._poll_id = None
+        # Documents for rendering in the app process, kept apart from the shared
+        # pool so thumbnails of other scores never close the one the viewer shows
+        self._documents = DocumentPool(capacity=2)
+        self._press = 0
+        self._dragged = False
+
+        if horizontal:
+            self.canvas = tk.Canvas(self, height=self.cell_height, bg=bg, highlightthickness=0)
+            self._scrollbar = tk.Scrollbar(self, orient='horizontal', command=self.canvas.xview)
+            self._scrollbar.pack(side='bottom', fill='x')
+            self.canvas.configure(xscrollcommand=self._on_view_changed)
+        else:
+            self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+            self._scrollbar = tk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
+            self._scrollbar.pack(side='right', fill='y')
+            self.canvas.configure(yscrollcommand=self._on_view_changed)
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self.canvas.bind('<Configure>', lambda e: self._layout())
+        self._bind_scrolling(self.canvas)
+        self.bind('<Destroy>', self._on_destroy)
+
+    def set_pages(self, pages: list):
+        """
+        Replace the shown pages and scroll back to the start.
+        :param pages: New pages, [(item, page)].
+        """
+        self.pages = list(pages)
+        self.selected = None
+        self._documents.close_all()
+        self._pending.clear()
+        self._wanted.clear()
+        for label, _ in self._cells:
+            label.position = None
+        self._layout()
+        self._move_to(0)
+
+    def select(self, position):
+        """
+        Highlight a page.
+        :param position: Position of the page, or None to clear the highlight.
+        """
+        previous, self.selected = self.selected, position
+        for label, _ in self._cells:
+            if label.position in (previous, position):
+                label.config(bg=self.selected_bg if label.position == position else self._cell_bg)
+
+    def see(self, position: int):
+        """
+        Scroll a page into view, centering it if it is not visible.
+        :param position: Position of the page.
+        """
+        if self.horizontal:
+            start, cell, view = self.canvas.canvasx(0), self.cell_width, self.canvas.winfo_width()
+            offset = position * cell
+        else:
+            start, cell, view = self.canvas.canvasy(0), self.cell_height, self.canvas.winfo_height()
+            offset = position // self._columns() * cell
+        total = self._extent()
+        if total == 0 or (offset >= start and offset + cell <= start + view):
+            return
+        self._move_to(max(0, offset - (view - cell) / 2) / total)
+
+    def _columns(self) -> int:
+        """
+        Number of cells per row of the grid.
+        """
+        if self.horizontal:
+            return max(1, len(self.pages))
+        return max(1, self.canvas.winfo_width() // self.cell_width)
+
+    def _extent(self) -> int:
+        """
+        Length of the scrollable area in pixels.
+        """
+        if self.horizontal:
+            return len(self.pages) * self.cell_width
+        return -(-len(self.pages) // self._columns()) * self.cell_height
+
+    def _move_to(self, fraction: float):
+        """
+        Scroll to a fraction of the scrollable area.
+        """
+        if self.horizontal:
+            self.canvas.xview_moveto(fraction)
+        else:
+            self.canvas.yview_moveto(fraction)
+
+    def _layout(self):
+        """
+        Size the scrollable area for all pages, e.g. after the width changed the
+        number of columns, and lay out the cells in view.
+        """
+        if self.horizontal:
+            self.canvas.configure(scrollregion=(0, 0, self._extent(), self.cell_height))
+        else:
+            self.canvas.configure(scrollregion=(0, 0, self._columns() * self.cell_width, self._extent()))
+        for label, _ in self._cells:
+            label.position = None  # Positions move with the column count
+        self._update_cells()
+
+    def _on_view_changed(self, first, last):
+        """
+        Canvas scroll callback: move the scrollbar and lay out the cells in view.
+        """
+        self._scrollbar.set(first, last)
+        self._update_cells()
+
+    def _visible_range(self) -> range:
+        """
+        Positions of the pages in view, plus one row or column of margin.
+        """
+        if self.horizontal:
+            first = max(0, int(self.canvas.canvasx(0) // self.cell_width))
+            count = self.canvas.winfo_width() // self.cell_width + 2
+        else:
+            columns = self._columns()
+            first = max(0, int(self.canvas.canvasy(0) // self.cell_height)) * columns
+            count = (self.canvas.winfo_height() // self.cell_height + 2) * columns
+        return range(first, min(len(self.pages), first + count))
+
+    def _update_cells(self):
+        """
+        Place a cell on every page in view, creating cells only when the view
+        shows more pages than there are cells. Page i is shown by cell
+        i % len(cells), so scrolling by one page only refills a single cell.
+        """
+        visible = self._visible_range()
+        while len(self._cells) < len(visible):
+            self._cells.append(self._create_cell())
+        columns = self._columns()
+        used = set()
+        for position in visible:
+            label, window = self._cells[position % len(self._cells)]
+            used.add(window)
+            if self.horizontal:
+                x, y = position * self.cell_width, 0
+            else:
+                x, y = position % columns * self.cell_width, position // columns * self.cell_height
+            self.canvas.coords(window, x, y)
+            self.canvas.itemconfigure(window, state='normal')
+            if label.position != position:
+                self._fill_cell(label, position)
+        for label, window in self._cells:
+            if window not in used:
+                self.canvas.itemconfigure(window, state='hidden')
+                label.position = None
+                label.image = None
+        # Thumbnails scrolled out of view are not waited for; rendered ones stay cached
+        self._wanted = [position for position in self._wanted if position in visible]
+        for position in [position for position in self._pending if position not in visible]:
+            del self._pending[position]
+        self._request_thumbnails()
+
+    def _create_cell(self) -> tuple:
+        """
+        Create a cell widget.
+        :return: Tuple (label, canvas window id).
+        """
+        label = tk.Label(self.canvas, image=self._blank, compound='top', font=("Arial", 9),
+                         bd=1, relief='flat', bg=self._cell_bg)
+        label.position = None
+        label.image = None
+        if self._cell_bg is None:
+            self._cell_bg = label.cget('bg')
+        window = self.canvas.create_window(0, 0, window=label, anchor='nw', state='hidden',
+                                           width=self.cell_width - CELL_PADDING,
+                                           height=self.cell_height - CELL_PADDING)
+        self._bind_scrolling(label)
+        label.bind("<ButtonRelease-1>", lambda e, cell=label: self._on_release(cell))
+        return label, window
+
+    def _fill_cell(self, label, position: int):
+        """
+        Show a page in a cell: its caption right away, its thumbnail once rendered.
+        :param label: Cell widget.
+        :param position: Position of the page.
+        """
+        item, page = self.pages[position]
+        label.position = position
+        label.image = None
+        label.config(image=self._blank, text=self.caption(position, item, page),
+                     bg=self.selected_bg if position == self.selected else self._cell_bg)
+        if (isinstance(item, Score) and item.has_pdf and position not in self._pending
+                and position not in self._wanted):
+            self._wanted.append(position)
+
+    def _request_thumbnails(self):
+        """
+        Ask the renderer for the thumbnails of cells in view, a few at a time and
+        for at most REQUEST_BUDGET seconds per call, so rendering in the app
+        process never blocks the main loop for long.
+        """
+        limit = max(2, self.page_renderer.workers * 2)
+        deadline = time.perf_counter() + REQUEST_BUDGET
+        while self._wanted and len(self._pending) < limit and time.perf_counter() < deadline:
+            position = self._wanted.pop(0)
+            item, page = self.pages[position]
+            future = self.page_renderer.render_async(item, page, self.thumbnail_size,
+                                                     lambda item=item: self._documents.get(item))
+            self._pending[position] = future
+            if future.done():
+                self._show_finished()  # Cached thumbnails free their slot right away
+        if self._poll_id is None and (self._pending or self._wanted):
+            self._poll_id = self.after(POLL_INTERVAL if self._pending else 1, self._poll)
+
+    def _poll(self):
+        """
+        Show the thumbnails rendered meanwhile and request the next ones.
+        """
+        self._poll_id = None
+        self._show_finished()
+        self._request_thumbnails()
+
+    def _show_finished(self):
+        """
+        Put finished thumbnails into their cells.
+        """
+        from PIL import ImageTk
+
+        for position, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[position]
+            if future.cancelled() or future.exception() is not None:
+                continue
+            img = future.result()
+            label = self._cell_showing(position)
+            if img is None or label is None:
+                continue
+            label.image = ImageTk.PhotoImage(img, master=self)
+            label.config(image=label.image)
+
+    def _cell_showing(self, position: int):
+        """
+        Find the cell showing a page.
+        :param position: Position of the page.
+        :return: The cell widget, or None if the page is not in view.
+        """
+        if not self._cells:
+            return None
+        label = self._cells[position % len(self._cells)][0]
+        return label if label.position == position else None
+
+    def _bind_scrolling(self, widget):
+        """
+        Natural scrolling (touch-like) along the overview on a widget of it.
+        :param widget: Canvas or cell widget.
+        """
+        if self.horizontal:
+            widget.bind("<MouseWheel>", lambda e: self.canvas.xview_scroll(int(-1 * (e.delta / 120)), "units"))
+        else:
+            widget.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(int(-1 * (e.delta / 120)), "units"))
+        widget.bind("<ButtonPress-1>", self._on_press)
+        widget.bind("<B1-Motion>", self._on_drag)
+
+    def _on_press(self, event):
+        """
+        Start a possible drag; positions are taken relative to the canvas so
+        presses on cells and on the canvas behave the same.
+        """
+        self._dragged = False
+        if self.horizontal:
+            self._press = event.x_root
+            self.canvas.scan_mark(event.x_root - self.canvas.winfo_rootx(), 0)
+        else:
+            self._press = event.y_root
+            self.canvas.scan_mark(0, event.y_root - self.canvas.winfo_rooty())
+
+    def _on_drag(self, event):
+        """
+        Scroll with the pointer once it moved past DRAG_THRESHOLD.
+        """
+        pointer = event.x_root if self.horizontal else event.y_root
+        if abs(pointer - self._press) > DRAG_THRESHOLD:
+            self._dragged = True
+        if not self._dragged:
+            return
+        if self.horizontal:
+            self.canvas.scan_dragto(event.x_root - self.canvas.winfo_rootx(), 0, gain=1)
+        else:
+            self.canvas.scan_dragto(0, event.y_root - self.canvas.winfo_rooty(), gain=1)
+
+    def _on_release(self, label):
+        """
+        Select the page under the pointer, unless the press turned into a drag.
+        :param label: Cell widget that was pressed.
+        """
+        if not self._dragged and label.position is not None:
+            self.on_select(label.position)
+
+    def _on_destroy(self, event):
+        """
+        Stop polling for thumbnails and close the documents when the overview is destroyed.
+        """
+        if event.widget is not self:
+            return
+        self._documents.close_all()
+        self._pending.clear()
+        self._wanted.clear()
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
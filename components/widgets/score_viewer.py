@@ -0,0 +1,539 @@
+import time
+import tkinter as tk
+
+from components.diagnostics.latency import get_latency_recorder
+from components.diagnostics.profiling import get_profiler, profiled
+from components.rendering.renderer import render_page, viewport_size
+from components.scores.score import Score
+from components.widgets.page_overview import GRID_THUMBNAIL_SIZE, PageOverview
+from components.widgets.virtual_list import VirtualList
+
+SIDEBAR_WIDTH = 200
+SIDEBAR_BG = '#f0f0f0'
+SELECTED_BG = 'lightblue'
+
+
+class ScoreViewer(tk.Frame):
+    def __init__(self, master, items: list, page_renderer, document_pool, on_back,
+                 item_text=None, build_item_view=None, track_title: bool = True, setlist=None):
+        """
+        Initialize a viewer showing a list of scores page by page, with the list in
+        a sidebar. The widgets are created once: moving to another page or score
+        only swaps the image, the sidebar highlight and the title.
+        :param master: The main application window.
+        :param items: Entries to show, Score objects or other entries handled by build_item_view.
+        :param page_renderer: Renderer providing the page images.
+        :param document_pool: Pool providing open documents of scores.
+        :param on_back: Called when the viewer is left with the Back button.
+        :param item_text: Callable giving the sidebar text of an entry, defaults to the score name.
+        :param build_item_view: Callable(item, index, frame) building the view of an entry that
+            is not a score (e.g. a break). It may return a function called when the entry is left.
+        :param track_title: Show the name of the current entry as the title.
+        :param setlist: Compiled concert program of the items, to show and jump to
+            pages of the whole concert; None for a plain list of scores.
+        """
+        super().__init__(master)
+        self.app = master
+        self.items = list(items)
+        self.page_renderer = page_renderer
+        self.document_pool = document_pool
+        self.on_back = on_back
+        self.item_text = item_text if item_text is not None else (lambda item: item.name)
+        self.build_item_view = build_item_view
+        self.track_title = track_title
+        self.setlist = setlist
+        self.index = None
+        self.document = None
+        self.page = 0
+        self._leave_item = None
+        self._pending_page = None
+        self.latency = get_latency_recorder()
+        self._turn = None  # PageTurn being measured, from the navigation input until drawn
+        self._shown_widget = None
+        self._title_label = None
+        self._viewport_size = None
+        self.position_label = None
+        self._overview_score = None  # Score whose pages the overview shows, without a setlist
+        self._grid_frame = None
+        self._grid = None
+        self.create_widgets()
+        self._bind_keys()
+        self.bind('<Destroy>', self._on_destroy)
+
+    def create_widgets(self):
+        """
+        Create widgets for the viewer:
+        - sidebar listing the entries
+        - navigation buttons
+        - page image, "PDF unavailable" message and a frame for other entries,
+          of which only one is shown at a time
+        - strip of page thumbnails below them
+        """
+        # Left frame: list of entries, only the visible rows are materialized
+        sidebar = tk.Frame(self, width=SIDEBAR_WIDTH, bg=SIDEBAR_BG)
+        sidebar.pack(side='left', fill='y')
+        sidebar.pack_propagate(False)
+        self.sidebar = VirtualList(sidebar, self.items, lambda index, item: self.show_item(index),
+                                   item_text=self.item_text, anchor='w', relief='flat',
+                                   bg=SIDEBAR_BG, selected_bg=SELECTED_BG)
+        self.sidebar.pack(fill='both', expand=True)
+
+        # Right frame: navigation and page
+        self.page_frame = tk.Frame(self)
+        self.page_frame.pack(side='left', fill='both', expand=True)
+        self.nav_frame = tk.Frame(self.page_frame)
+        self.nav_frame.pack(pady=10)
+        prev_btn = tk.Button(self.nav_frame, text="\u2190", font=("Arial", 18), command=self.go_prev)
+        prev_btn.pack(side='left', padx=20)
+        next_btn = tk.Button(self.nav_frame, text="\u2192", font=("Arial", 18), command=self.go_next)
+        next_btn.pack(side='left', padx=20)
+        back_button = tk.Button(self.nav_frame, text="Back", font=("Arial", 14), command=self.on_back)
+        back_button.pack(side='left', padx=20)
+        overview_button = tk.Button(self.nav_frame, text="Overview", font=("Arial", 14),
+                                    command=self.open_overview)
+        overview_button.pack(side='left', padx=20)
+        if self.setlist is not None:
+            # Position in the whole concert, and a page number to jump to
+            self.position_label = tk.Label(self.nav_frame, font=("Arial", 14))
+            self.position_label.pack(side='left', padx=(20, 5))
+            page_entry = tk.Entry(self.nav_frame, font=("Arial", 14), width=5)
+            page_entry.pack(side='left')
+
+            def go_to_entered_page(event=None):
+                try:
+                    page = int(page_entry.get())
+                except ValueError:
+                    return
+                page_entry.delete(0, tk.END)
+                self.go_to_page(page - 1)
+            page_entry.bind('<Return>', go_to_entered_page)
+            go_button = tk.Button(self.nav_frame, text="Go", font=("Arial", 14), command=go_to_entered_page)
+            go_button.pack(side='left', padx=5)
+
+        # Thumbnails of the score, or of the whole concert with a setlist
+        self.strip = PageOverview(self.page_frame, self._overview_pages(), self.page_renderer,
+                                  self._on_overview_select, caption=self._overview_caption,
+                                  horizontal=True)
+        self.strip.pack(side='bottom', fill='x')
+
+        self.image_label = tk.Label(self.page_frame)
+        self.message_label = tk.Label(self.page_frame, text="PDF unavailable", font=("Arial", 20), fg="red")
+        self.item_frame = tk.Frame(self.page_frame)
+        self.page_frame.bind('<Configure>', self._on_viewport_configure)
+
+    def set_items(self, items: list):
+        """
+        Replace the listed entries, staying on the current one if it is still listed.
+        :param items: New entries.
+        """
+        current = self.items[self.index] if self.index is not None else None
+        self.items = list(items)
+        self.sidebar.set_items(self.items)
+        if not self.items:
+            self.on_back()
+        elif current in self.items:
+            self.index = self.items.index(current)
+            self._highlight(self.index)
+        else:
+            self.show_item(0)
+
+    def refresh_items(self):
+        """
+        Update the sidebar texts after an entry was edited.
+        """
+        self.sidebar.refresh()
+
+    def show_item(self, index: int, last: bool = False, page: int = None):
+        """
+        Switch to another entry, reusing the existing widgets.
+        :param index: Position of the entry.
+        :param last: Open a score at its last page instead of the first.
+        :param page: Zero-based page to open the score at, overrides last.
+        """
+        if self._leave_item is not None:
+            leave, self._leave_item = self._leave_item, None
+            leave()
+        self.index = index
+        self._highlight(index)
+        item = self.items[index]
+        if self.track_title:
+            self._set_title(self.item_text(item))
+        self._pending_page = None
+        for widget in self.item_frame.winfo_children():
+            widget.destroy()
+
+        turn, self._turn = self._turn, None
+        if turn is not None:
+            turn.kind = "score"
+
+        if not isinstance(item, Score):
+            self.document = None
+            self._show_widget(self.item_frame, fill='both', expand=True)
+            if self.build_item_view is not None:
+                self._leave_item = self.build_item_view(item, index, self.item_frame)
+            self._update_position()
+            self._update_overview()
+            self._finish_turn(turn)
+            return
+        start = time.perf_counter()
+        self.document = self.document_pool.get(item)
+        if turn is not None:
+            turn.add("document", time.perf_counter() - start)
+        if self.document is None:
+            self.message_label.config(text="PDF unavailable")
+            self._show_widget(self.message_label, pady=40)
+            self._update_position()
+            self._update_overview()
+            self._finish_turn(turn)
+            return
+        if page is not None:
+            self.page = max(0, min(page, self.document.page_count - 1))
+        else:
+            self.page = self.document.page_count - 1 if last else 0
+        if self._viewport_size is None:
+            # Render at the real size of the viewer, measured once it is laid out
+            self.update_idletasks()
+            self._viewport_size = viewport_size(self.page_frame, self._reserved_height())
+            self.page_renderer.viewport_size = self._viewport_size
+        self._show_widget(self.image_label, pady=10)
+        self._turn = turn
+        self.show_page(self.page)
+
+    @profiled("viewer.show_page")
+    def show_page(self, page_num: int):
+        """
+        Show a page of the current score. Rendering runs in the worker processes,
+        the image is swapped in once it is ready.
+        :param page_num: Zero-based page number.
+        """
+        score = self.items[self.index]
+        turn, self._turn = self._turn, None
+        requested = time.perf_counter()
+        self._update_position()
+        self._update_overview()
+        size = self._viewport_size
+        future = self.page_renderer.render_async(score, page_num, size, shown=True)
+        self._pending_page = future
+
+        def display():
+            if self._pending_page is not future or not self.winfo_exists():
+                return  # Another page was requested or the viewer was closed
+            if not future.done():
+                self.after(5, display)
+                return
+            if future.cancelled():
+                # The render processes were restarted meanwhile, ask again
+                self._turn = turn
+                self.show_page(page_num)
+                return
+            img = future.result() if future.exception() is None else None
+            if img is None:
+                img = self._render_here(page_num, size)
+            if img is None:
+                self.message_label.config(text="Page could not be rendered")
+                self._show_widget(self.message_label, pady=40)
+                self._finish_turn(turn)
+                return
+            if turn is not None:
+                self._account_render(turn, img, time.perf_counter() - requested, requested)
+            from PIL import Image, ImageTk
+
+            start = time.perf_counter()
+            scale = min(size[0] / img.width, size[1] / img.height)
+            if scale > 1.02:
+                # Rasterized at a lower resolution to save power, stretched to the viewport
+                img = img.resize((round(img.width * scale), round(img.height * scale)), Image.BILINEAR)
+            tk_img = ImageTk.PhotoImage(img)
+            if turn is not None:
+                turn.add("photoimage", time.perf_counter() - start)
+            self.image_label.configure(image=tk_img)
+            self.image_label.image = tk_img
+            self._show_widget(self.image_label, pady=10)
+            # The request spans several Tk callbacks, so it is recorded as a whole
+            get_profiler().record("viewer.page_shown", requested, time.perf_counter(),
+                                  score=score.name, page=page_num)
+            self._finish_turn(turn)
+            # Queue the neighbouring pages once this one is drawn
+            next_score, previous_score = self._neighbour_score(1), self._neighbour_score(-1)
+            self.after_idle(lambda: self.page_renderer.prefetch(score, page_num, self._viewport_size,
+                                                                next_score=next_score,
+                                                                previous_score=previous_score))
+        display()
+
+    def go_prev(self, event=None):
+        """
+        Show the previous page, or the last page of the previous entry.
+        """
+        if self.index is None:
+            return
+        self._turn = self.latency.begin("previous")
+        if self.document is not None and self.page > 0:
+            self.page -= 1
+            self.show_page(self.page)
+        else:
+            self.show_item((self.index - 1) % len(self.items), last=True)
+
+    def go_next(self, event=None):
+        """
+        Show the next page, or the first page of the next entry.
+        """
+        if self.index is None:
+            return
+        self._turn = self.latency.begin("next")
+        if self.document is not None and self.page < self.document.page_count - 1:
+            self.page += 1
+            self.show_page(self.page)
+        else:
+            self.show_item((self.index + 1) % len(self.items))
+
+    def go_to_page(self, concert_page: int):
+        """
+        Jump to a page of the whole concert.
+        :param concert_page: Zero-based page of the concert, clamped to the program.
+        """
+        if self.setlist is None or not self.items:
+            return
+        index, page = self.setlist.locate(concert_page)
+        self._turn = self.latency.begin("jump")
+        if index == self.index and self.document is not None:
+            self.page = max(0, min(page, self.document.page_count - 1))
+            self.show_page(self.page)
+        else:
+            self.show_item(index, page=page)
+
+    def open_overview(self):
+        """
+        Show the thumbnails of all pages of the score, or of the whole concert,
+        in a grid over the viewer. Choosing a page jumps there and closes it.
+        """
+        if self._grid_frame is not None:
+            return
+        self._grid_frame = tk.Frame(self)
+        self._grid_frame.place(relx=0, rely=0, relwidth=1, relheight=1)
+        close_button = tk.Button(self._grid_frame, text="Close", font=("Arial", 14),
+                                 command=self.close_overview)
+        close_button.pack(pady=10)
+        self._grid = PageOverview(self._grid_frame, self._overview_pages(), self.page_renderer,
+                                  self._on_overview_select, caption=self._overview_caption,
+                                  thumbnail_size=GRID_THUMBNAIL_SIZE)
+        self._grid.pack(fill='both', expand=True)
+        position = self._overview_position()
+        if position is not None:
+            self._grid.select(position)
+            # Scroll once the grid knows its width, and so its number of columns
+            self._grid.after_idle(lambda: self._grid is not None and self._grid.see(position))
+
+    def close_overview(self):
+        """
+        Close the overview grid.
+        """
+        if self._grid_frame is not None:
+            self._grid_frame.destroy()
+        self._grid_frame = None
+        self._grid = None
+
+    def _overview_pages(self) -> list:
+        """
+        List the pages shown by the overviews.
+        :return: [(item, page)] of the whole concert with a setlist, else of the current score.
+        """
+        if self.setlist is not None:
+            return [(item, page) for item, count in zip(self.setlist.items, self.setlist.page_counts)
+                    for page in range(count)]
+        if self.document is None:
+            return []
+        return [(self.items[self.index], page) for page in range(self.document.page_count)]
+
+    def _overview_position(self):
+        """
+        Position of the page on screen in the overviews.
+        :return: Position, or None if it is not listed.
+        """
+        if self.index is None:
+            return None
+        if self.setlist is not None:
+            return self.setlist.concert_page(self.index, self.page if self.document is not None else 0)
+        return self.page if self.document is not None else None
+
+    def _overview_caption(self, position: int, item, page: int) -> str:
+        """
+        Text under a thumbnail: the page number, with the name at the first page
+        of each piece of a concert.
+        """
+        if not isinstance(item, Score):
+            return self.item_text(item)
+        if self.setlist is not None and page == 0:
+            return f"{position + 1}. {item.name}"
+        return str(position + 1)
+
+    def _update_overview(self):
+        """
+        Highlight the page on screen in the overviews, and list the pages of
+        another score once it is opened.
+        """
+        if self.setlist is None:
+            score = self.items[self.index] if self.document is not None else None
+            if score is not self._overview_score:
+                self._overview_score = score
+                self.strip.set_pages(self._overview_pages())
+        position = self._overview_position()
+        for overview in (self.strip, self._grid):
+            if overview is not None:
+                overview.select(position)
+                if position is not None:
+                    overview.see(position)
+
+    def _on_overview_select(self, position: int):
+        """
+        Jump to a page chosen in an overview.
+        :param position: Position of the page in the overview.
+        """
+        self.close_overview()
+        if self.setlist is not None:
+            self.go_to_page(position)
+        elif self.document is not None:
+            self._turn = self.latency.begin("jump")
+            self.page = max(0, min(position, self.document.page_count - 1))
+            self.show_page(self.page)
+
+    def _update_position(self):
+        """
+        Show the current page of the whole concert next to the navigation.
+        """
+        if self.position_label is None or self.index is None:
+            return
+        page = self.page if self.document is not None else 0
+        current = self.setlist.concert_page(self.index, page) + 1
+        self.position_label.config(text=f"Page {current} of {self.setlist.total_pages}")
+
+    def _render_here(self, page_num: int, size: tuple):
+        """
+        Render a page of the current score in this process, after the renderer
+        failed to deliver it, e.g. because a render process died.
+        :param page_num: Zero-based page number.
+        :param size: Page area of the viewer.
+        :return: The PIL image, or None if the page cannot be rendered.
+        """
+        if self.document is None:
+            return None
+        try:
+            return render_page(self.document, page_num, self.page_renderer.render_size(size))
+        except Exception:
+            return None
+
+    def _account_render(self, turn, img, elapsed: float, requested: float):
+        """
+        Split the time from requesting a page until it was ready into waiting
+        (cache lookups, queueing, polling) and the rasterize and convert times
+        reported by the renderer, if the page was rendered for this request.
+        :param turn: PageTurn being measured.
+        :param img: The rendered PIL image.
+        :param elapsed: Seconds from the request until the page was ready.
+        :param requested: perf_counter() time of the request.
+        """
+        timings = img.info.get("timings")
+        rasterize = convert = 0.0
+        if timings is not None and timings["finished"] >= requested:
+            # A page that was already being prefetched may have started before the request
+            rasterize = min(timings["rasterize"], elapsed)
+            convert = min(timings["convert"], elapsed - rasterize)
+        turn.add("rasterize", rasterize)
+        turn.add("convert", convert)
+        turn.add("wait", elapsed - rasterize - convert)
+
+    def _finish_turn(self, turn):
+        """
+        Record a page turn once Tk has drawn the new content: idle callbacks run
+        in order, so this one runs after the redraw scheduled by the changes.
+        :param turn: PageTurn being measured, or None.
+        """
+        if turn is None:
+            return
+        changed = time.perf_counter()
+
+        def drawn():
+            turn.add("draw", time.perf_counter() - changed)
+            self.latency.finish(turn)
+        self.after_idle(drawn)
+
+    def _highlight(self, index: int):
+        """
+        Move the sidebar highlight to an entry, scrolling it into view.
+        :param index: Position of the selected entry.
+        """
+        self.sidebar.select(index)
+        self.sidebar.see(index)
+
+    def _set_title(self, title: str):
+        """
+        Show a title in the top bar and the window title.
+        :param title: Title text.
+        """
+        if self._title_label is None or not self._title_label.winfo_exists():
+            self._title_label = self.app.add_title_to_top_bar(title)
+        else:
+            self._title_label.config(text=title)
+        self.app.title(f"Score: {title}")
+
+    def _show_widget(self, widget, **pack_options):
+        """
+        Show one of the page area widgets, hiding the others.
+        :param widget: Image label, message label or entry frame.
+        :param pack_options: Options passed to pack().
+        """
+        if self._shown_widget is widget:
+            return
+        if self._shown_widget is not None:
+            self._shown_widget.pack_forget()
+        widget.pack(**pack_options)
+        self._shown_widget = widget
+
+    def _neighbour_score(self, offset: int):
+        """
+        Get the score shown after leaving the current entry in a direction.
+        :param offset: 1 for the next entry, -1 for the previous one.
+        :return: The neighbouring Score, or None if it is not another score.
+        """
+        item = self.items[(self.index + offset) % len(self.items)]
+        if not isinstance(item, Score) or item is self.items[self.index]:
+            return None
+        return item
+
+    def _reserved_height(self) -> int:
+        """
+        Height of the page area taken by the navigation buttons.
+        """
+        return self.nav_frame.winfo_reqheight() + self.strip.winfo_reqheight() + 40
+
+    def _on_viewport_configure(self, event):
+        """
+        Re-render the current page when the viewer size changes.
+        """
+        if self._viewport_size is None or self.document is None:
+            return
+        new_size = viewport_size(self.page_frame, self._reserved_height())
+        if max(abs(new_size[0] - self._viewport_size[0]),
+               abs(new_size[1] - self._viewport_size[1])) > 4:
+            self._viewport_size = new_size
+            self.page_renderer.viewport_size = new_size
+            self.show_page(self.page)
+
+    def _bind_keys(self):
+        """
+        Bind the page keys to the navigation for as long as the viewer exists.
+        """
+        self._unbind_prev = self.app.bind(self.app.key_prev, self.go_prev)
+        self._unbind_next = self.app.bind(self.app.key_next, self.go_next)
+
+    def _on_destroy(self, event):
+        """
+        Release the page keys and leave the current entry when the viewer is destroyed.
+        """
+        if event.widget is not self:
+            return
+        self.app.unbind(self.app.key_prev, self._unbind_prev)
+        self.app.unbind(self.app.key_next, self._unbind_next)
+        self._pending_page = None
+        if self._leave_item is not None:
+            leave, self._leave_item = self._leave_item, None
+            leave()
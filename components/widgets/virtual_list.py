@@ -0,0 +1,203 @@
+import tkinter as tk
+from tkinter import font as tkfont
+
+# Pointer movement (pixels) after which a press on a row scrolls the list instead of selecting the row
+DRAG_THRESHOLD = 5
+
+
+class VirtualList(tk.Frame):
+    def __init__(self, master, items: list, on_select, item_text=str, font=("Arial", 12), width: int = None,
+                 anchor: str = 'center', relief: str = 'raised', bg: str = None,
+                 selected_bg: str = 'lightblue', height: int = 300, spacing: int = 4):
+        """
+        Initialize a scrollable list that only creates widgets for the rows in view.
+        Rows are recycled while scrolling, so listing thousands of entries costs as
+        much as showing one screen of them. The list scrolls by dragging, also
+        when the drag starts on a row.
+        :param master: Parent widget.
+        :param items: Entries to list.
+        :param on_select: Called with (index, item) when a row is clicked.
+        :param item_text: Callable giving the text of an entry.
+        :param font: Font of the rows.
+        :param width: Width of the rows in characters, centered; None fills the list width.
+        :param anchor: Alignment of the text in a row.
+        :param relief: Relief of the rows.
+        :param bg: Background of the list and its rows.
+        :param selected_bg: Background of the selected row.
+        :param height: Requested height of the list in pixels.
+        :param spacing: Vertical gap between rows in pixels.
+        """
+        super().__init__(master, bg=bg)
+        self.items = list(items)
+        self.on_select = on_select
+        self.item_text = item_text
+        self.font = font
+        self.selected_font = (*font[:2], "bold")
+        self.width = width
+        self.anchor = anchor
+        self.relief = relief
+        self.bg = bg
+        self.selected_bg = selected_bg
+        self.selected = None
+        # Label text plus its padding and border
+        self.row_height = tkfont.Font(root=self, font=font).metrics('linespace') + 8 + spacing
+        self._rows = []  # [(label, canvas window id)]
+        self._row_bg = bg
+        self._press_y = 0
+        self._dragged = False
+
+        self.canvas = tk.Canvas(self, height=height, bg=bg)
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self._scrollbar = tk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
+        self._scrollbar.pack(side='right', fill='y')
+        self.canvas.configure(yscrollcommand=self._on_view_changed)
+        self.canvas.bind('<Configure>', lambda e: self._update_rows())
+        self._bind_scrolling(self.canvas)
+        self._update_scrollregion()
+
+    def set_items(self, items: list):
+        """
+        Replace the listed entries and scroll back to the top.
+        :param items: New entries.
+        """
+        self.items = list(items)
+        if self.selected is not None and self.selected >= len(self.items):
+            self.selected = None
+        self._update_scrollregion()
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Update the text of the visible rows, e.g. after an entry was edited.
+        """
+        for label, _ in self._rows:
+            label.index = None
+        self._update_rows()
+
+    def select(self, index):
+        """
+        Highlight an entry.
+        :param index: Position of the entry, or None to clear the highlight.
+        """
+        previous, self.selected = self.selected, index
+        for label, _ in self._rows:
+            if label.index in (previous, index):
+                self._fill_row(label, label.index)
+
+    def see(self, index: int):
+        """
+        Scroll an entry into view, centering it if it is not visible.
+        :param index: Position of the entry.
+        """
+        total = len(self.items) * self.row_height
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        y = index * self.row_height
+        if total == 0 or (y >= top and y + self.row_height <= top + height):
+            return
+        self.canvas.yview_moveto(max(0, y - (height - self.row_height) / 2) / total)
+
+    def _update_scrollregion(self):
+        """
+        Size the scrollable area for all entries, materialized or not.
+        """
+        self.canvas.configure(scrollregion=(0, 0, 1, len(self.items) * self.row_height))
+
+    def _on_view_changed(self, first, last):
+        """
+        Canvas scroll callback: move the scrollbar and lay out the rows in view.
+        """
+        self._scrollbar.set(first, last)
+        self._update_rows()
+
+    def _update_rows(self):
+        """
+        Place a row widget on every entry in view, creating rows only when the
+        view shows more entries than there are rows. Entry i is shown by row
+        i % len(rows), so scrolling by one entry only refills a single row.
+        """
+        top = self.canvas.canvasy(0)
+        first = max(0, int(top // self.row_height))
+        count = max(0, min(len(self.items) - first, self.canvas.winfo_height() // self.row_height + 2))
+        while len(self._rows) < count:
+            self._rows.append(self._create_row())
+        canvas_width = self.canvas.winfo_width()
+        if self.width:
+            x, options = canvas_width // 2, {'anchor': 'n'}
+        else:
+            x, options = 0, {'anchor': 'nw', 'width': canvas_width}
+        used = set()
+        for index in range(first, first + count):
+            label, window = self._rows[index % len(self._rows)]
+            used.add(window)
+            self.canvas.coords(window, x, index * self.row_height)
+            self.canvas.itemconfigure(window, state='normal', **options)
+            if label.index != index:
+                self._fill_row(label, index)
+        for label, window in self._rows:
+            if window not in used:
+                self.canvas.itemconfigure(window, state='hidden')
+                label.index = None
+
+    def _create_row(self) -> tuple:
+        """
+        Create a row widget.
+        :return: Tuple (label, canvas window id).
+        """
+        label = tk.Label(self.canvas, font=self.font, width=self.width, anchor=self.anchor,
+                         relief=self.relief, bd=2, pady=2, padx=4, bg=self.bg)
+        label.index = None
+        if self._row_bg is None:
+            self._row_bg = label.cget('bg')
+        window = self.canvas.create_window(0, 0, window=label, anchor='nw', state='hidden')
+        self._bind_scrolling(label)
+        label.bind("<ButtonRelease-1>", lambda e, row=label: self._on_release(row))
+        return label, window
+
+    def _fill_row(self, label, index: int):
+        """
+        Show an entry in a row widget.
+        :param label: Row widget.
+        :param index: Position of the entry.
+        """
+        label.index = index
+        selected = index == self.selected
+        label.config(text=self.item_text(self.items[index]),
+                     bg=self.selected_bg if selected else self._row_bg,
+                     font=self.selected_font if selected else self.font)
+
+    def _bind_scrolling(self, widget):
+        """
+        Natural scrolling (touch-like, y axis only) on a widget of the list.
+        :param widget: Canvas or row widget.
+        """
+        widget.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(int(-1 * (e.delta / 120)), "units"))
+        widget.bind("<ButtonPress-1>", self._on_press)
+        widget.bind("<B1-Motion>", self._on_drag)
+
+    def _on_press(self, event):
+        """
+        Start a possible drag; positions are taken relative to the canvas so
+        presses on rows and on the canvas behave the same.
+        """
+        self._press_y = event.y_root
+        self._dragged = False
+        self.canvas.scan_mark(0, event.y_root - self.canvas.winfo_rooty())
+
+    def _on_drag(self, event):
+        """
+        Scroll with the pointer once it moved past DRAG_THRESHOLD.
+        """
+        if abs(event.y_root - self._press_y) > DRAG_THRESHOLD:
+            self._dragged = True
+        if self._dragged:
+            self.canvas.scan_dragto(0, event.y_root - self.canvas.winfo_rooty(), gain=1)
+
+    def _on_release(self, label):
+        """
+        Select the row under the pointer, unless the press turned into a drag.
+        :param label: Row widget that was pressed.
+        """
+        if not self._dragged and label.index is not None:
+            self.on_select(label.index, self.items[label.index])
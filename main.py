@@ -1,34 +1,70 @@
 import tkinter as tk
 from tkinter import messagebox
-import psutil
 
 from components.clock_controller import ClockController
+from components.diagnostics.latency import get_latency_recorder
+from components.diagnostics.profiling import get_profiler, profiled, requested_by_environment
+from components.memory.budget import MuPdfStore, get_memory_budget
+from components.power.governor import PowerGovernor
 from components.practice_mode.main_gui import GuiPracticeMode
 from components.concert_mode.main_gui import GuiConcertMode
+from components.rendering.renderer import get_page_renderer
+from components.scores.documents import get_document_pool
 from components.settings import Settings
+from components.startup import BackgroundLoader
+from components.timer_service import TimerService
 
 
 class MainScreen(tk.Tk):
     def __init__(self):
         """
         Initialize the main screen of the electronic music stand application.
+        The mode selection is shown right away; the libraries are read in the
+        background and the modes can be entered once they are loaded.
+        Run mainloop() to start the application.
         """
         super().__init__()
         self.practice_mode_class = GuiPracticeMode(self)
         self.concert_mode_class = GuiConcertMode(self)
         self.settings_class = Settings(self)
+        self.governor = PowerGovernor(get_page_renderer(), self.settings_class)
+        self.governor.subscribe(self._on_power_profile_changed)
+        self._power_timer = None
         self.clock_label = None
         self.selected_mode = None
         self.key_prev = None
         self.key_next = None
+        self._mode_buttons = []
+        self._loading_label = None
+        self.loader = BackgroundLoader(self)
+        scores_manager = self.practice_mode_class.scores_manager
+        concerts_manager = self.concert_mode_class.concerts_manager
+        self.loader.add("scores", scores_manager.read_catalog, scores_manager.install_catalog)
+        self.loader.add("concerts", concerts_manager.read_concerts, concerts_manager.install_concerts)
+        self.loader.when_ready(self._on_library_loaded)
+        self.memory_budget = get_memory_budget()
+        self.memory_budget.register("pdf_data", scores_manager)
+        self.memory_budget.register("documents", get_document_pool())
+        self.memory_budget.register("pages", get_page_renderer().page_cache)
+        self.memory_budget.register("prefetch_documents", get_page_renderer().prefetcher)
+        self.memory_budget.register("mupdf_store", MuPdfStore())
         self.set_keys()
+        self.apply_settings()
         self.title("Electronic music stand")
         self.attributes('-fullscreen', True)
-        self._clock_controller = ClockController(lambda: self.clock_label)
+        self.timers = TimerService(self)
+        self._clock_controller = ClockController(self.timers, lambda: self.clock_label)
         self.battery_label = None  # Add battery label attribute
+        self._battery_status = ""
+        # First poll right after startup, once the screen is drawn
+        self._power_timer = self.timers.every(self.governor.profile["poll_interval"],
+                                              self.update_battery_status, start_after=0, name="power")
+        self.timers.every(5, lambda _: self.memory_budget.enforce(), name="memory")
+        self.timers.every(2, self.report_save_errors, name="saves")
         self.generate_top_bar()
         self.generate_mode_selection()
-        self.mainloop()
+        # Idle callbacks run after the pending redraw, so the screen is up before loading starts
+        self.after_idle(self.loader.start)
 
     def set_keys(self):
         """
@@ -38,6 +74,27 @@ class MainScreen(tk.Tk):
         self.key_next = self.settings_class.key_next
         self.key_prev = self.settings_class.key_previous
 
+    def apply_settings(self):
+        """
+        Apply performance related settings to the shared components.
+        """
+        # The settings are the full quality values, the power profile may lower them
+        self.governor.apply()
+        if self._power_timer is not None:
+            self.update_battery_status()  # The power saving switch may have changed
+        self.memory_budget.max_bytes = self.settings_class.memory_budget_mb * 1024 * 1024
+        page_renderer = get_page_renderer()
+        if page_renderer.viewport_size is None:
+            # Lets a concert be prepared at the viewer's size before a viewer was shown
+            page_renderer.viewport_size = self._stored_viewer_size()
+        # The environment variable enables profiling from startup, before the settings are read
+        get_profiler().enabled = bool(self.settings_class.profiling) or requested_by_environment()
+        scores_manager = self.practice_mode_class.scores_manager
+        if scores_manager.content_index is not None:
+            # PDFs indexed with another page count are indexed again in the background
+            scores_manager.content_index.pages = self.settings_class.index_pages
+            scores_manager.content_index.index_scores(scores_manager.list_scores())
+
     def generate_top_bar(self):
         """
         Generate a custom top bar with:
@@ -72,26 +129,88 @@ class MainScreen(tk.Tk):
         settings_btn.pack(side='right', padx=10, pady=2)
 
         # Battery percentage label
-        self.battery_label = tk.Label(top_bar, text="", bg='#f0f0f0', font=("Arial", 12))
+        # Shows the last polled state until the timer service polls again
+        self.battery_label = tk.Label(top_bar, text=self._battery_status, bg='#f0f0f0', font=("Arial", 12))
         self.battery_label.pack(side='right', padx=10)
 
-        self.update_battery_status()  # Start battery status updates
-
     def add_title_to_top_bar(self, title: str):
         """
         Add a title to the top bar.
         :param title: Title text to display.
+        :return: The title label, to update the title in place.
         """
         title_label = tk.Label(self, text=title, bg='#f0f0f0', font=("Arial", 16, "bold"))
         title_label.place(x=self.winfo_screenwidth() // 2, y=5, anchor='n')
+        return title_label
 
     def quit(self):
         """
         Quit the application.
         """
         if messagebox.askokcancel("Quit", "Do you really wish to quit?"):
+            # Make sure edits still waiting for the background writers reach the disk
+            errors = []
+            for name, manager in self._saved_managers():
+                try:
+                    manager.flush()
+                except Exception as e:
+                    errors.append(f"{name}: {e}")
+            if errors and not messagebox.askyesno(
+                    "Error", "Could not save your changes:\n" + "\n".join(errors) + "\n\nQuit anyway?"):
+                return
+            get_page_renderer().shutdown()
+            self._store_viewer_size()
+            if self.settings_class.latency_log:
+                get_latency_recorder().dump(extra={"timers": self.timers.report(),
+                                                   "memory": self.memory_budget.usage()})
+            get_profiler().write_trace()
             self.destroy()
 
+    def _stored_viewer_size(self):
+        """
+        Page area of the viewers measured in the last session, if it was on this screen.
+        :return: (width, height) in device pixels, or None.
+        """
+        stored = self.settings_class.viewer_size
+        if not stored or stored.get("screen") != [self.winfo_screenwidth(), self.winfo_screenheight()]:
+            return None
+        return tuple(stored["page"])
+
+    def _store_viewer_size(self):
+        """
+        Save the page area of the viewers, as last measured on screen, to the settings.
+        """
+        size = get_page_renderer().viewport_size
+        if size is None:
+            return
+        stored = {"screen": [self.winfo_screenwidth(), self.winfo_screenheight()], "page": list(size)}
+        if stored != self.settings_class.viewer_size:
+            self.settings_class.viewer_size = stored
+            try:
+                self.settings_class.save_file()
+            except OSError:
+                pass  # Only costs a less accurate concert preparation next time
+
+    def _saved_managers(self) -> list:
+        """
+        Managers saving the libraries in the background.
+        :return: [(description, manager)].
+        """
+        return [("Concerts", self.concert_mode_class.concerts_manager),
+                ("Scores", self.practice_mode_class.scores_manager)]
+
+    def report_save_errors(self, widget=None):
+        """
+        Show an error for every background save that failed since the last check.
+        The changes are kept and written again when the app quits or on the next edit.
+        :param widget: Unused, passed by the timer service.
+        """
+        for name, manager in self._saved_managers():
+            error = manager.take_save_error()
+            if error is not None:
+                messagebox.showerror("Error", f"{name} could not be saved: {error}")
+
+    @profiled("main.mode_selection_screen")
     def generate_mode_selection(self):
         """
         Generate mode selection buttons in the center of the screen.
@@ -100,15 +219,48 @@ class MainScreen(tk.Tk):
 
         mode_frame = tk.Frame(self)
         mode_frame.pack(expand=True)
+        # The modes need the libraries, which may still be loading
+        state = 'normal' if self.loader.ready and self.loader.error is None else 'disabled'
 
         concert_btn = tk.Button(mode_frame, text="Concert", font=("Arial", 24), width=15, height=3,
-                                command=lambda: self.select_mode(0))
+                                command=lambda: self.select_mode(0), state=state)
         concert_btn.grid(row=0, column=0, padx=20, pady=20)
 
         practice_btn = tk.Button(mode_frame, text="Practice", font=("Arial", 24), width=15,
                                  height=3,
-                                 command=lambda: self.select_mode(1))
+                                 command=lambda: self.select_mode(1), state=state)
         practice_btn.grid(row=0, column=1, padx=20, pady=20)
+        self._mode_buttons = [concert_btn, practice_btn]
+
+        self._loading_label = tk.Label(mode_frame, text=self._loading_text(), font=("Arial", 14),
+                                       fg='gray')
+        self._loading_label.grid(row=1, column=0, columnspan=2)
+
+    def _loading_text(self) -> str:
+        """
+        Text of the readiness indicator below the mode buttons.
+        :return: Loading state of the libraries.
+        """
+        if not self.loader.ready:
+            return "Loading library\u2026"
+        if self.loader.error is not None:
+            return "The library could not be loaded"
+        return ""
+
+    def _on_library_loaded(self, error):
+        """
+        Enable the modes once the libraries are loaded, or report why they could not be.
+        A library that failed to load is not offered for editing, so it is not
+        overwritten with an empty one.
+        :param error: Exception raised while loading, or None.
+        """
+        if self._loading_label is not None and self._loading_label.winfo_exists():
+            self._loading_label.config(text=self._loading_text())
+            if error is None:
+                for button in self._mode_buttons:
+                    button.config(state='normal')
+        if error is not None:
+            messagebox.showerror("Error", f"Could not load the library:\n{error}")
 
     def select_mode(self, mode: int):
         """
@@ -135,24 +287,32 @@ class MainScreen(tk.Tk):
         for widget in self.winfo_children():
             widget.destroy()
 
-    def update_battery_status(self):
+    def update_battery_status(self, widget=None):
         """
-        Update the battery percentage in the status bar.
+        Let the power governor read the battery and memory state, and show the
+        battery percentage and power profile in the status bar.
+        Run by the timer service at the poll interval of the power profile.
+        :param widget: Unused, passed by the timer service.
         """
         try:
-            battery = psutil.sensors_battery()
-            if battery is not None:
-                percent = battery.percent
-                plugged = battery.power_plugged
-                status = f"{percent}% {'(Charging)' if plugged else ''}"
-            else:
-                status = "Battery: N/A"
+            self.governor.update()
+            status = self.governor.status_text()
         except Exception:
             status = "Battery: Error"
-        if self.battery_label:
+        self._battery_status = status
+        if self.battery_label is not None and self.battery_label.winfo_exists():
             self.battery_label.config(text=status)
-        self.after(30_000, self.update_battery_status)  # Update every 30 seconds
+
+    def _on_power_profile_changed(self, name: str, profile: dict):
+        """
+        Adjust the timers to a new power profile.
+        :param name: Name of the profile.
+        :param profile: Values of the profile, see PROFILES.
+        """
+        self.timers.set_interval(self._power_timer, profile["poll_interval"])
+        self._clock_controller.set_interval(profile["clock_interval"])
 
 
 if __name__ == '__main__':
     app = MainScreen()
+    app.mainloop()